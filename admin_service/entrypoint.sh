@@ -38,6 +38,14 @@ PY
 if [ "${DEBUG}" = "1" ]; then
   exec python manage.py runserver 0.0.0.0:8000
 else
-  # Change module if your project isn't forgedesk_api
+  # Sync workers with persistent connections by default.  ADMIN_SERVER=asgi
+  # serves streaming exports and the change stream without pinning a worker,
+  # but settings then close the database connection after every request.
+  : "${ADMIN_SERVER:=wsgi}"
+  export ADMIN_SERVER
+  if [ "${ADMIN_SERVER}" = "asgi" ]; then
+    echo "ADMIN_SERVER=asgi: persistent database connections are off."
+    exec gunicorn forge_admin.asgi:application --bind 0.0.0.0:8000 --workers 3 --worker-class uvicorn.workers.UvicornWorker
+  fi
   exec gunicorn forge_admin.wsgi:application --bind 0.0.0.0:8000 --workers 3
 fi
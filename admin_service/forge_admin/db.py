@@ -0,0 +1,60 @@
+"""Database helpers that behave the same with or without PgBouncer."""
+from __future__ import annotations
+
+from typing import Any, AsyncIterator, Iterator
+
+from django.db import connections
+from django.db.models import QuerySet
+
+
+def server_side_cursors(alias: str) -> bool:
+    return not connections[alias].settings_dict.get("DISABLE_SERVER_SIDE_CURSORS", False)
+
+
+def _row_pk(row: Any):
+    return row["pk"] if isinstance(row, dict) else row.pk
+
+
+def stream_queryset(queryset: QuerySet, chunk_size: int = 2000) -> Iterator[Any]:
+    """Yield every row of ``queryset`` in primary-key order with bounded memory.
+
+    With server-side cursors this is ``iterator()``.  Behind PgBouncer
+    transaction pooling, where a cursor cannot outlive its transaction, rows
+    are fetched in keyset pages (``pk > last``) so each page is an
+    independent query that any pooled server connection can answer.
+    ``values()`` querysets must include ``"pk"``.
+    """
+
+    queryset = queryset.order_by("pk")
+    if server_side_cursors(queryset.db):
+        yield from queryset.iterator(chunk_size=chunk_size)
+        return
+
+    last_pk = None
+    while True:
+        page = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        rows = list(page[:chunk_size])
+        yield from rows
+        if len(rows) < chunk_size:
+            return
+        last_pk = _row_pk(rows[-1])
+
+
+async def astream_queryset(queryset: QuerySet, chunk_size: int = 2000) -> AsyncIterator[Any]:
+    """Async counterpart of :func:`stream_queryset` for async views."""
+
+    queryset = queryset.order_by("pk")
+    if server_side_cursors(queryset.db):
+        async for row in queryset.aiterator(chunk_size=chunk_size):
+            yield row
+        return
+
+    last_pk = None
+    while True:
+        page = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        rows = [row async for row in page[:chunk_size]]
+        for row in rows:
+            yield row
+        if len(rows) < chunk_size:
+            return
+        last_pk = _row_pk(rows[-1])
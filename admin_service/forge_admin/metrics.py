@@ -0,0 +1,241 @@
+"""Prometheus text-format metrics for the admin service.
+
+Request latency and SQL totals are fed by ``RequestProfilingMiddleware``;
+apps add gauges with :func:`collector`, whose results are cached for a TTL so a
+scrape never costs more than one round of summary queries per interval.
+Counters and histograms are per process: with several workers each scrape
+sees whichever worker answered it, so scrape the workers as separate targets.
+
+``/metrics`` needs ``Authorization: Bearer $METRICS_TOKEN`` when that setting
+is present; otherwise it only answers loopback clients.  Requests through the
+published port arrive from a proxy or Docker gateway address, which is private
+but not trusted, so remote scrapers need the token.
+"""
+from __future__ import annotations
+
+import hmac
+import ipaddress
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Iterable
+
+from django.conf import settings
+from django.db import DatabaseError
+from django.db.backends.signals import connection_created
+from django.http import Http404, HttpResponse
+
+from .replica import replica_view
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+DURATION_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: dict[tuple, object] = {}
+        _registry.append(self)
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(labels[name] for name in self.labelnames)
+
+    def header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> list[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return self.header() + [
+            f"{self.name}{_labels(self.labelnames, key)} {_number(value)}" for key, value in values
+        ]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DURATION_BUCKETS) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets) + (float("inf"),)
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            counts, total = self._values.get(key, ([0] * len(self.buckets), 0.0))
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+            self._values[key] = (counts, total + value)
+
+    def render(self) -> list[str]:
+        with self._lock:
+            values = sorted((key, (list(counts), total)) for key, (counts, total) in self._values.items())
+        lines = self.header()
+        for key, (counts, total) in values:
+            for bound, count in zip(self.buckets, counts):
+                le = 'le="%s"' % _number(bound)
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, key, le)} {count}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {counts[-1]}")
+        return lines
+
+
+@dataclass
+class Gauge:
+    """One gauge family returned by a :func:`collector`."""
+
+    name: str
+    documentation: str
+    samples: list[tuple[dict, float]] = field(default_factory=list)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} gauge"]
+        for labels, value in self.samples:
+            names = tuple(labels)
+            lines.append(f"{self.name}{_labels(names, tuple(labels[name] for name in names))} {_number(value)}")
+        return lines
+
+
+_registry: list[_Metric] = []
+
+
+class _Collector:
+    """A gauge function whose result is reused for ``ttl`` seconds."""
+
+    def __init__(self, func: Callable[[], list[Gauge]], ttl: float) -> None:
+        self.func = func
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._collected_at = 0.0
+        self._gauges: list[Gauge] = []
+        self._up = False
+
+    def collect(self) -> tuple[list[Gauge], bool]:
+        with self._lock:
+            if not self._collected_at or time.monotonic() - self._collected_at >= self.ttl:
+                try:
+                    self._gauges, self._up = self.func(), True
+                except DatabaseError:
+                    logger.warning("Metrics collector %s failed.", self.func.__name__, exc_info=True)
+                    self._gauges, self._up = [], False
+                self._collected_at = time.monotonic()
+            return self._gauges, self._up
+
+
+_collectors: list[_Collector] = []
+
+
+def collector(ttl: float | None = None):
+    """Register ``func() -> list[Gauge]``; its result is cached for ``ttl`` seconds."""
+
+    def decorator(func):
+        seconds = ttl if ttl is not None else getattr(settings, "METRICS_GAUGE_SECONDS", 60)
+        _collectors.append(_Collector(func, seconds))
+        return func
+
+    return decorator
+
+
+request_duration = Histogram(
+    "forge_admin_request_duration_seconds",
+    "Admin request wall time by view.",
+    ("view", "method", "status"),
+)
+db_queries = Counter("forge_admin_db_queries_total", "SQL statements executed by view.", ("view",))
+db_query_seconds = Counter("forge_admin_db_query_seconds_total", "Time spent in SQL by view.", ("view",))
+repeated_query_requests = Counter(
+    "forge_admin_repeated_query_requests_total",
+    "Requests that ran one statement past the repeated-query threshold (N+1 suspects).",
+    ("view",),
+)
+connections_opened = Counter(
+    "forge_admin_db_connections_opened_total",
+    "New database connections opened by this process.",
+    ("alias",),
+)
+
+
+def observe_request(profile) -> None:
+    """Record one ``forge_admin.profiling.RequestProfile``."""
+
+    request_duration.observe(
+        profile.wall_ms / 1000, view=profile.view, method=profile.method, status=f"{profile.status // 100}xx"
+    )
+    db_queries.inc(profile.queries, view=profile.view)
+    db_query_seconds.inc(profile.sql_ms / 1000, view=profile.view)
+    if profile.repeated_sql is not None:
+        repeated_query_requests.inc(view=profile.view)
+
+
+def _connection_created(sender, connection, **kwargs) -> None:
+    connections_opened.inc(alias=connection.alias)
+
+
+connection_created.connect(_connection_created, dispatch_uid="forge_admin_metrics_connections")
+
+
+def render() -> str:
+    lines: list[str] = []
+    for metric in _registry:
+        lines.extend(metric.render())
+
+    up = Gauge("forge_admin_metrics_collector_up", "Whether the last run of each gauge collector succeeded.")
+    for registered in _collectors:
+        gauges, ok = registered.collect()
+        up.samples.append(({"collector": registered.func.__name__.lstrip("_")}, int(ok)))
+        for gauge in gauges:
+            lines.extend(gauge.render())
+    lines.extend(up.render())
+    return "\n".join(lines) + "\n"
+
+
+def _allowed(request) -> bool:
+    token = getattr(settings, "METRICS_TOKEN", "")
+    if token:
+        return hmac.compare_digest(request.headers.get("Authorization", ""), f"Bearer {token}")
+    try:
+        address = ipaddress.ip_address(request.META.get("REMOTE_ADDR", ""))
+    except ValueError:
+        return False
+    return address.is_loopback
+
+
+@replica_view
+def metrics_view(request):
+    if not _allowed(request):
+        raise Http404
+    return HttpResponse(render(), content_type=CONTENT_TYPE)
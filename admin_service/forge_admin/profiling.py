@@ -0,0 +1,240 @@
+"""Per-request SQL and timing instrumentation for the admin.
+
+``RequestProfilingMiddleware`` wraps every database connection with an
+execute wrapper for the duration of a request, counting queries and SQL time
+and noticing the same statement issued over and over (the usual N+1 shape:
+a ``list_display`` method or inline touching a relation per row).  Totals are
+sent back to staff as a ``Server-Timing`` header and kept in a bounded
+in-process ring buffer that :func:`slow_requests_view` summarises.
+
+The overhead is two ``perf_counter`` calls and a dict increment per query,
+so it is on by default; set ``REQUEST_PROFILING=0`` to remove it entirely.
+Each worker process keeps its own buffer.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import Counter, deque
+from contextlib import ExitStack
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.contrib import admin
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.template.response import TemplateResponse
+
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+SQL_PREVIEW_CHARS = 300
+
+
+@dataclass(frozen=True)
+class RequestProfile:
+    recorded_at: float
+    method: str
+    path: str
+    view: str
+    model_admin: str | None
+    status: int
+    wall_ms: float
+    sql_ms: float
+    queries: int
+    repeated_sql: str | None = None
+    repeated_count: int = 0
+
+
+class _ProfileBuffer:
+    """Fixed-size, thread-safe buffer of the most recent request profiles."""
+
+    def __init__(self, size: int) -> None:
+        self._lock = threading.Lock()
+        self._profiles: deque[RequestProfile] = deque(maxlen=size)
+
+    def add(self, profile: RequestProfile) -> None:
+        with self._lock:
+            self._profiles.append(profile)
+
+    def snapshot(self) -> list[RequestProfile]:
+        with self._lock:
+            return list(self._profiles)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._profiles.clear()
+
+
+buffer = _ProfileBuffer(getattr(settings, "REQUEST_PROFILE_BUFFER_SIZE", 500))
+
+
+class _QueryRecorder:
+    """``connection.execute_wrapper`` callable accumulating one request's SQL."""
+
+    def __init__(self) -> None:
+        self.queries = 0
+        self.seconds = 0.0
+        self.statements: Counter[str] = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += time.perf_counter() - started
+            self.queries += 1
+            # Parameters are bound separately, so identical text is the
+            # same statement shape regardless of the ids it was run for.
+            self.statements[sql] += 1
+
+
+def _model_admin(view_func) -> admin.ModelAdmin | None:
+    """Find the ModelAdmin behind an admin view, through any decorators."""
+
+    while view_func is not None:
+        model_admin = getattr(view_func, "model_admin", None) or getattr(view_func, "__self__", None)
+        if isinstance(model_admin, admin.ModelAdmin):
+            return model_admin
+        view_func = getattr(view_func, "__wrapped__", None)
+    return None
+
+
+def _server_timing(profile: RequestProfile) -> str:
+    return ", ".join(
+        [
+            f'sql;dur={profile.sql_ms:.1f};desc="{profile.queries} queries"',
+            f"app;dur={max(0.0, profile.wall_ms - profile.sql_ms):.1f}",
+            f"total;dur={profile.wall_ms:.1f}",
+        ]
+    )
+
+
+class RequestProfilingMiddleware:
+    """Record query count, SQL time, repeated statements and wall time per request."""
+
+    def __init__(self, get_response):
+        if not getattr(settings, "REQUEST_PROFILING", True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.repeat_threshold = getattr(settings, "REQUEST_PROFILE_REPEAT_THRESHOLD", 5)
+
+    def __call__(self, request):
+        request.profiled_view = None
+        recorder = _QueryRecorder()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+        wall = time.perf_counter() - started
+
+        profile = self._profile(request, response, recorder, wall)
+        buffer.add(profile)
+        metrics.observe_request(profile)
+        if profile.repeated_sql is not None:
+            logger.warning(
+                "%s ran the same query %d times (%s): %s",
+                profile.model_admin or profile.view,
+                profile.repeated_count,
+                profile.path,
+                profile.repeated_sql,
+            )
+
+        user = getattr(request, "user", None)
+        if user is not None and user.is_staff:
+            response["Server-Timing"] = _server_timing(profile)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.profiled_view = view_func
+        return None
+
+    def _profile(self, request, response, recorder: _QueryRecorder, wall: float) -> RequestProfile:
+        match = request.resolver_match
+        model_admin = _model_admin(request.profiled_view)
+        repeated_sql, repeated_count = None, 0
+        if recorder.statements:
+            sql, count = recorder.statements.most_common(1)[0]
+            if count >= self.repeat_threshold:
+                repeated_sql, repeated_count = sql[:SQL_PREVIEW_CHARS], count
+
+        return RequestProfile(
+            recorded_at=time.time(),
+            method=request.method,
+            path=request.path,
+            # Unresolved paths share one name so 404 probes cannot blow up metric labels.
+            view=(match.view_name if match else None) or "unresolved",
+            model_admin=type(model_admin).__name__ if model_admin else None,
+            status=response.status_code,
+            wall_ms=wall * 1000,
+            sql_ms=recorder.seconds * 1000,
+            queries=recorder.queries,
+            repeated_sql=repeated_sql,
+            repeated_count=repeated_count,
+        )
+
+
+@dataclass
+class ViewSummary:
+    view: str
+    model_admin: str | None
+    requests: int
+    p50_ms: float
+    p95_ms: float
+    max_ms: float
+    avg_queries: float
+    avg_sql_ms: float
+    repeated_requests: int
+    repeated_sql: str | None
+
+
+def _percentile(ordered: list[float], fraction: float) -> float:
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def summarise(profiles: list[RequestProfile]) -> list[ViewSummary]:
+    """Per-view timing summary, slowest p95 first."""
+
+    by_view: dict[str, list[RequestProfile]] = {}
+    for profile in profiles:
+        by_view.setdefault(profile.view, []).append(profile)
+
+    summaries = []
+    for view, rows in by_view.items():
+        walls = sorted(row.wall_ms for row in rows)
+        repeated = [row for row in rows if row.repeated_sql is not None]
+        summaries.append(
+            ViewSummary(
+                view=view,
+                model_admin=rows[-1].model_admin,
+                requests=len(rows),
+                p50_ms=_percentile(walls, 0.5),
+                p95_ms=_percentile(walls, 0.95),
+                max_ms=walls[-1],
+                avg_queries=sum(row.queries for row in rows) / len(rows),
+                avg_sql_ms=sum(row.sql_ms for row in rows) / len(rows),
+                repeated_requests=len(repeated),
+                repeated_sql=repeated[-1].repeated_sql if repeated else None,
+            )
+        )
+    return sorted(summaries, key=lambda summary: summary.p95_ms, reverse=True)
+
+
+def slow_requests_view(request):  # pragma: no cover - admin view
+    if request.method == "POST" and request.user.is_superuser:
+        buffer.clear()
+    profiles = buffer.snapshot()
+    context = {
+        **admin.site.each_context(request),
+        "title": "Slow requests",
+        "enabled": getattr(settings, "REQUEST_PROFILING", True),
+        "buffer_size": getattr(settings, "REQUEST_PROFILE_BUFFER_SIZE", 500),
+        "repeat_threshold": getattr(settings, "REQUEST_PROFILE_REPEAT_THRESHOLD", 5),
+        "recorded": len(profiles),
+        "summaries": summarise(profiles)[:50],
+        "slowest": sorted(profiles, key=lambda profile: profile.wall_ms, reverse=True)[:25],
+    }
+    return TemplateResponse(request, "admin/slow_requests.html", context)
@@ -0,0 +1,170 @@
+"""Read-replica routing for admin read paths.
+
+Inventory reads only go to the ``replica`` alias inside :func:`replica_reads`, which
+``ReplicaReadMiddleware`` enters for GET/HEAD requests to changelists,
+autocomplete and views marked with :func:`replica_view`.  Everything else
+(change forms, saves, posting services, any read inside an atomic block on
+``default``) stays on the primary.  A replica lagging more than
+``REPLICA_MAX_LAG_SECONDS`` or failing its health probe is skipped until the
+next probe.
+"""
+from __future__ import annotations
+
+import contextvars
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+from django.conf import settings
+from django.db import DatabaseError, connections
+
+logger = logging.getLogger(__name__)
+
+PRIMARY = "default"
+REPLICA = "replica"
+PIN_COOKIE = "forge_primary_until"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+_replica_reads = contextvars.ContextVar("replica_reads", default=False)
+
+_LAG_SQL = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM NOW() - pg_last_xact_replay_timestamp()), 0)
+    END
+"""
+
+
+def replica_configured() -> bool:
+    return REPLICA in settings.DATABASES
+
+
+class _LagMonitor:
+    """Process-wide cache of the replica's replication lag."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._checked_at = 0.0
+        self._healthy = False
+
+    def healthy(self) -> bool:
+        interval = settings.REPLICA_LAG_CHECK_SECONDS
+        if time.monotonic() - self._checked_at < interval:
+            return self._healthy
+        with self._lock:
+            if time.monotonic() - self._checked_at >= interval:
+                self._healthy = self._probe()
+                self._checked_at = time.monotonic()
+            return self._healthy
+
+    def _probe(self) -> bool:
+        try:
+            with connections[REPLICA].cursor() as cursor:
+                cursor.execute(_LAG_SQL)
+                lag = float(cursor.fetchone()[0])
+        except DatabaseError:
+            logger.warning("Replica health check failed; reading from the primary.", exc_info=True)
+            return False
+        if lag > settings.REPLICA_MAX_LAG_SECONDS:
+            logger.warning("Replica is %.1fs behind; reading from the primary.", lag)
+            return False
+        return True
+
+
+lag_monitor = _LagMonitor()
+
+
+@contextmanager
+def replica_reads(enabled: bool = True):
+    """Allow (or, with ``enabled=False``, forbid) replica reads in this block."""
+
+    token = _replica_reads.set(enabled)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+def replica_view(view):
+    """Mark a view (or bound admin view method) as safe to serve from the replica."""
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        return view(*args, **kwargs)
+
+    wrapper.replica_reads = True
+    return wrapper
+
+
+class ReplicaRouter:
+    """Send opted-in reads to the replica; all writes and migrations go to the primary."""
+
+    def db_for_read(self, model, **hints):
+        if not _replica_reads.get() or not replica_configured():
+            return PRIMARY
+        # Sessions, users and the admin log are read right after they are
+        # written (login, redirects), so only domain tables use the replica.
+        if model._meta.app_label != "inventory":
+            return PRIMARY
+        # Reads that share a transaction with writes must see those writes.
+        if connections[PRIMARY].in_atomic_block:
+            return PRIMARY
+        return REPLICA if lag_monitor.healthy() else PRIMARY
+
+    def db_for_write(self, model, **hints):
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == PRIMARY
+
+
+class ReplicaReadMiddleware:
+    """Enable replica reads for listing, autocomplete and report requests.
+
+    A successful write pins the browser to the primary for
+    ``REPLICA_PIN_SECONDS`` so the redirect after a save shows the change.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.replica_reads = False
+        # Reset after the response is built so lazily rendered changelists
+        # still read from the replica.
+        token = _replica_reads.set(False)
+        try:
+            response = self.get_response(request)
+        finally:
+            _replica_reads.reset(token)
+
+        if request.method not in SAFE_METHODS and response.status_code < 400 and replica_configured():
+            pin = settings.REPLICA_PIN_SECONDS
+            response.set_cookie(PIN_COOKIE, str(int(time.time()) + pin), max_age=pin, httponly=True, samesite="Lax")
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if replica_configured() and self._eligible(request, view_func):
+            request.replica_reads = True
+            _replica_reads.set(True)
+        return None
+
+    @staticmethod
+    def _eligible(request, view_func) -> bool:
+        if request.method not in ("GET", "HEAD"):
+            return False
+        try:
+            if int(request.COOKIES.get(PIN_COOKIE, 0)) > time.time():
+                return False
+        except ValueError:
+            pass
+        if getattr(view_func, "replica_reads", False):
+            return True
+        url_name = getattr(request.resolver_match, "url_name", None) or ""
+        return url_name.endswith("_changelist") or url_name == "autocomplete"
@@ -20,6 +20,10 @@ def _env_list(name: str) -> list[str]:
     return [value.strip() for value in os.environ.get(name, "").split(",") if value.strip()]
 
 
+def _env_flag(name: str) -> bool:
+    return os.environ.get(name, "0") in {"1", "true", "True"}
+
+
 CSRF_TRUSTED_ORIGINS: list[str] = _env_list("CSRF_TRUSTED_ORIGINS")
 
 _secure_proxy_ssl_header = os.environ.get("SECURE_PROXY_SSL_HEADER", "").strip()
@@ -40,6 +44,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "forge_admin.profiling.RequestProfilingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -47,6 +52,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "forge_admin.replica.ReplicaReadMiddleware",
 ]
 
 ROOT_URLCONF = "forge_admin.urls"
@@ -69,6 +75,15 @@ TEMPLATES = [
 
 WSGI_APPLICATION = "forge_admin.wsgi.application"
 
+# "wsgi" (the default) or "asgi".  Under ASGI, Django 4.2 runs sync views in
+# a thread per request; a persistent connection stays with the thread that
+# opened it and is never reused or closed by request_finished, so ASGI trades
+# persistent connections for non-blocking exports and the change stream.
+ADMIN_SERVER = os.environ.get("ADMIN_SERVER", "wsgi").strip().lower()
+_conn_max_age = 0 if ADMIN_SERVER == "asgi" else int(os.environ.get("DB_CONN_MAX_AGE", "60"))
+# DB_HOST/DB_PORT point at PgBouncer in transaction pooling mode.
+DB_PGBOUNCER = _env_flag("DB_PGBOUNCER")
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.postgresql",
@@ -77,8 +92,79 @@ DATABASES = {
         "PASSWORD": os.environ.get("DB_PASSWORD", "forgepass_dev"),
         "HOST": os.environ.get("DB_HOST", "postgres"),
         "PORT": os.environ.get("DB_PORT", "5433"),
+        # Reuse connections across requests (WSGI only, see ADMIN_SERVER);
+        # health checks drop ones the server (or PgBouncer) has closed
+        # before they are handed out.
+        "CONN_MAX_AGE": _conn_max_age,
+        "CONN_HEALTH_CHECKS": True,
+        # PgBouncer in transaction mode cannot keep a server-side cursor open
+        # between transactions; streaming code uses forge_admin.db instead.
+        "DISABLE_SERVER_SIDE_CURSORS": DB_PGBOUNCER,
+    }
+}
+
+# Optional streaming replica for admin listings, autocomplete and reports; see
+# forge_admin/replica.py.  Unset DB_REPLICA_* values fall back to the primary's.
+if os.environ.get("DB_REPLICA_HOST"):
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "NAME": os.environ.get("DB_REPLICA_DATABASE", DATABASES["default"]["NAME"]),
+        "USER": os.environ.get("DB_REPLICA_USERNAME", DATABASES["default"]["USER"]),
+        "PASSWORD": os.environ.get("DB_REPLICA_PASSWORD", DATABASES["default"]["PASSWORD"]),
+        "HOST": os.environ["DB_REPLICA_HOST"],
+        "PORT": os.environ.get("DB_REPLICA_PORT", DATABASES["default"]["PORT"]),
+        "TEST": {"MIRROR": "default"},
+    }
+
+DATABASE_ROUTERS = ["forge_admin.replica.ReplicaRouter"]
+REPLICA_MAX_LAG_SECONDS = float(os.environ.get("REPLICA_MAX_LAG_SECONDS", "5"))
+REPLICA_LAG_CHECK_SECONDS = float(os.environ.get("REPLICA_LAG_CHECK_SECONDS", "2"))
+REPLICA_PIN_SECONDS = int(os.environ.get("REPLICA_PIN_SECONDS", "10"))
+
+# Per-request SQL/timing capture; see forge_admin/profiling.py.
+REQUEST_PROFILING = os.environ.get("REQUEST_PROFILING", "1") in {"1", "true", "True"}
+REQUEST_PROFILE_BUFFER_SIZE = int(os.environ.get("REQUEST_PROFILE_BUFFER_SIZE", "500"))
+REQUEST_PROFILE_REPEAT_THRESHOLD = int(os.environ.get("REQUEST_PROFILE_REPEAT_THRESHOLD", "5"))
+
+# /metrics (forge_admin/metrics.py): bearer token, or private networks only when unset.
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN", "")
+METRICS_GAUGE_SECONDS = float(os.environ.get("METRICS_GAUGE_SECONDS", "60"))
+
+# Bearer tokens accepted by the read-only JSON API (inventory/api.py), comma-separated.
+API_TOKENS = [token.strip() for token in os.environ.get("API_TOKENS", "").split(",") if token.strip()]
+# Bearer tokens allowed to POST stock movements to /api/v1/movements/, comma-separated.
+API_WRITE_TOKENS = [token.strip() for token in os.environ.get("API_WRITE_TOKENS", "").split(",") if token.strip()]
+# Days a movement batch's idempotency key is kept; a retry after that posts again.
+MOVEMENT_KEY_RETENTION_DAYS = int(os.environ.get("MOVEMENT_KEY_RETENTION_DAYS", "30"))
+
+# LISTEN/NOTIFY change feed (inventory/services/change_feed.py).  Each web
+# process holds one extra connection to the primary, which must be direct:
+# LISTEN does not work through PgBouncer in transaction mode, so with
+# DB_PGBOUNCER the feed stays off unless CHANGE_FEED_DB_HOST is set.
+CHANGE_FEED_ENABLED = _env_flag("CHANGE_FEED_ENABLED")
+CHANGE_FEED_DB_HOST = os.environ.get("CHANGE_FEED_DB_HOST", "")
+CHANGE_FEED_DB_PORT = os.environ.get("CHANGE_FEED_DB_PORT", "")
+CHANGE_FEED_COALESCE_SECONDS = float(os.environ.get("CHANGE_FEED_COALESCE_SECONDS", "0.25"))
+
+# Cache for admin lookups (inventory/services/lookup_cache.py).  Local memory
+# is per process; CACHE_BACKEND=file (one host) or redis (Django's backend,
+# needs the redis package) shares entries and invalidations between workers.
+_CACHE_BACKENDS = {
+    "locmem": ("django.core.cache.backends.locmem.LocMemCache", "forge-admin"),
+    "file": ("django.core.cache.backends.filebased.FileBasedCache", "/tmp/forge-admin-cache"),
+    "redis": ("django.core.cache.backends.redis.RedisCache", "redis://127.0.0.1:6379/1"),
+}
+_cache_backend, _cache_location = _CACHE_BACKENDS[os.environ.get("CACHE_BACKEND", "locmem")]
+CACHES = {
+    "default": {
+        "BACKEND": _cache_backend,
+        "LOCATION": os.environ.get("CACHE_LOCATION", _cache_location),
+        "KEY_PREFIX": "forge-admin",
+        "TIMEOUT": 300,
+        "OPTIONS": {} if _cache_backend.endswith("RedisCache") else {"MAX_ENTRIES": 5000},
     }
 }
+LOOKUP_CACHE_SECONDS = int(os.environ.get("LOOKUP_CACHE_SECONDS", "300"))
 
 LANGUAGE_CODE = "en-us"
 TIME_ZONE = os.environ.get("TIME_ZONE", "UTC")
@@ -2,10 +2,17 @@
 from __future__ import annotations
 
 from django.contrib import admin
-from django.urls import path
+from django.urls import include, path
 from django.views.generic import RedirectView
 
+from .metrics import metrics_view
+from .profiling import slow_requests_view
+
 urlpatterns = [
+    path("metrics", metrics_view, name="metrics"),
+    path("api/v1/", include("inventory.api_urls")),
+    path("django-admin/reports/", include("inventory.urls")),
+    path("django-admin/slow-requests/", admin.site.admin_view(slow_requests_view), name="slow-requests"),
     path("django-admin/", admin.site.urls),
     path(
         "admin/",
@@ -8,3 +8,9 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "forge_admin.settings")
 
 application = get_wsgi_application()
+
+# Web processes listen for inventory changes (cache invalidation, /api/v1/changes/)
+# when CHANGE_FEED_ENABLED; management commands never start the listener.
+from inventory.services.change_feed import change_feed  # noqa: E402
+
+change_feed()
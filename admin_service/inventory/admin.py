@@ -1,15 +1,185 @@
 """Admin registrations for ForgeDesk data tables."""
 from __future__ import annotations
 
-from django.contrib import admin
+import csv
+import datetime
+from pathlib import Path
+
+from django.contrib import admin, messages
+from django.core.exceptions import PermissionDenied
+from django.db.models import IntegerField, OuterRef, Q, Subquery, Sum
+from django.http import HttpResponse
+from django.template.response import TemplateResponse
+from django.urls import path, reverse
+from django.utils import timezone
+from django.utils.html import format_html, format_html_join
+
+from forge_admin.replica import replica_view
 
 from . import models
+from .services import jobs
+from .services.cycle_counts import CycleCountPostingError, post_cycle_count_session
+from .services.dashboard import computed_labels, refresh_metrics
+from .services.estimates import EstimateAnalysisError, analyze_estimate
+from .services.locations import KEY_SEPARATOR, location_key, location_tree
+from .services.lookup_cache import cached_lookup
+from .services.maintenance_parts import (
+    document_labels,
+    machines_with_document,
+    most_used_items,
+    part_key,
+    records_using,
+)
+from .services.maintenance_schedule import forecast, overdue_by
+from .services.receiving import ReceivingError, receive_outstanding
+from .services.reliability import RELIABILITY_WINDOW_MONTHS, Reliability, machine_reliability, window_start
+from .services.skus import variant_index
+from .services.slotting import suggest_for_receipt
+from .services.uom import item_units, units_for
+
+
+class LocationLevelFilter(admin.SimpleListFilter):
+    """Hierarchy filter fed from the cached location tree instead of DISTINCT queries."""
+
+    parent_parameters: tuple[str, ...] = ()
+    field_prefix = ""
+
+    def _parent_labels(self, request) -> list[str] | None:
+        labels = [request.GET.get(parameter, "") for parameter in self.parent_parameters]
+        if any(label == "" for label in labels):
+            return None
+        return labels
+
+    def lookups(self, request, model_admin):
+        labels = self._parent_labels(request)
+        if labels is None:
+            return []
+        return location_tree().choices(*labels)
+
+    def queryset(self, request, queryset):
+        labels = self._parent_labels(request)
+        if self.value() is None or labels is None:
+            return queryset
+        key = location_key(*labels, self.value())
+        return queryset.filter(
+            Q(**{f"{self.field_prefix}location_key": key})
+            | Q(**{f"{self.field_prefix}location_key__startswith": key + KEY_SEPARATOR})
+        )
+
+
+class AisleFilter(LocationLevelFilter):
+    title = "aisle"
+    parameter_name = "aisle"
+
+
+class RackFilter(LocationLevelFilter):
+    title = "rack"
+    parameter_name = "rack"
+    parent_parameters = ("aisle",)
+
+
+class ShelfFilter(LocationLevelFilter):
+    title = "shelf"
+    parameter_name = "shelf"
+    parent_parameters = ("aisle", "rack")
+
+
+class CachedAllValuesFieldListFilter(admin.AllValuesFieldListFilter):
+    """``AllValuesFieldListFilter`` whose DISTINCT query is cached per table version."""
+
+    def __init__(self, field, request, params, model, model_admin, field_path):
+        super().__init__(field, request, params, model, model_admin, field_path)
+        choices = self.lookup_choices
+        self.lookup_choices = cached_lookup(
+            f"values:{model._meta.label_lower}:{field_path}",
+            (model._meta.db_table, field.model._meta.db_table),
+            lambda: list(choices),
+        )
+
+
+class CachedRelatedFieldListFilter(admin.RelatedFieldListFilter):
+    """``RelatedFieldListFilter`` whose related-object choices are cached per table version."""
+
+    def field_choices(self, field, request, model_admin):
+        related = field.remote_field.model._meta
+        ordering = self.field_admin_ordering(field, request, model_admin)
+        return cached_lookup(
+            f"related:{related.label_lower}:{','.join(ordering)}",
+            (related.db_table,),
+            lambda: super(CachedRelatedFieldListFilter, self).field_choices(field, request, model_admin),
+        )
+
+
+ESTIMATE_DISPLAY_LINES = 1000
+ESTIMATE_CSV_HEADER = (
+    "part_number",
+    "finish",
+    "required",
+    "status",
+    "sku",
+    "match",
+    "available",
+    "on_order",
+    "next_expected",
+    "shortfall",
+    "uncovered",
+    "other_finishes",
+)
+
+
+def _estimate_csv(filename: str, analysis) -> HttpResponse:  # pragma: no cover - admin helper
+    response = HttpResponse(content_type="text/csv")
+    response["Content-Disposition"] = f'attachment; filename="{Path(filename).stem}-check.csv"'
+    writer = csv.writer(response)
+    writer.writerow(ESTIMATE_CSV_HEADER)
+    for line in analysis.lines:
+        writer.writerow(
+            [
+                line.part_number,
+                line.finish or "",
+                line.required,
+                line.status,
+                line.sku or "",
+                line.match or "",
+                "" if line.available is None else line.available,
+                line.on_order,
+                line.next_expected or "",
+                line.shortfall,
+                line.uncovered,
+                " ".join(line.other_finishes),
+            ]
+        )
+    return response
+
+
+def _enqueue(model_admin, request, kind: str, payload: dict) -> None:  # pragma: no cover - admin helper
+    queued = jobs.enqueue(kind, payload, requested_by=request.user.get_username())
+    model_admin.message_user(
+        request,
+        f"Queued {queued}; track it under Background jobs.",
+        level=messages.SUCCESS,
+    )
 
 
 class InventoryItemLocationInline(admin.TabularInline):
     model = models.InventoryItemLocation
     extra = 0
     autocomplete_fields = ("storage_location",)
+    readonly_fields = ("pick_sequence",)
+
+    def get_queryset(self, request):
+        return (
+            super()
+            .get_queryset(request)
+            .select_related("storage_location")
+            .order_by("storage_location__sort_order", "storage_location__location_key")
+        )
+
+    @admin.display(description="Pick sequence")
+    def pick_sequence(self, obj):  # pragma: no cover - admin helper
+        if obj.storage_location_id is None:
+            return "-"
+        return location_tree().pick_path_rank().get(obj.storage_location_id, "-")
 
 
 @admin.register(models.InventoryItem)
@@ -27,7 +197,11 @@ class InventoryItemAdmin(admin.ModelAdmin):
         "average_daily_use",
         "supplier",
     )
-    list_filter = ("status", "supplier", "supplier_ref")
+    list_filter = (
+        ("status", CachedAllValuesFieldListFilter),
+        ("supplier", CachedAllValuesFieldListFilter),
+        ("supplier_ref", CachedRelatedFieldListFilter),
+    )
     search_fields = (
         "item",
         "sku",
@@ -38,17 +212,125 @@ class InventoryItemAdmin(admin.ModelAdmin):
         "supplier_sku",
     )
     ordering = ("item",)
-    readonly_fields = ("average_daily_use",)
+    readonly_fields = ("average_daily_use", "other_finishes")
     autocomplete_fields = ("supplier_ref",)
     inlines = [InventoryItemLocationInline]
+    actions = ["recompute_average_daily_use"]
+
+    @admin.display(description="Other finishes")
+    def other_finishes(self, obj):  # pragma: no cover - admin helper
+        siblings = variant_index().siblings(obj.pk) if obj.pk else []
+        if not siblings:
+            return "-"
+        return format_html_join(
+            ", ",
+            '<a href="{}">{}</a>',
+            (
+                (reverse("admin:inventory_inventoryitem_change", args=[variant.item_id]), variant.sku)
+                for variant in siblings
+            ),
+        )
+
+    def get_search_results(self, request, queryset, search_term):  # pragma: no cover - admin helper
+        # A term that is exactly a SKU or part number also lists every finish
+        # of that part from the variant index, alongside the normal matches.
+        results, may_have_duplicates = super().get_search_results(request, queryset, search_term)
+        term = search_term.strip()
+        if not term:
+            return results, may_have_duplicates
+        index = variant_index()
+        variant = index.by_sku(term)
+        variants = index.variants(variant.part_number if variant else term)
+        if variants:
+            results = results | queryset.filter(pk__in=[variant.item_id for variant in variants])
+        return results, may_have_duplicates
+
+    def get_urls(self):
+        urls = [
+            path(
+                "estimate-check/",
+                self.admin_site.admin_view(self.estimate_check_view),
+                name="inventory_inventoryitem_estimate_check",
+            ),
+        ]
+        return urls + super().get_urls()
+
+    def estimate_check_view(self, request):  # pragma: no cover - admin view
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+        analysis = None
+        if request.method == "POST":
+            upload = request.FILES.get("workbook")
+            if upload is None:
+                self.message_user(request, "Choose an estimate workbook to check.", level=messages.ERROR)
+            else:
+                try:
+                    analysis = analyze_estimate(upload)
+                except EstimateAnalysisError as exc:
+                    self.message_user(request, f"{upload.name}: {exc}", level=messages.ERROR)
+                else:
+                    if request.POST.get("format") == "csv":
+                        return _estimate_csv(upload.name, analysis)
+        context = {
+            **self.admin_site.each_context(request),
+            "opts": self.model._meta,
+            "title": "Estimate check",
+            "analysis": analysis,
+            "lines": analysis.lines[:ESTIMATE_DISPLAY_LINES] if analysis else [],
+            "display_limit": ESTIMATE_DISPLAY_LINES,
+        }
+        return TemplateResponse(request, "admin/inventory/inventoryitem/estimate_check.html", context)
+
+    @admin.action(description="Recompute average daily use in the background")
+    def recompute_average_daily_use(self, request, queryset):  # pragma: no cover - admin helper
+        item_ids = list(queryset.order_by("id").values_list("id", flat=True))
+        _enqueue(self, request, "recompute_average_daily_use", {"item_ids": item_ids})
+
+
+@admin.register(models.UomConversion)
+class UomConversionAdmin(admin.ModelAdmin):
+    list_display = ("unit", "stock_per_unit", "inventory_item", "notes")
+    list_filter = (("inventory_item", admin.EmptyFieldListFilter),)
+    search_fields = ("unit", "inventory_item__item", "inventory_item__sku")
+    autocomplete_fields = ("inventory_item",)
+    ordering = ("unit", "inventory_item")
 
 
 @admin.register(models.InventoryMetric)
 class InventoryMetricAdmin(admin.ModelAdmin):
-    list_display = ("label", "value", "delta", "timeframe", "accent", "sort_order")
+    list_display = ("label", "value", "delta", "timeframe", "accent", "sort_order", "is_computed")
     list_editable = ("value", "delta", "timeframe", "accent", "sort_order")
     search_fields = ("label",)
     ordering = ("sort_order", "label")
+    actions = ["refresh_computed_metrics"]
+
+    computed_fields = ("value", "delta", "timeframe")
+
+    @admin.display(description="Computed", boolean=True)
+    def is_computed(self, obj):  # pragma: no cover - admin helper
+        return obj.label in computed_labels()
+
+    def get_readonly_fields(self, request, obj=None):  # pragma: no cover - admin helper
+        if obj is not None and obj.label in computed_labels():
+            return self.computed_fields
+        return super().get_readonly_fields(request, obj)
+
+    def get_changelist_form(self, request, **kwargs):  # pragma: no cover - admin helper
+        base = super().get_changelist_form(request, **kwargs)
+        computed_fields = self.computed_fields
+
+        class MetricChangelistForm(base):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                if self.instance.label in computed_labels():
+                    for name in computed_fields:
+                        self.fields[name].disabled = True
+
+        return MetricChangelistForm
+
+    @admin.action(description="Recompute computed metrics now")
+    def refresh_computed_metrics(self, request, queryset):  # pragma: no cover - admin helper
+        self.message_user(request, f"Recomputed {refresh_metrics()} metrics.", level=messages.SUCCESS)
 
 
 class JobReservationItemInline(admin.TabularInline):
@@ -61,7 +343,7 @@ class JobReservationItemInline(admin.TabularInline):
 @admin.register(models.JobReservation)
 class JobReservationAdmin(admin.ModelAdmin):
     list_display = ("job_number", "job_name", "requested_by", "needed_by", "status")
-    list_filter = ("status", "requested_by")
+    list_filter = (("status", CachedAllValuesFieldListFilter), ("requested_by", CachedAllValuesFieldListFilter))
     search_fields = ("job_number", "job_name", "requested_by")
     inlines = [JobReservationItemInline]
 
@@ -79,6 +361,22 @@ class CycleCountSessionAdmin(admin.ModelAdmin):
     search_fields = ("name", "location_filter")
     date_hierarchy = "started_at"
     inlines = [CycleCountLineInline]
+    actions = ["post_sessions"]
+
+    @admin.action(description="Post selected sessions to the inventory ledger")
+    def post_sessions(self, request, queryset):  # pragma: no cover - admin helper
+        for session_id in queryset.order_by("id").values_list("id", flat=True):
+            try:
+                result = post_cycle_count_session(session_id)
+            except CycleCountPostingError as exc:
+                self.message_user(request, str(exc), level=messages.ERROR)
+                continue
+            self.message_user(
+                request,
+                f"Session #{result.session_id}: adjusted {result.adjusted_items} items "
+                f"(net {result.net_variance:+d}), {result.skipped_lines} lines skipped.",
+                level=messages.SUCCESS,
+            )
 
 
 @admin.register(models.CycleCountLine)
@@ -93,7 +391,7 @@ class CycleCountLineAdmin(admin.ModelAdmin):
         "counted_at",
         "is_skipped",
     )
-    list_filter = ("session", "is_skipped")
+    list_filter = (("session", CachedRelatedFieldListFilter), "is_skipped")
     search_fields = ("session__name", "inventory_item__item", "inventory_item__sku")
     raw_id_fields = ("session", "inventory_item")
 
@@ -127,11 +425,151 @@ class InventoryTransactionLineAdmin(admin.ModelAdmin):
     autocomplete_fields = ("transaction", "inventory_item")
 
 
+@admin.register(models.MaintenancePartPosting)
+class MaintenancePartPostingAdmin(admin.ModelAdmin):
+    list_display = (
+        "__str__",
+        "inventory_transaction",
+        "record_count",
+        "line_count",
+        "unmatched_count",
+        "short_quantity",
+        "posted_at",
+    )
+    ordering = ("-last_record_id",)
+    date_hierarchy = "posted_at"
+
+    def has_add_permission(self, request):  # pragma: no cover - admin helper
+        return False
+
+    def has_change_permission(self, request, obj=None):  # pragma: no cover - admin helper
+        return False
+
+
+@admin.register(models.MovementBatch)
+class MovementBatchAdmin(admin.ModelAdmin):
+    list_display = ("idempotency_key", "inventory_transaction", "requested_by", "created_at")
+    search_fields = ("idempotency_key", "inventory_transaction__reference")
+    date_hierarchy = "created_at"
+
+    def has_add_permission(self, request):  # pragma: no cover - admin helper
+        return False
+
+    def has_change_permission(self, request, obj=None):  # pragma: no cover - admin helper
+        return False
+
+
+@admin.register(models.BackgroundJob)
+class BackgroundJobAdmin(admin.ModelAdmin):
+    list_display = (
+        "__str__",
+        "status",
+        "progress",
+        "attempts",
+        "requested_by",
+        "created_at",
+        "finished_at",
+    )
+    list_filter = ("status", "kind")
+    search_fields = ("kind", "requested_by", "error")
+    date_hierarchy = "created_at"
+    actions = ["retry_jobs", "cancel_jobs"]
+
+    def has_add_permission(self, request):  # pragma: no cover - admin helper
+        return False
+
+    def has_change_permission(self, request, obj=None):  # pragma: no cover - admin helper
+        return False
+
+    @admin.display(description="Progress")
+    def progress(self, obj):  # pragma: no cover - admin helper
+        if obj.status != "running" and not obj.progress_current:
+            return "-"
+        if obj.progress_total:
+            percent = min(100, obj.progress_current * 100 // obj.progress_total)
+            return format_html(
+                '<progress max="100" value="{}"></progress> {}/{} {}',
+                percent,
+                obj.progress_current,
+                obj.progress_total,
+                obj.progress_message or "",
+            )
+        return format_html("{} {}", obj.progress_current, obj.progress_message or "")
+
+    @admin.action(description="Retry selected failed or cancelled jobs")
+    def retry_jobs(self, request, queryset):  # pragma: no cover - admin helper
+        count = jobs.retry(queryset.values_list("id", flat=True))
+        self.message_user(request, f"Requeued {count} jobs.", level=messages.SUCCESS)
+
+    @admin.action(description="Cancel selected queued jobs")
+    def cancel_jobs(self, request, queryset):  # pragma: no cover - admin helper
+        count = jobs.cancel(queryset.values_list("id", flat=True))
+        self.message_user(request, f"Cancelled {count} jobs.", level=messages.SUCCESS)
+
+
+class SupplierLeadTimeStatInline(admin.TabularInline):
+    model = models.SupplierLeadTimeStat
+    fk_name = "supplier"
+    extra = 0
+    can_delete = False
+    fields = ("inventory_item", "sample_count", "mean_days", "p50_days", "p90_days", "on_time_rate", "refreshed_at")
+    readonly_fields = fields
+    verbose_name_plural = "Observed lead times"
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related("inventory_item").order_by("inventory_item__item")
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+
 @admin.register(models.Supplier)
 class SupplierAdmin(admin.ModelAdmin):
-    list_display = ("name", "contact_name", "contact_email", "default_lead_time_days")
+    list_display = (
+        "name",
+        "contact_name",
+        "contact_email",
+        "default_lead_time_days",
+        "observed_lead_time",
+        "p90_lead_time",
+        "on_time_rate",
+    )
     search_fields = ("name", "contact_name", "contact_email")
-    list_filter = ("default_lead_time_days",)
+    list_filter = (("default_lead_time_days", CachedAllValuesFieldListFilter),)
+    inlines = [SupplierLeadTimeStatInline]
+    actions = ["refresh_lead_times"]
+
+    @admin.action(description="Refresh lead time statistics in the background")
+    def refresh_lead_times(self, request, queryset):  # pragma: no cover - admin helper
+        _enqueue(self, request, "refresh_lead_times", {"full": True})
+
+    def get_queryset(self, request):
+        summary = models.SupplierLeadTimeStat.objects.filter(
+            supplier=OuterRef("pk"), inventory_item__isnull=True
+        )
+        return (
+            super()
+            .get_queryset(request)
+            .annotate(
+                observed_p50_days=Subquery(summary.values("p50_days")[:1]),
+                observed_p90_days=Subquery(summary.values("p90_days")[:1]),
+                observed_on_time_rate=Subquery(summary.values("on_time_rate")[:1]),
+            )
+        )
+
+    @admin.display(description="Lead time p50 (days)", ordering="observed_p50_days")
+    def observed_lead_time(self, obj):  # pragma: no cover - admin helper
+        return obj.observed_p50_days
+
+    @admin.display(description="Lead time p90 (days)", ordering="observed_p90_days")
+    def p90_lead_time(self, obj):  # pragma: no cover - admin helper
+        return obj.observed_p90_days
+
+    @admin.display(description="On time", ordering="observed_on_time_rate")
+    def on_time_rate(self, obj):  # pragma: no cover - admin helper
+        if obj.observed_on_time_rate is None:
+            return None
+        return f"{obj.observed_on_time_rate * 100:.0f}%"
 
 
 @admin.register(models.StorageLocation)
@@ -145,20 +583,13 @@ class StorageLocationAdmin(admin.ModelAdmin):
         "is_active",
         "sort_order",
     )
-    list_filter = ("is_active", "aisle", "rack", "shelf")
+    list_filter = ("is_active", AisleFilter, RackFilter, ShelfFilter)
     search_fields = ("name", "description", "aisle", "rack", "shelf", "bin")
-    ordering = ("sort_order", "aisle", "rack", "shelf", "bin", "name")
+    ordering = ("sort_order", "location_key")
 
-    @admin.display(description="Name")
+    @admin.display(description="Name", ordering="location_key")
     def display_name(self, obj):  # pragma: no cover - admin helper
-        parts = [
-            value
-            for value in [obj.aisle, obj.rack, obj.shelf, obj.bin]
-            if value not in (None, "")
-        ]
-        if parts:
-            return ".".join(parts)
-        return obj.name
+        return str(obj)
 
 
 @admin.register(models.InventoryItemLocation)
@@ -207,11 +638,26 @@ class PurchaseOrderReceiptInline(admin.TabularInline):
 @admin.register(models.PurchaseOrder)
 class PurchaseOrderAdmin(admin.ModelAdmin):
     list_display = ("display_number", "status", "supplier", "order_date", "expected_date", "total_cost")
-    list_filter = ("status", "supplier")
+    list_filter = (("status", CachedAllValuesFieldListFilter), ("supplier", CachedRelatedFieldListFilter))
     search_fields = ("order_number", "supplier__name")
     autocomplete_fields = ("supplier",)
     readonly_fields = ("created_at", "updated_at")
     inlines = [PurchaseOrderLineInline, PurchaseOrderReceiptInline]
+    actions = ["receive_outstanding_quantities"]
+
+    @admin.action(description="Receive all outstanding quantities")
+    def receive_outstanding_quantities(self, request, queryset):  # pragma: no cover - admin helper
+        for order in queryset.filter(status__in=("sent", "partially_received")).order_by("id"):
+            try:
+                result = receive_outstanding(order.pk)
+            except ReceivingError as exc:
+                self.message_user(request, f"{order}: {exc}", level=messages.ERROR)
+                continue
+            self.message_user(
+                request,
+                f"{order}: received {len(result.lines)} lines, status now {result.status or order.status}.",
+                level=messages.SUCCESS,
+            )
 
     @admin.display(description="PO")
     def display_number(self, obj):  # pragma: no cover - admin helper
@@ -242,6 +688,18 @@ class PurchaseOrderLineAdmin(admin.ModelAdmin):
     autocomplete_fields = ("purchase_order", "inventory_item")
     readonly_fields = ("created_at", "updated_at")
 
+    def save_model(self, request, obj, form, change):  # pragma: no cover - admin helper
+        # Blank pack fields default from the item, then ordered quantity and
+        # packs are derived from each other as purchaseOrderNormalizeLine does.
+        defaults = item_units([obj.inventory_item_id]).get(obj.inventory_item_id) if obj.inventory_item_id else None
+        if defaults is not None:
+            obj.pack_size = obj.pack_size or defaults.pack_size
+            obj.purchase_uom = obj.purchase_uom or defaults.purchase_uom
+            obj.stock_uom = obj.stock_uom or defaults.stock_uom
+        units = units_for(obj.inventory_item_id, obj.pack_size, obj.purchase_uom, obj.stock_uom)
+        obj.quantity_ordered, obj.packs_ordered = units.line_quantities(obj.quantity_ordered, obj.packs_ordered)
+        super().save_model(request, obj, form, change)
+
 
 class PurchaseOrderReceiptLineInline(admin.TabularInline):
     model = models.PurchaseOrderReceiptLine
@@ -255,9 +713,40 @@ class PurchaseOrderReceiptAdmin(admin.ModelAdmin):
     list_display = ("reference", "purchase_order", "created_at", "total_received", "total_cancelled")
     search_fields = ("reference", "purchase_order__order_number")
     autocomplete_fields = ("purchase_order", "inventory_transaction")
-    readonly_fields = ("created_at", "total_received", "total_cancelled")
+    readonly_fields = ("created_at", "total_received", "total_cancelled", "putaway_plan")
     inlines = [PurchaseOrderReceiptLineInline]
 
+    @admin.display(description="Putaway suggestions")
+    def putaway_plan(self, obj):  # pragma: no cover - admin helper
+        if obj is None or obj.pk is None:
+            return "-"
+        suggestions = suggest_for_receipt(obj.pk)
+        if not suggestions:
+            return "-"
+        skus = dict(
+            models.InventoryItem.objects.filter(
+                id__in={suggestion.inventory_item_id for suggestion in suggestions}
+            ).values_list("id", "sku")
+        )
+        rows = format_html_join(
+            "",
+            "<tr><td>{}</td><td>{}</td><td>{}</td><td>{}</td></tr>",
+            (
+                (
+                    skus.get(suggestion.inventory_item_id, suggestion.inventory_item_id),
+                    suggestion.quantity.normalize(),
+                    suggestion.location or "-",
+                    suggestion.reason,
+                )
+                for suggestion in suggestions
+            ),
+        )
+        return format_html(
+            "<table><thead><tr><th>SKU</th><th>Qty</th><th>Bin</th><th>Why</th></tr></thead>"
+            "<tbody>{}</tbody></table>",
+            rows,
+        )
+
     @admin.display(description="Total received")
     def total_received(self, obj):  # pragma: no cover - admin helper
         return obj.total_received
@@ -296,14 +785,133 @@ class MaintenanceRecordInline(admin.TabularInline):
     readonly_fields = ("created_at",)
 
 
+class MachineDocumentFilter(admin.SimpleListFilter):
+    title = "document"
+    parameter_name = "document"
+
+    def lookups(self, request, model_admin):
+        labels = cached_lookup("machine-document-labels", ("maintenance_machines",), document_labels)
+        return [(label, label) for label in labels]
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(pk__in=machines_with_document(self.value()).values("pk"))
+        return queryset
+
+
 @admin.register(models.MaintenanceMachine)
 class MaintenanceMachineAdmin(admin.ModelAdmin):
-    list_display = ("name", "equipment_type", "manufacturer", "model", "location", "updated_at")
+    list_display = (
+        "name",
+        "equipment_type",
+        "manufacturer",
+        "model",
+        "location",
+        "downtime_12m",
+        "mtbf",
+        "mttr",
+        "updated_at",
+    )
     search_fields = ("name", "equipment_type", "manufacturer", "model", "serial_number", "location")
-    list_filter = ("equipment_type",)
+    list_filter = (("equipment_type", CachedAllValuesFieldListFilter), MachineDocumentFilter)
     ordering = ("name",)
     inlines = [MaintenanceTaskInline, MaintenanceRecordInline]
 
+    def get_queryset(self, request):
+        window = models.MaintenanceMachineMonthlyStat.objects.filter(
+            machine=OuterRef("pk"), month__gte=window_start(RELIABILITY_WINDOW_MONTHS)
+        ).values("machine")
+
+        def total(field):
+            return Subquery(window.annotate(total=Sum(field)).values("total"), output_field=IntegerField())
+
+        return (
+            super()
+            .get_queryset(request)
+            .annotate(
+                rollup_downtime=total("downtime_minutes"),
+                rollup_failures=total("failure_count"),
+            )
+        )
+
+    def _reliability(self, obj) -> Reliability:  # pragma: no cover - admin helper
+        return Reliability.for_window(
+            failures=obj.rollup_failures or 0,
+            downtime_minutes=obj.rollup_downtime or 0,
+        )
+
+    @admin.display(description="Downtime 12m (min)", ordering="rollup_downtime")
+    def downtime_12m(self, obj):  # pragma: no cover - admin helper
+        return obj.rollup_downtime or 0
+
+    @admin.display(description="MTBF (h)")
+    def mtbf(self, obj):  # pragma: no cover - admin helper
+        value = self._reliability(obj).mtbf_hours
+        return None if value is None else f"{value:.0f}"
+
+    @admin.display(description="MTTR (min)")
+    def mttr(self, obj):  # pragma: no cover - admin helper
+        value = self._reliability(obj).mttr_minutes
+        return None if value is None else f"{value:.0f}"
+
+    def get_urls(self):
+        urls = [
+            path(
+                "reliability/",
+                self.admin_site.admin_view(replica_view(self.reliability_view)),
+                name="inventory_maintenancemachine_reliability",
+            ),
+        ]
+        return urls + super().get_urls()
+
+    def reliability_view(self, request):  # pragma: no cover - admin view
+        start = window_start(RELIABILITY_WINDOW_MONTHS)
+        months = [window_start(RELIABILITY_WINDOW_MONTHS - offset) for offset in range(RELIABILITY_WINDOW_MONTHS)]
+        downtime: dict[int, dict[datetime.date, int]] = {}
+        for machine_id, month, minutes in models.MaintenanceMachineMonthlyStat.objects.filter(
+            month__gte=start
+        ).values_list("machine_id", "month", "downtime_minutes"):
+            downtime.setdefault(machine_id, {})[month] = minutes
+
+        totals = machine_reliability(RELIABILITY_WINDOW_MONTHS)
+        machines = models.MaintenanceMachine.objects.filter(pk__in=totals).order_by("name")
+        context = {
+            **self.admin_site.each_context(request),
+            "opts": self.model._meta,
+            "title": "Machine reliability",
+            "start": start,
+            "months": months,
+            "rows": [
+                (machine, totals[machine.pk], [downtime.get(machine.pk, {}).get(month, 0) for month in months])
+                for machine in machines
+            ],
+        }
+        return TemplateResponse(request, "admin/inventory/maintenancemachine/reliability.html", context)
+
+
+class MaintenanceDueFilter(admin.SimpleListFilter):
+    title = "due"
+    parameter_name = "due"
+
+    def lookups(self, request, model_admin):
+        return (
+            ("overdue", "Overdue"),
+            ("7", "Due within 7 days"),
+            ("30", "Due within 30 days"),
+            ("unscheduled", "No schedule"),
+        )
+
+    def queryset(self, request, queryset):
+        today = timezone.localdate()
+        if self.value() == "overdue":
+            return queryset.filter(status="active", next_due_date__lt=today)
+        if self.value() in ("7", "30"):
+            horizon = today + datetime.timedelta(days=int(self.value()))
+            return queryset.filter(status="active", next_due_date__lte=horizon)
+        if self.value() == "unscheduled":
+            return queryset.filter(next_due_date__isnull=True)
+        return queryset
+
 
 @admin.register(models.MaintenanceTask)
 class MaintenanceTaskAdmin(admin.ModelAdmin):
@@ -318,6 +926,8 @@ class MaintenanceTaskAdmin(admin.ModelAdmin):
         "priority",
         "start_date",
         "last_completed_at",
+        "next_due_date",
+        "overdue_days",
         "updated_at",
     )
     search_fields = (
@@ -328,9 +938,80 @@ class MaintenanceTaskAdmin(admin.ModelAdmin):
         "status",
         "priority",
     )
-    list_filter = ("frequency", "status", "priority")
+    list_filter = (MaintenanceDueFilter, "frequency", "status", "priority")
     autocomplete_fields = ("machine",)
     ordering = ("machine", "title")
+    readonly_fields = ("next_due_date",)
+    list_select_related = ("machine",)
+
+    @admin.display(description="Overdue (days)", ordering="next_due_date")
+    def overdue_days(self, obj):  # pragma: no cover - admin helper
+        if obj.status != "active":
+            return None
+        return overdue_by(obj.next_due_date)
+
+    def get_urls(self):
+        urls = [
+            path(
+                "forecast/",
+                self.admin_site.admin_view(replica_view(self.forecast_view)),
+                name="inventory_maintenancetask_forecast",
+            ),
+        ]
+        return urls + super().get_urls()
+
+    def forecast_view(self, request):  # pragma: no cover - admin view
+        start = timezone.localdate()
+        try:
+            days = max(1, min(int(request.GET.get("days", 28)), 366))
+        except ValueError:
+            days = 28
+        calendar = forecast(start, days)
+        task_ids = {task_id for ids in calendar.values() for task_id in ids}
+        tasks = models.MaintenanceTask.objects.select_related("machine").in_bulk(task_ids)
+        context = {
+            **self.admin_site.each_context(request),
+            "opts": self.model._meta,
+            "title": "Maintenance forecast",
+            "start": start,
+            "days": days,
+            "calendar": [
+                (day, [tasks[task_id] for task_id in ids if task_id in tasks]) for day, ids in calendar.items()
+            ],
+        }
+        return TemplateResponse(request, "admin/inventory/maintenancetask/forecast.html", context)
+
+
+class MaintenancePartFilter(admin.SimpleListFilter):
+    """Records that used a SKU; any ``?part=<sku>`` works, the list shows the most used."""
+
+    title = "part used"
+    parameter_name = "part"
+
+    def lookups(self, request, model_admin):
+        items = cached_lookup(
+            "maintenance-most-used-items", ("maintenance_record_parts", "inventory_items"), most_used_items
+        )
+        return [(sku, f"{sku} - {item}") for _, sku, item in items]
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(pk__in=records_using(self.value()).values("pk"))
+        return queryset
+
+
+class MaintenanceRecordPartInline(admin.TabularInline):
+    model = models.MaintenanceRecordPart
+    extra = 0
+    can_delete = False
+    fields = ("position", "part_text", "quantity", "inventory_item")
+    readonly_fields = fields
+
+    def has_add_permission(self, request, obj=None):  # pragma: no cover - admin helper
+        return False
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related("inventory_item")
 
 
 @admin.register(models.MaintenanceRecord)
@@ -349,12 +1030,21 @@ class MaintenanceRecordAdmin(admin.ModelAdmin):
         "task__title",
         "performed_by",
         "notes",
-        "parts_used",
     )
-    list_filter = ("performed_at", "downtime_minutes")
+    list_filter = ("performed_at", "downtime_minutes", MaintenancePartFilter)
     autocomplete_fields = ("machine", "task")
     date_hierarchy = "performed_at"
     ordering = ("-performed_at", "-created_at")
+    inlines = [MaintenanceRecordPartInline]
+
+    def get_search_results(self, request, queryset, search_term):
+        # Part matches go through the normalised part table instead of
+        # casting parts_used to text.
+        matches, may_have_duplicates = super().get_search_results(request, queryset, search_term)
+        if search_term.strip():
+            parts = models.MaintenanceRecordPart.objects.filter(part_key=part_key(search_term))
+            matches |= queryset.filter(pk__in=parts.values("record_id"))
+        return matches, may_have_duplicates
 
 
 @admin.register(models.ConfiguratorPartUseOption)
@@ -368,7 +1058,7 @@ class ConfiguratorPartUseOptionAdmin(admin.ModelAdmin):
 @admin.register(models.ConfiguratorPartProfile)
 class ConfiguratorPartProfileAdmin(admin.ModelAdmin):
     list_display = ("inventory_item", "is_enabled", "part_type", "height_lz", "depth_ly", "created_at")
-    list_filter = ("is_enabled", "part_type")
+    list_filter = ("is_enabled", ("part_type", CachedAllValuesFieldListFilter))
     search_fields = ("inventory_item__item", "inventory_item__sku", "part_type")
     autocomplete_fields = ("inventory_item",)
     readonly_fields = ("created_at",)
@@ -0,0 +1,482 @@
+"""Versioned JSON API served under ``/api/v1/``.
+
+Each resource is a ``values()`` query over an allow-listed set of fields,
+paged by primary key: ``?limit=`` (up to ``MAX_LIMIT``) and ``?cursor=``
+taken from the previous page's ``next_cursor``.  ``?fields=a,b`` trims the
+payload; ``id`` is always included.
+
+Responses carry an ETag and ``Last-Modified`` built from the table versions
+in :mod:`inventory.services.changes` for the tables the resource reads, so a
+poller's conditional request is answered with a 304 after two index lookups
+per table.
+
+Clients send ``Authorization: Bearer <token>`` with a token from
+``API_TOKENS``, or use a staff session that can view the resource's model.
+
+``POST movements/`` is the one write endpoint: a batch of issues, receipts
+and transfers posted atomically (see :mod:`inventory.services.movements`).
+It accepts only tokens from ``API_WRITE_TOKENS`` and requires an
+``Idempotency-Key`` header so clients can retry safely.
+
+``GET changes/`` is a server-sent events stream of the change feed (see
+:mod:`inventory.services.change_feed`), for clients that would otherwise poll.
+"""
+from __future__ import annotations
+
+import base64
+import binascii
+import hmac
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Callable
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db.models import (
+    BooleanField,
+    DecimalField,
+    ExpressionWrapper,
+    F,
+    IntegerField,
+    Model,
+    Q,
+    QuerySet,
+    Value,
+)
+from django.db.models.functions import Coalesce, Greatest, Lower, Upper
+from django.http import HttpResponseNotAllowed, JsonResponse, StreamingHttpResponse
+from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST, require_safe
+
+from forge_admin.replica import replica_view
+
+from . import models
+from .services.change_feed import ChangeFeed, change_feed
+from .services.changes import table_versions
+from .services.movements import MovementError, parse_movements, post_movements, request_hash
+from .services.receiving import OPEN_STATUSES
+
+API_VERSION = "v1"
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 500
+MAX_IDEMPOTENCY_KEY_LENGTH = 200
+# Change stream: comment lines keep proxies from timing the stream out, and
+# streams end after SSE_MAX_SECONDS so clients that went away are released;
+# EventSource reconnects with Last-Event-ID and resumes.
+SSE_HEARTBEAT_SECONDS = 15
+SSE_MAX_SECONDS = 300
+SSE_RETRY_MILLISECONDS = 3000
+ACTIVE_RESERVATION_STATUSES = ("draft", "committed", "active", "in_progress", "on_hold")
+
+_ZERO = Value(0, output_field=DecimalField())
+_BELOW_REORDER = Q(stock__lt=F("committed_qty") + F("reorder_point"))
+
+
+def _integer(value: str) -> int:
+    try:
+        return int(value)
+    except ValueError:
+        raise ApiError(f"Expected an integer, got {value!r}.") from None
+
+
+@dataclass(frozen=True)
+class Resource:
+    name: str
+    model: type[Model]
+    tables: tuple[str, ...]
+    # Output name -> model field (same name), lookup path or expression.
+    fields: dict[str, str | object]
+    queryset: Callable[[], QuerySet]
+    filters: dict[str, Callable[[str], Q]] = field(default_factory=dict)
+    description: str = ""
+
+    def values(self, names: list[str]) -> QuerySet:
+        plain = [name for name in names if self.fields[name] == name]
+        computed = {
+            name: F(self.fields[name]) if isinstance(self.fields[name], str) else self.fields[name]
+            for name in names
+            if self.fields[name] != name
+        }
+        return self.queryset().values(*plain, **computed)
+
+
+class ApiError(Exception):
+    def __init__(self, message: str, status: int = 400) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+RESOURCES = {
+    resource.name: resource
+    for resource in (
+        Resource(
+            name="items",
+            model=models.InventoryItem,
+            tables=("inventory_items",),
+            description="Inventory items with stock, planning and purchasing fields.",
+            fields={
+                "id": "id",
+                "sku": "sku",
+                "item": "item",
+                "part_number": "part_number",
+                "finish": "finish",
+                "location": "location",
+                "status": "status",
+                "stock": "stock",
+                "committed_qty": "committed_qty",
+                "on_order_qty": "on_order_qty",
+                "reorder_point": "reorder_point",
+                "safety_stock": "safety_stock",
+                "lead_time_days": "lead_time_days",
+                "average_daily_use": "average_daily_use",
+                "supplier": "supplier",
+                "supplier_id": "supplier_ref",
+                "supplier_sku": "supplier_sku",
+                "pack_size": "pack_size",
+                "purchase_uom": "purchase_uom",
+                "stock_uom": "stock_uom",
+            },
+            queryset=lambda: models.InventoryItem.objects.alias(
+                sku_lower=Lower("sku"), part_upper=Upper("part_number")
+            ),
+            filters={
+                "sku": lambda value: Q(sku_lower=value.strip().lower()),
+                "part_number": lambda value: Q(part_upper=value.strip().upper()),
+                "status": lambda value: Q(status=value),
+                "supplier_id": lambda value: Q(supplier_ref_id=_integer(value)),
+            },
+        ),
+        Resource(
+            name="availability",
+            model=models.InventoryItem,
+            tables=("inventory_items",),
+            description="Available-to-promise stock for active items.",
+            fields={
+                "id": "id",
+                "sku": "sku",
+                "stock": "stock",
+                "committed_qty": "committed_qty",
+                "available": ExpressionWrapper(F("stock") - F("committed_qty"), output_field=IntegerField()),
+                "on_order_qty": "on_order_qty",
+                "projected": ExpressionWrapper(
+                    F("stock") - F("committed_qty") + Coalesce("on_order_qty", _ZERO), output_field=DecimalField()
+                ),
+                "reorder_point": "reorder_point",
+                "safety_stock": "safety_stock",
+                "below_reorder": ExpressionWrapper(_BELOW_REORDER, output_field=BooleanField()),
+            },
+            queryset=lambda: models.InventoryItem.objects.exclude(status__iexact="discontinued"),
+            filters={
+                "below_reorder": lambda value: _BELOW_REORDER if value in ("1", "true") else ~_BELOW_REORDER,
+            },
+        ),
+        Resource(
+            name="locations",
+            model=models.InventoryItemLocation,
+            tables=("inventory_item_locations", "storage_locations", "inventory_items"),
+            description="Quantities held per item and storage location.",
+            fields={
+                "id": "id",
+                "inventory_item_id": "inventory_item_id",
+                "sku": "inventory_item__sku",
+                "storage_location_id": "storage_location_id",
+                "location": Coalesce("storage_location__path", "storage_location__name"),
+                "location_active": "storage_location__is_active",
+                "quantity": "quantity",
+            },
+            queryset=lambda: models.InventoryItemLocation.objects.all(),
+            filters={
+                "inventory_item_id": lambda value: Q(inventory_item_id=_integer(value)),
+                "storage_location_id": lambda value: Q(storage_location_id=_integer(value)),
+            },
+        ),
+        Resource(
+            name="purchase-orders",
+            model=models.PurchaseOrderLine,
+            tables=("purchase_order_lines", "purchase_orders", "inventory_items"),
+            description="Lines of open purchase orders with outstanding quantities.",
+            fields={
+                "id": "id",
+                "purchase_order_id": "purchase_order_id",
+                "order_number": "purchase_order__order_number",
+                "supplier_id": "purchase_order__supplier",
+                "status": "purchase_order__status",
+                "order_date": "purchase_order__order_date",
+                "due_date": Coalesce("expected_date", "purchase_order__expected_date"),
+                "inventory_item_id": "inventory_item_id",
+                "sku": "inventory_item__sku",
+                "supplier_sku": "supplier_sku",
+                "description": "description",
+                "quantity_ordered": "quantity_ordered",
+                "quantity_received": "quantity_received",
+                "quantity_cancelled": "quantity_cancelled",
+                "outstanding": Greatest(
+                    F("quantity_ordered") - F("quantity_received") - Coalesce("quantity_cancelled", _ZERO), _ZERO
+                ),
+                "unit_cost": "unit_cost",
+                "pack_size": "pack_size",
+                "purchase_uom": "purchase_uom",
+            },
+            queryset=lambda: models.PurchaseOrderLine.objects.filter(purchase_order__status__in=OPEN_STATUSES),
+            filters={
+                "purchase_order_id": lambda value: Q(purchase_order_id=_integer(value)),
+                "supplier_id": lambda value: Q(purchase_order__supplier_id=_integer(value)),
+                "inventory_item_id": lambda value: Q(inventory_item_id=_integer(value)),
+            },
+        ),
+        Resource(
+            name="reservations",
+            model=models.JobReservationItem,
+            tables=("job_reservation_items", "job_reservations", "inventory_items"),
+            description="Lines of active job reservations.",
+            fields={
+                "id": "id",
+                "reservation_id": "reservation_id",
+                "job_number": "reservation__job_number",
+                "job_name": "reservation__job_name",
+                "status": "reservation__status",
+                "needed_by": "reservation__needed_by",
+                "inventory_item_id": "inventory_item_id",
+                "sku": "inventory_item__sku",
+                "requested_qty": "requested_qty",
+                "committed_qty": "committed_qty",
+                "consumed_qty": "consumed_qty",
+            },
+            queryset=lambda: models.JobReservationItem.objects.filter(
+                reservation__status__in=ACTIVE_RESERVATION_STATUSES
+            ),
+            filters={
+                "reservation_id": lambda value: Q(reservation_id=_integer(value)),
+                "job_number": lambda value: Q(reservation__job_number=value),
+                "inventory_item_id": lambda value: Q(inventory_item_id=_integer(value)),
+            },
+        ),
+    )
+}
+
+_RESERVED_PARAMETERS = {"cursor", "limit", "fields"}
+
+
+def _bearer_token(request) -> str | None:
+    header = request.headers.get("Authorization", "")
+    return header.removeprefix("Bearer ").strip() if header.startswith("Bearer ") else None
+
+
+def _token_allowed(token: str, allowed: list[str]) -> bool:
+    return any(hmac.compare_digest(token, candidate) for candidate in allowed)
+
+
+def _staff_can_view(request, model: type[Model]) -> bool:
+    user = request.user
+    opts = model._meta
+    return user.is_active and user.is_staff and user.has_perm(f"{opts.app_label}.view_{opts.model_name}")
+
+
+def _authorized(request, resource: Resource) -> bool:
+    token = _bearer_token(request)
+    if token is not None:
+        return _token_allowed(token, settings.API_TOKENS)
+    return _staff_can_view(request, resource.model)
+
+
+def encode_cursor(last_id: int) -> str:
+    return base64.urlsafe_b64encode(str(last_id).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        return int(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode())
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ApiError("Invalid cursor.") from None
+
+
+def _fields(resource: Resource, raw: str) -> list[str]:
+    if not raw:
+        return list(resource.fields)
+    names = ["id"] + [name.strip() for name in raw.split(",") if name.strip() and name.strip() != "id"]
+    unknown = [name for name in names if name not in resource.fields]
+    if unknown:
+        raise ApiError(f"Unknown fields: {', '.join(unknown)}. Available: {', '.join(resource.fields)}.")
+    return list(dict.fromkeys(names))
+
+
+def _limit(raw: str) -> int:
+    if not raw:
+        return DEFAULT_LIMIT
+    limit = _integer(raw)
+    if not 1 <= limit <= MAX_LIMIT:
+        raise ApiError(f"limit must be between 1 and {MAX_LIMIT}.")
+    return limit
+
+
+def _page(request, resource: Resource) -> dict:
+    names = _fields(resource, request.GET.get("fields", ""))
+    limit = _limit(request.GET.get("limit", ""))
+    queryset = resource.values(names)
+    for parameter, value in request.GET.items():
+        if parameter in _RESERVED_PARAMETERS:
+            continue
+        if parameter not in resource.filters:
+            raise ApiError(f"Unknown filter {parameter!r}. Available: {', '.join(resource.filters) or 'none'}.")
+        queryset = queryset.filter(resource.filters[parameter](value))
+    cursor = request.GET.get("cursor", "")
+    if cursor:
+        queryset = queryset.filter(pk__gt=decode_cursor(cursor))
+
+    # One extra row tells us whether another page exists without a COUNT.
+    rows = list(queryset.order_by("pk")[: limit + 1])
+    next_cursor = encode_cursor(rows[limit - 1]["id"]) if len(rows) > limit else None
+    rows = rows[:limit]
+    payload = {"data": rows, "next_cursor": next_cursor, "next": None}
+    if next_cursor:
+        query = request.GET.copy()
+        query["cursor"] = next_cursor
+        payload["next"] = request.build_absolute_uri(f"{request.path}?{query.urlencode()}")
+    return payload
+
+
+def _error(message: str, status: int) -> JsonResponse:
+    return JsonResponse({"error": message}, status=status)
+
+
+@require_safe
+def api_index(request):
+    return JsonResponse(
+        {
+            "version": API_VERSION,
+            "resources": [
+                {
+                    "name": resource.name,
+                    "url": request.build_absolute_uri(reverse("inventory_api:resource", args=[resource.name])),
+                    "description": resource.description,
+                    "fields": list(resource.fields),
+                    "filters": list(resource.filters),
+                }
+                for resource in RESOURCES.values()
+            ],
+        }
+    )
+
+
+@require_safe
+@replica_view
+def resource_view(request, name: str):
+    resource = RESOURCES.get(name)
+    if resource is None:
+        return _error(f"Unknown resource {name!r}.", 404)
+    if not _authorized(request, resource):
+        return _error("Authentication required.", 401)
+
+    # Conditional GET: versions of the tables behind the resource plus the
+    # query string identify the response without running it.
+    versions = table_versions(resource.tables)
+    etag = f'"{API_VERSION}-{versions.token(name, request.GET.urlencode())}"'
+    last_modified = int(versions.changed_at.timestamp()) if versions.changed_at else None
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        try:
+            response = JsonResponse(_page(request, resource))
+        except ApiError as exc:
+            return _error(str(exc), exc.status)
+
+    response["ETag"] = etag
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified)
+    # Always revalidate; a client holding the ETag gets a cheap 304.
+    patch_cache_control(response, private=True, no_cache=True)
+    patch_vary_headers(response, ("Authorization", "Cookie"))
+    return response
+
+
+@csrf_exempt
+@require_POST
+def movements_view(request):
+    token = _bearer_token(request)
+    if token is None or not _token_allowed(token, settings.API_WRITE_TOKENS):
+        return _error("A write token is required.", 401)
+    key = request.headers.get("Idempotency-Key", "").strip()
+    if not key or len(key) > MAX_IDEMPOTENCY_KEY_LENGTH:
+        return _error(f"An Idempotency-Key header of at most {MAX_IDEMPOTENCY_KEY_LENGTH} characters is required.", 400)
+    try:
+        body = json.loads(request.body)
+    except (UnicodeDecodeError, ValueError):
+        return _error("The request body must be JSON.", 400)
+    if not isinstance(body, dict):
+        return _error("The request body must be a JSON object.", 400)
+
+    try:
+        result = post_movements(
+            parse_movements(body.get("movements")),
+            idempotency_key=key,
+            payload_hash=request_hash(body),
+            reference=str(body["reference"]) if body.get("reference") else None,
+            notes=str(body["notes"]) if body.get("notes") else None,
+            requested_by="api",
+        )
+    except MovementError as exc:
+        return JsonResponse({"error": str(exc), "errors": exc.errors}, status=exc.status)
+
+    response = JsonResponse(result.response, status=200 if result.replayed else 201)
+    if result.replayed:
+        response["Idempotent-Replayed"] = "true"
+    return response
+
+
+def _sse(event: str, data: dict, event_id: str | None = None) -> str:
+    lines = [f"id: {event_id}"] if event_id else []
+    lines += [f"event: {event}", f"data: {json.dumps(data, separators=(',', ':'))}"]
+    return "\n".join(lines) + "\n\n"
+
+
+def _resume_seq(feed: ChangeFeed, last_event_id: str) -> int | None:
+    """The sequence to resume after, or ``None`` when the id came from another process or feed."""
+
+    epoch, _, seq = last_event_id.partition("-")
+    return int(seq) if epoch == feed.epoch and seq.isdigit() else None
+
+
+async def _change_events(feed: ChangeFeed, seq: int | None):
+    yield f"retry: {SSE_RETRY_MILLISECONDS}\n\n"
+    deadline = time.monotonic() + SSE_MAX_SECONDS
+    if seq is None:
+        seq = feed.last_seq
+        yield _sse("resync", {"seq": seq}, f"{feed.epoch}-{seq}")
+    while time.monotonic() < deadline:
+        batches = await feed.wait(seq, SSE_HEARTBEAT_SECONDS)
+        if batches is None:
+            # The client fell behind the backlog: tell it to reload everything.
+            seq = feed.last_seq
+            yield _sse("resync", {"seq": seq}, f"{feed.epoch}-{seq}")
+        elif not batches:
+            yield ": keep-alive\n\n"
+        for batch in batches or ():
+            seq = batch.seq
+            yield _sse("change", batch.as_dict(), f"{feed.epoch}-{seq}")
+
+
+async def changes_view(request):
+    if request.method not in ("GET", "HEAD"):
+        return HttpResponseNotAllowed(["GET", "HEAD"])
+    if not settings.CHANGE_FEED_ENABLED:
+        return _error("The change feed is disabled.", 503)
+    token = _bearer_token(request)
+    if token is not None:
+        allowed = _token_allowed(token, settings.API_TOKENS)
+    else:
+        allowed = await sync_to_async(_staff_can_view)(request, models.InventoryItem)
+    if not allowed:
+        return _error("Authentication required.", 401)
+
+    feed = await sync_to_async(change_feed)()
+    last_event_id = request.headers.get("Last-Event-ID") or request.GET.get("last_event_id", "")
+    # A fresh client starts from now; it reads current state from the resources.
+    seq = _resume_seq(feed, last_event_id) if last_event_id else feed.last_seq
+    response = StreamingHttpResponse(_change_events(feed, seq), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    # Stop nginx from buffering the stream.
+    response["X-Accel-Buffering"] = "no"
+    return response
@@ -0,0 +1,15 @@
+"""JSON API, mounted at ``/api/v1/``."""
+from __future__ import annotations
+
+from django.urls import path
+
+from . import api
+
+app_name = "inventory_api"
+
+urlpatterns = [
+    path("", api.api_index, name="index"),
+    path("changes/", api.changes_view, name="changes"),
+    path("movements/", api.movements_view, name="movements"),
+    path("<slug:name>/", api.resource_view, name="resource"),
+]
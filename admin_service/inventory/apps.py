@@ -7,3 +7,9 @@ class InventoryConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "inventory"
     verbose_name = "ForgeDesk Inventory"
+
+    def ready(self) -> None:
+        from . import jobs  # noqa: F401 - registers background job handlers
+        from . import metrics  # noqa: F401 - registers /metrics gauges
+        # Imported for their signal handlers.
+        from .services import locations, lookup_cache, maintenance_schedule, reliability, skus, uom  # noqa: F401
@@ -0,0 +1,107 @@
+"""Background job handlers for the admin job queue.
+
+Each handler wraps an existing service so the same work can be queued from
+an admin action instead of running inside the request.
+"""
+from __future__ import annotations
+
+import datetime
+
+from django.utils import timezone
+
+from . import models
+from .services.changes import compact_change_log
+from .services.dashboard import refresh_metrics
+from .services.jobs import JobContext, enqueue, job
+from .services.lead_times import refresh_lead_time_stats
+from .services.ledger import refresh_average_daily_use
+from .services.maintenance_consumption import post_next_batch
+from .services.maintenance_parts import sync_record_parts
+from .services.maintenance_schedule import refresh_due_dates
+from .services.movements import purge_expired_batches
+from .services.reliability import rebuild_all, refresh_new_records
+
+CHUNK_SIZE = 500
+
+
+@job("recompute_average_daily_use")
+def recompute_average_daily_use(payload: dict, context: JobContext) -> dict:
+    item_ids = payload.get("item_ids")
+    if item_ids is None:
+        item_ids = list(models.InventoryItem.objects.order_by("id").values_list("id", flat=True))
+
+    for start in range(0, len(item_ids), CHUNK_SIZE):
+        refresh_average_daily_use(item_ids[start : start + CHUNK_SIZE])
+        context.progress(min(start + CHUNK_SIZE, len(item_ids)), len(item_ids), "Items recalculated")
+    return {"items": len(item_ids)}
+
+
+@job("refresh_lead_times")
+def refresh_lead_times(payload: dict, context: JobContext) -> dict:
+    return {
+        "suppliers": refresh_lead_time_stats(full=bool(payload.get("full")), supplier_ids=payload.get("supplier_ids"))
+    }
+
+
+@job("refresh_maintenance_schedule")
+def refresh_maintenance_schedule(payload: dict, context: JobContext) -> dict:
+    return {"tasks": refresh_due_dates(payload.get("task_ids"))}
+
+
+@job("refresh_reliability_rollups")
+def refresh_reliability_rollups(payload: dict, context: JobContext) -> dict:
+    return {"buckets": rebuild_all() if payload.get("full") else refresh_new_records()}
+
+
+@job("sync_maintenance_parts")
+def sync_maintenance_parts(payload: dict, context: JobContext) -> dict:
+    return {"parts": sync_record_parts(payload.get("record_ids"))}
+
+
+@job("post_maintenance_parts")
+def post_maintenance_parts(payload: dict, context: JobContext) -> dict:
+    batches = lines = 0
+    while (result := post_next_batch(payload.get("batch_size", CHUNK_SIZE))) is not None:
+        batches += 1
+        lines += result.line_count
+        context.progress(batches, None, f"Posted through record #{result.last_record_id}")
+    return {"batches": batches, "lines": lines}
+
+
+def _schedule_next(kind: str, payload: dict, context: JobContext) -> None:
+    """Queue the next run of a job made recurring by ``payload["every"]``.
+
+    Called even when the run fails, so a run that exhausts its retries does
+    not end the schedule; a retry finds the next run already queued.
+    """
+
+    if not payload.get("every"):
+        return
+    scheduled = models.BackgroundJob.objects.filter(kind=kind, status="queued").exclude(pk=context.job_id)
+    if not scheduled.exists():
+        run_after = timezone.now() + datetime.timedelta(seconds=payload["every"])
+        enqueue(kind, payload, requested_by="schedule", run_after=run_after)
+
+
+@job("refresh_dashboard_metrics")
+def refresh_dashboard_metrics(payload: dict, context: JobContext) -> dict:
+    try:
+        return {"metrics": refresh_metrics()}
+    finally:
+        _schedule_next("refresh_dashboard_metrics", payload, context)
+
+
+@job("compact_table_changes")
+def compact_table_changes(payload: dict, context: JobContext) -> dict:
+    try:
+        return {"tables": compact_change_log()}
+    finally:
+        _schedule_next("compact_table_changes", payload, context)
+
+
+@job("purge_movement_batches")
+def purge_movement_batches(payload: dict, context: JobContext) -> dict:
+    try:
+        return {"deleted": purge_expired_batches(payload.get("days"))}
+    finally:
+        _schedule_next("purge_movement_batches", payload, context)
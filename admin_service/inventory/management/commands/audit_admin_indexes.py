@@ -0,0 +1,141 @@
+"""EXPLAIN every admin changelist's first page to find orderings and filters without an index."""
+from __future__ import annotations
+
+import json
+
+from django.contrib import admin
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+from django.db.models import Max
+from django.http import QueryDict
+from django.test import RequestFactory
+
+# Nodes between the root and the scan that feeds the page.
+_PASS_THROUGH = {"Limit", "Sort", "Incremental Sort", "Gather Merge", "Gather", "Result", "Unique", "Materialize"}
+_SCANS = {"Seq Scan", "Index Scan", "Index Only Scan", "Bitmap Heap Scan"}
+FAILING = ("seq scan", "sort")
+
+
+def _walk(node: dict):
+    yield node
+    for child in node.get("Plans", ()):
+        yield from _walk(child)
+
+
+def assess(plan: dict, table: str) -> tuple[str, str]:
+    """``(verdict, detail)`` for a JSON plan: ok, filter, sort or seq scan."""
+
+    sorted_by = None
+    node = plan
+    while node["Node Type"] in _PASS_THROUGH and node.get("Plans"):
+        if node["Node Type"] == "Sort":
+            sorted_by = ", ".join(node.get("Sort Key", ()))
+        node = node["Plans"][0]
+
+    scans = [scan for scan in _walk(plan) if scan["Node Type"] in _SCANS and scan.get("Relation Name") == table]
+    if any(scan["Node Type"] == "Seq Scan" for scan in scans):
+        return "seq scan", f"Seq Scan on {table}" + (f"; Sort on {sorted_by}" if sorted_by else "")
+    indexes = ", ".join(sorted({scan.get("Index Name") or scan["Node Type"] for scan in scans})) or node["Node Type"]
+    if sorted_by:
+        return "sort", f"Sort on {sorted_by} after {indexes}"
+    if any("Filter" in scan and "Index Cond" not in scan for scan in scans):
+        return "filter", f"{indexes} (rows filtered, not in index condition)"
+    return "ok", indexes
+
+
+class Command(BaseCommand):
+    help = (
+        "EXPLAIN each registered ModelAdmin's changelist page: the default ordering, one value of each "
+        "list_filter and the latest year of date_hierarchy, and report queries that scan or sort."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("models", nargs="*", help="app_label or app_label.model_name (default: all).")
+        parser.add_argument("--username", help="Superuser to build changelists as (defaults to the first).")
+        parser.add_argument(
+            "--planner-defaults",
+            action="store_true",
+            help="Leave enable_seqscan/enable_sort on. By default they are off, so a plan only scans or "
+            "sorts when no index can serve it, whatever the table size.",
+        )
+        parser.add_argument("--json", action="store_true", help="Print the results as JSON.")
+        parser.add_argument("--strict", action="store_true", help="Exit non-zero if any query scans or sorts.")
+
+    def handle(self, *args, **options):
+        users = get_user_model().objects.filter(is_active=True, is_superuser=True)
+        if options["username"]:
+            users = users.filter(username=options["username"])
+        self.user = users.order_by("pk").first()
+        if self.user is None:
+            raise CommandError("A superuser is required to build admin changelists.")
+        self.planner_defaults = options["planner_defaults"]
+
+        wanted = {name.lower() for name in options["models"]}
+        model_admins = [
+            model_admin
+            for model, model_admin in sorted(admin.site._registry.items(), key=lambda entry: entry[0]._meta.label)
+            if not wanted or {model._meta.app_label, model._meta.label_lower} & wanted
+        ]
+        if not model_admins:
+            raise CommandError("No registered admin matches.")
+
+        results = []
+        for model_admin in model_admins:
+            for variant, params in self._variants(model_admin):
+                results.append(self._audit(model_admin, variant, params))
+                if not options["json"]:
+                    result = results[-1]
+                    self.stdout.write(
+                        f"{result['model']:<42} {result['variant']:<34} {result['verdict']:<9} {result['detail']}"
+                    )
+
+        failing = [result for result in results if result["verdict"] in FAILING]
+        if options["json"]:
+            self.stdout.write(json.dumps(results, indent=2))
+        else:
+            self.stdout.write(f"\n{len(results)} queries, {len(failing)} without a usable index.")
+        if options["strict"] and failing:
+            raise CommandError(f"{len(failing)} changelist queries scan or sort.")
+
+    def _changelist(self, model_admin, params: dict):
+        request = RequestFactory().get("/", params)
+        request.user = self.user
+        return model_admin.get_changelist_instance(request)
+
+    def _variants(self, model_admin):
+        yield "default", {}
+        try:
+            changelist = self._changelist(model_admin, {})
+        except IncorrectLookupParameters:
+            return
+        for spec in changelist.filter_specs:
+            # The first choice that is not the selected "All".
+            choice = next((choice for choice in spec.choices(changelist) if not choice["selected"]), None)
+            if choice is not None:
+                params = QueryDict(choice["query_string"].lstrip("?")).dict()
+                yield f"filter {spec.title}", params
+        field = model_admin.date_hierarchy
+        if field:
+            latest = model_admin.get_queryset(changelist.request).aggregate(latest=Max(field))["latest"]
+            if latest is not None:
+                yield f"{field} {latest.year}", {f"{field}__year": str(latest.year)}
+
+    def _audit(self, model_admin, variant: str, params: dict) -> dict:
+        opts = model_admin.model._meta
+        result = {"model": opts.label, "variant": variant, "params": params}
+        try:
+            changelist = self._changelist(model_admin, params)
+        except IncorrectLookupParameters as exc:
+            return {**result, "verdict": "error", "detail": str(exc) or "invalid filter parameters"}
+
+        queryset = changelist.queryset[: changelist.list_per_page]
+        with transaction.atomic(using=queryset.db):
+            if not self.planner_defaults:
+                with connections[queryset.db].cursor() as cursor:
+                    cursor.execute("SET LOCAL enable_seqscan = off")
+                    cursor.execute("SET LOCAL enable_sort = off")
+            plan = json.loads(queryset.explain(format="json"))[0]["Plan"]
+        verdict, detail = assess(plan, opts.db_table)
+        return {**result, "verdict": verdict, "detail": detail, "cost": plan["Total Cost"]}
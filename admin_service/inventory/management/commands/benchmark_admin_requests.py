@@ -0,0 +1,84 @@
+"""Measure admin requests/sec with and without persistent database connections."""
+from __future__ import annotations
+
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connections
+from django.db.backends.signals import connection_created
+from django.test import Client
+
+DEFAULT_PATHS = (
+    "/django-admin/",
+    "/django-admin/inventory/inventoryitem/",
+    "/django-admin/inventory/purchaseorder/",
+    "/django-admin/inventory/maintenancerecord/",
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Issue admin GET requests in-process and report requests/sec and connections opened, "
+        "first with CONN_MAX_AGE=0 and then with the configured value."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("paths", nargs="*", default=list(DEFAULT_PATHS))
+        parser.add_argument("--requests", type=int, default=200, help="Requests per mode.")
+        parser.add_argument("--username", help="Staff user to log in as (defaults to the first superuser).")
+
+    def handle(self, *args, **options):
+        user_model = get_user_model()
+        users = user_model.objects.filter(is_staff=True, is_active=True)
+        user = (
+            users.filter(username=options["username"]).first()
+            if options["username"]
+            else users.filter(is_superuser=True).order_by("pk").first()
+        )
+        if user is None:
+            raise CommandError("A staff user is required to benchmark admin requests.")
+
+        settings_dict = connections["default"].settings_dict
+        configured = settings_dict["CONN_MAX_AGE"]
+        modes = [("per-request connections", 0), (f"CONN_MAX_AGE={configured}", configured)]
+
+        try:
+            for label, max_age in modes:
+                settings_dict["CONN_MAX_AGE"] = max_age
+                connections["default"].close()
+                self._run(label, user, options["paths"], options["requests"])
+        finally:
+            settings_dict["CONN_MAX_AGE"] = configured
+
+    def _run(self, label: str, user, paths: list[str], total: int) -> None:
+        # The default "testserver" host fails ALLOWED_HOSTS outside tests.
+        host = next((host.lstrip(".") for host in settings.ALLOWED_HOSTS if host and host != "*"), "localhost")
+        client = Client(HTTP_HOST=host)
+        client.force_login(user)
+        opened = 0
+
+        def count(sender, connection, **kwargs):
+            nonlocal opened
+            if connection.alias == "default":
+                opened += 1
+
+        connection_created.connect(count)
+        try:
+            started = time.perf_counter()
+            for index in range(total):
+                response = client.get(paths[index % len(paths)])
+                if response.status_code != 200:
+                    raise CommandError(f"GET {paths[index % len(paths)]} returned {response.status_code}.")
+                # The test client skips the end-of-request hook a real server
+                # runs, which is where CONN_MAX_AGE is applied.
+                close_old_connections()
+            elapsed = time.perf_counter() - started
+        finally:
+            connection_created.disconnect(count)
+
+        self.stdout.write(
+            f"{label}: {total} requests in {elapsed:.2f}s "
+            f"({total / elapsed:.1f} req/s, {opened} connections opened)"
+        )
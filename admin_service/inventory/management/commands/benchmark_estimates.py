@@ -0,0 +1,64 @@
+"""Time estimate parsing and SKU resolution against a generated workbook."""
+from __future__ import annotations
+
+import io
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from inventory import models
+from inventory.services import xlsx
+from inventory.services.estimates import EstimateAnalysis, _Log, read_requirements, resolve
+
+
+class Command(BaseCommand):
+    help = "Build an N-line estimate from existing parts (with typos and unknown parts) and report timings."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--lines", type=int, default=20000)
+        parser.add_argument("--repeat", type=int, default=3)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        line_count = options["lines"]
+        parts = list(
+            models.InventoryItem.objects.order_by("id").values_list("part_number", "finish")[:line_count]
+        )
+        if not parts:
+            raise CommandError("At least one inventory item is required to benchmark estimates.")
+
+        workbook = xlsx.build_workbook({"Accessories": self._rows(parts, line_count, random.Random(options["seed"]))})
+        self.stdout.write(f"Generated {line_count} lines ({len(workbook) / 1024:.0f} KiB).")
+
+        for run in range(1, options["repeat"] + 1):
+            analysis = EstimateAnalysis()
+            log = _Log(analysis.log)
+            started = time.perf_counter()
+            requirements = read_requirements(io.BytesIO(workbook), analysis, log)
+            parsed = time.perf_counter()
+            with CaptureQueriesContext(connection) as queries:
+                lines = resolve(requirements, log)
+            finished = time.perf_counter()
+
+            matched = sum(1 for line in lines if line.inventory_item_id)
+            self.stdout.write(
+                f"run {run}: parse {(parsed - started) * 1000:.1f} ms, resolve {(finished - parsed) * 1000:.1f} ms "
+                f"for {len(lines)} parts, {matched} matched ({len(queries.captured_queries)} statements)"
+            )
+
+    def _rows(self, parts: list[tuple[str, str | None]], line_count: int, rng: random.Random) -> list[list]:
+        # Roughly 80% exact part numbers, 10% one-character typos, 10% unknown.
+        rows = [["Qty", "Part #", "Finish"]]
+        for index in range(line_count):
+            part, finish = parts[index % len(parts)]
+            roll = rng.random()
+            if roll >= 0.9:
+                part = f"ZZ-{index:06d}"
+            elif roll >= 0.8 and len(part) > 3:
+                position = rng.randrange(len(part))
+                part = part[:position] + rng.choice("ABCDEFGHJKLMNPRSTUVWXY0123456789") + part[position + 1 :]
+            rows.append([rng.randint(1, 24), part, finish or ""])
+        return rows
@@ -0,0 +1,78 @@
+"""Time set-based receipt posting against a throwaway purchase order."""
+from __future__ import annotations
+
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from inventory import models
+from inventory.services.receiving import post_receipt
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = "Post a synthetic N-line receipt inside a transaction that is rolled back, and report timings."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--lines", type=int, default=1000)
+        parser.add_argument("--repeat", type=int, default=3)
+
+    def handle(self, *args, **options):
+        line_count = options["lines"]
+        item_ids = list(models.InventoryItem.objects.order_by("id").values_list("id", flat=True)[:line_count])
+        if not item_ids:
+            raise CommandError("At least one inventory item is required to benchmark receiving.")
+
+        for run in range(1, options["repeat"] + 1):
+            try:
+                with transaction.atomic():
+                    changes = self._build_order(item_ids, line_count)
+                    with CaptureQueriesContext(connection) as queries:
+                        started = time.perf_counter()
+                        post_receipt(changes["purchase_order_id"], changes["lines"], reference="Benchmark receipt")
+                        elapsed = time.perf_counter() - started
+                    raise _Rollback
+            except _Rollback:
+                pass
+
+            self.stdout.write(
+                f"run {run}: {line_count} lines in {elapsed * 1000:.1f} ms "
+                f"({len(queries.captured_queries)} statements)"
+            )
+
+    def _build_order(self, item_ids: list[int], line_count: int) -> dict:
+        now = timezone.now()
+        order = models.PurchaseOrder.objects.create(
+            order_number=f"BENCH-{now:%Y%m%d%H%M%S%f}",
+            status="sent",
+            order_date=now.date(),
+            created_at=now,
+            updated_at=now,
+        )
+        lines = models.PurchaseOrderLine.objects.bulk_create(
+            [
+                models.PurchaseOrderLine(
+                    purchase_order=order,
+                    inventory_item_id=item_ids[index % len(item_ids)],
+                    description="Benchmark line",
+                    quantity_ordered=Decimal("10"),
+                    quantity_received=Decimal("0"),
+                    quantity_cancelled=Decimal("0"),
+                    unit_cost=Decimal("1"),
+                    created_at=now,
+                    updated_at=now,
+                )
+                for index in range(line_count)
+            ]
+        )
+        return {
+            "purchase_order_id": order.pk,
+            "lines": {line.pk: Decimal("6") for line in lines},
+        }
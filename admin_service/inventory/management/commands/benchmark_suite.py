@@ -0,0 +1,354 @@
+"""Time key changelists, reports and posting services and record the results as JSON."""
+from __future__ import annotations
+
+import csv
+import datetime
+import json
+import statistics
+import time
+import uuid
+from contextlib import nullcontext
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Count, F
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from forge_admin.db import stream_queryset
+from inventory import models
+from inventory.services import dashboard, maintenance_consumption, reports
+from inventory.services.cycle_counts import post_cycle_count_session
+from inventory.services.movements import parse_movements, post_movements, request_hash
+from inventory.services.receiving import receive_outstanding
+from inventory.services.synthetic import scale_label
+
+GROUPS = ("changelist", "report", "posting")
+MOVEMENT_LINES = 500
+
+# (name, model_name, query parameters)
+CHANGELISTS = (
+    ("items", "inventoryitem", {}),
+    ("items: search", "inventoryitem", {"q": "hinge"}),
+    ("items: status Low", "inventoryitem", {"status": "Low"}),
+    ("item locations", "inventoryitemlocation", {}),
+    ("transaction lines", "inventorytransactionline", {}),
+    ("purchase orders: sent", "purchaseorder", {"status": "sent"}),
+    ("purchase order lines", "purchaseorderline", {}),
+    ("reservations", "jobreservation", {}),
+    ("cycle count lines", "cyclecountline", {}),
+    ("maintenance tasks", "maintenancetask", {}),
+    ("maintenance records", "maintenancerecord", {}),
+)
+
+# Rows counted for the record; the scale label follows inventory_items.
+COUNTED_MODELS = (
+    models.InventoryItem,
+    models.InventoryItemLocation,
+    models.InventoryTransactionLine,
+    models.PurchaseOrderLine,
+    models.JobReservationItem,
+    models.CycleCountLine,
+    models.MaintenanceRecord,
+)
+
+
+class _Rollback(Exception):
+    pass
+
+
+class _Skip(Exception):
+    pass
+
+
+class _Discard:
+    def write(self, value: str) -> None:
+        pass
+
+
+@dataclass(frozen=True)
+class Case:
+    group: str
+    name: str
+    # Runs untimed, then returns the timed callable, which returns a row count or None.
+    setup: Callable[[], Callable[[], int | None]]
+    # Posting cases write; each run is rolled back.
+    rollback: bool = False
+
+
+class Command(BaseCommand):
+    help = (
+        "Time admin changelists, CSV reports and posting services (receipts, movements, cycle counts, "
+        "maintenance consumption) against the current data, and append the results to a JSON file so "
+        "runs at the same scale can be compared."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=3)
+        parser.add_argument("--warmup", type=int, default=1, help="Untimed runs before each case.")
+        parser.add_argument("--only", action="append", choices=GROUPS, help="Run only this group (repeatable).")
+        parser.add_argument("--output", help="JSON file to append this run to.")
+        parser.add_argument(
+            "--baseline",
+            help="JSON file holding earlier runs (defaults to --output); the latest at the same scale is compared.",
+        )
+        parser.add_argument(
+            "--max-regression",
+            type=float,
+            help="Exit non-zero if a case's median is this many percent slower than the baseline.",
+        )
+        parser.add_argument("--generate", metavar="SCALE", help="Run generate_dataset at this scale first.")
+        parser.add_argument("--username", help="Superuser to load changelists as (defaults to the first).")
+
+    def handle(self, *args, **options):
+        if options["repeat"] < 1:
+            raise CommandError("--repeat must be at least 1.")
+        if options["generate"]:
+            call_command("generate_dataset", scale=options["generate"], yes=True, stdout=self.stdout)
+
+        groups = set(options["only"] or GROUPS)
+        cases = [case for case in self._cases(options["username"], groups) if case.group in groups]
+        counts = {model._meta.db_table: model.objects.count() for model in COUNTED_MODELS}
+        scale = scale_label(counts["inventory_items"])
+        self.stdout.write(f"Scale {scale}: " + ", ".join(f"{table} {count:,}" for table, count in counts.items()))
+
+        results = []
+        for case in cases:
+            try:
+                result = self._measure(case, options["repeat"], options["warmup"])
+            except _Skip as exc:
+                self.stdout.write(f"{case.group:<10} {case.name:<28} skipped: {exc}")
+                continue
+            results.append(result)
+            rows = "" if result["rows"] is None else f", {result['rows']:,} rows"
+            self.stdout.write(
+                f"{case.group:<10} {case.name:<28} median {result['median_ms']:9.1f} ms "
+                f"(min {result['min_ms']:.1f}, max {result['max_ms']:.1f}; {result['statements']} statements{rows})"
+            )
+
+        run = {
+            "recorded_at": timezone.now().isoformat(),
+            "scale": scale,
+            "rows": counts,
+            "server_version": getattr(connection, "pg_version", None),
+            "repeat": options["repeat"],
+            "cases": results,
+        }
+        baseline_path = options["baseline"] or options["output"]
+        regressions = self._compare(run, self._load(baseline_path) if baseline_path else [])
+        if options["output"]:
+            history = self._load(options["output"])
+            history.append(run)
+            Path(options["output"]).write_text(json.dumps(history, indent=2) + "\n")
+            self.stdout.write(f"Appended to {options['output']} ({len(history)} runs).")
+
+        limit = options["max_regression"]
+        if limit is not None:
+            failing = [(name, change) for name, change in regressions if change > limit]
+            if failing:
+                raise CommandError(
+                    f"{len(failing)} cases regressed more than {limit:g}%: "
+                    + ", ".join(f"{name} (+{change:.0f}%)" for name, change in failing)
+                )
+
+    def _load(self, path: str) -> list[dict]:
+        try:
+            history = json.loads(Path(path).read_text())
+        except FileNotFoundError:
+            return []
+        except ValueError as exc:
+            raise CommandError(f"{path} is not a JSON benchmark history: {exc}") from exc
+        if not isinstance(history, list):
+            raise CommandError(f"{path} is not a JSON benchmark history.")
+        return history
+
+    def _compare(self, run: dict, history: list[dict]) -> list[tuple[str, float]]:
+        """Print changes against the latest earlier run at the same scale; returns ``(case, % change)``."""
+
+        baseline = next((earlier for earlier in reversed(history) if earlier.get("scale") == run["scale"]), None)
+        if baseline is None:
+            return []
+        before = {(case["group"], case["name"]): case["median_ms"] for case in baseline.get("cases", ())}
+        self.stdout.write(f"\nCompared with {baseline['recorded_at']}:")
+        changes = []
+        for case in run["cases"]:
+            previous = before.get((case["group"], case["name"]))
+            if not previous:
+                continue
+            change = (case["median_ms"] - previous) / previous * 100
+            changes.append((f"{case['group']} {case['name']}", change))
+            self.stdout.write(
+                f"{case['group']:<10} {case['name']:<28} {previous:9.1f} -> {case['median_ms']:9.1f} ms "
+                f"({change:+.0f}%)"
+            )
+        return changes
+
+    def _measure(self, case: Case, repeat: int, warmup: int) -> dict:
+        timings = []
+        for run in range(warmup + repeat):
+            try:
+                with transaction.atomic() if case.rollback else nullcontext():
+                    timed = case.setup()
+                    with CaptureQueriesContext(connection) as queries:
+                        started = time.perf_counter()
+                        rows = timed()
+                        elapsed = time.perf_counter() - started
+                    if case.rollback:
+                        raise _Rollback
+            except _Rollback:
+                pass
+            if run >= warmup:
+                timings.append(elapsed * 1000)
+        return {
+            "group": case.group,
+            "name": case.name,
+            "median_ms": round(statistics.median(timings), 2),
+            "min_ms": round(min(timings), 2),
+            "max_ms": round(max(timings), 2),
+            "runs_ms": [round(timing, 2) for timing in timings],
+            "statements": len(queries.captured_queries),
+            "rows": rows,
+        }
+
+    def _cases(self, username: str | None, groups: set[str]) -> list[Case]:
+        cases = []
+        if "changelist" in groups:
+            client = self._client(username)
+            for name, model_name, params in CHANGELISTS:
+                cases.append(Case("changelist", name, _changelist(client, model_name, params)))
+        since = timezone.localdate() - datetime.timedelta(days=90)
+        cases += [
+            Case("report", "stock valuation", _report(reports.stock_valuation)),
+            Case("report", "ledger lines (90 days)", _report(lambda: reports.ledger_lines(since))),
+            Case("report", "replenishment", _report(reports.replenishment)),
+            Case("report", "dashboard metrics", lambda: dashboard.refresh_metrics, rollback=True),
+            Case("posting", "receipt (open PO)", _receipt, rollback=True),
+            Case("posting", f"movements ({MOVEMENT_LINES} transfers)", _movements, rollback=True),
+            Case("posting", "cycle count session", _cycle_count, rollback=True),
+            Case("posting", "maintenance consumption", _maintenance_consumption, rollback=True),
+        ]
+        return cases
+
+    def _client(self, username: str | None) -> Client:
+        users = get_user_model().objects.filter(is_active=True, is_superuser=True)
+        if username:
+            users = users.filter(username=username)
+        user = users.order_by("pk").first()
+        if user is None:
+            raise CommandError("A superuser is required to benchmark changelists (or pass --only report/posting).")
+        # The default "testserver" host fails ALLOWED_HOSTS outside tests.
+        host = next((host.lstrip(".") for host in settings.ALLOWED_HOSTS if host and host != "*"), "localhost")
+        client = Client(HTTP_HOST=host)
+        client.force_login(user)
+        return client
+
+
+def _changelist(client: Client, model_name: str, params: dict):
+    url = reverse(f"admin:inventory_{model_name}_changelist")
+
+    def setup():
+        def run():
+            response = client.get(url, params)
+            if response.status_code != 200:
+                raise CommandError(f"GET {url} {params} returned {response.status_code}.")
+            return None
+
+        return run
+
+    return setup
+
+
+def _report(factory: Callable[[], reports.Report]):
+    """Stream the report through a CSV writer the way the export views do, discarding the output."""
+
+    def setup():
+        report = factory()
+
+        def run():
+            writer = csv.writer(_Discard())
+            writer.writerow(report.header)
+            if report.prepare is not None:
+                report.prepare()
+            rows = 0
+            for values in stream_queryset(report.queryset):
+                writer.writerow(report.row(values))
+                rows += 1
+            return rows
+
+        return run
+
+    return setup
+
+
+def _receipt():
+    order_id = (
+        models.PurchaseOrderLine.objects.filter(
+            purchase_order__status__in=("sent", "partially_received"),
+            quantity_received__lt=F("quantity_ordered") - F("quantity_cancelled"),
+        )
+        .values("purchase_order_id")
+        .annotate(lines=Count("id"))
+        .order_by("-lines", "purchase_order_id")
+        .values_list("purchase_order_id", flat=True)
+        .first()
+    )
+    if order_id is None:
+        raise _Skip("no open purchase order")
+    return lambda: len(receive_outstanding(order_id, reference="Benchmark receipt").lines)
+
+
+def _movements():
+    bins = list(
+        models.InventoryItemLocation.objects.filter(quantity__gt=0, storage_location__is_active=True)
+        .order_by("id")
+        .values_list("inventory_item_id", "storage_location_id")[:MOVEMENT_LINES]
+    )
+    targets = list(
+        models.StorageLocation.objects.filter(is_active=True).order_by("-id").values_list("id", flat=True)[:2]
+    )
+    if not bins or len(targets) < 2:
+        raise _Skip("no stocked bins or too few active locations")
+    entries = [
+        {"type": "transfer", "item_id": item_id, "quantity": 1, "from": source, "to": targets[source == targets[0]]}
+        for item_id, source in bins
+    ]
+    movements = parse_movements(entries)
+
+    def run():
+        post_movements(
+            movements,
+            idempotency_key=f"benchmark-{uuid.uuid4().hex}",
+            payload_hash=request_hash(entries),
+            reference="Benchmark movements",
+        )
+        return len(movements)
+
+    return run
+
+
+def _cycle_count():
+    session_id = (
+        models.CycleCountSession.objects.exclude(status="completed")
+        .order_by("-total_lines", "id")
+        .values_list("id", flat=True)
+        .first()
+    )
+    if session_id is None:
+        raise _Skip("no open cycle count session")
+    return lambda: post_cycle_count_session(session_id).adjusted_items
+
+
+def _maintenance_consumption():
+    def run():
+        result = maintenance_consumption.post_next_batch()
+        return 0 if result is None else result.line_count
+
+    return run
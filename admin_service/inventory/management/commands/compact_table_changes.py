@@ -0,0 +1,33 @@
+"""Fold committed table_change_log rows into table_change_counters."""
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from inventory import models
+from inventory.services.changes import compact_change_log
+from inventory.services.jobs import enqueue
+
+KIND = "compact_table_changes"
+
+
+class Command(BaseCommand):
+    help = "Compact the table change log now, or schedule it as a recurring background job."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--every",
+            type=int,
+            help="Queue a recurring job for run_jobs that compacts the log every N seconds.",
+        )
+
+    def handle(self, *args, **options):
+        if not options["every"]:
+            self.stdout.write(f"Compacted changes for {compact_change_log()} tables.")
+            return
+
+        pending = models.BackgroundJob.objects.filter(kind=KIND, status__in=["queued", "running"])
+        if pending.exists():
+            self.stdout.write("A change log compaction job is already scheduled.")
+            return
+        queued = enqueue(KIND, {"every": options["every"]}, requested_by="schedule")
+        self.stdout.write(f"Scheduled {queued} every {options['every']} seconds.")
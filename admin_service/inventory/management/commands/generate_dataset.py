@@ -0,0 +1,46 @@
+"""Load a synthetic dataset with COPY for load tests and benchmarks."""
+from __future__ import annotations
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from inventory import models
+from inventory.services import synthetic
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate items, locations, ledger history, purchase orders with receipts, reservations, cycle counts, "
+        "maintenance and configurator data at a given scale, loaded with COPY into a test database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scale",
+            default="10k",
+            help=f"Inventory items to generate: {', '.join(synthetic.SCALES)} or a number (default 10k).",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--prefix", default="SYN-", help="Prefix for generated names, SKUs and numbers.")
+        parser.add_argument(
+            "--yes", action="store_true", help="Load even though the database already holds inventory items."
+        )
+
+    def handle(self, *args, **options):
+        try:
+            items = synthetic.scale_size(options["scale"])
+        except ValueError as exc:
+            raise CommandError(str(exc)) from exc
+        prefix = options["prefix"]
+        if not prefix:
+            raise CommandError("--prefix must not be empty.")
+        if models.InventoryItem.objects.filter(sku__startswith=prefix).exists():
+            raise CommandError(f"Items with SKUs starting {prefix!r} already exist; choose another --prefix.")
+        if not options["yes"] and models.InventoryItem.objects.exists():
+            raise CommandError("The database already holds inventory items; pass --yes to add a dataset anyway.")
+
+        self.stdout.write(f"Generating {items:,} items ({synthetic.scale_label(items)}), seed {options['seed']}.")
+        started = time.perf_counter()
+        counts = synthetic.generate(items, seed=options["seed"], prefix=prefix, log=self.stdout.write)
+        self.stdout.write(f"Loaded {sum(counts.values()):,} rows in {time.perf_counter() - started:.1f}s.")
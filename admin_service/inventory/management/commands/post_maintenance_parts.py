@@ -0,0 +1,22 @@
+"""Post parts used by maintenance records to the inventory ledger."""
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from inventory.services.maintenance_consumption import BATCH_SIZE, post_pending
+
+
+class Command(BaseCommand):
+    help = "Post unposted maintenance parts consumption, one inventory transaction per batch of records."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="Maintenance records per transaction.")
+
+    def handle(self, *args, **options):
+        results = post_pending(options["batch_size"])
+        for result in results:
+            self.stdout.write(
+                f"Records #{result.first_record_id}-{result.last_record_id}: {result.line_count} lines, "
+                f"{result.unmatched_count} unmatched parts, {result.short_quantity} short."
+            )
+        self.stdout.write(f"Posted {len(results)} batches.")
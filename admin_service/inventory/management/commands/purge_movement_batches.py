@@ -0,0 +1,40 @@
+"""Delete expired idempotency keys from inventory_movement_batches."""
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from inventory import models
+from inventory.services.jobs import enqueue
+from inventory.services.movements import purge_expired_batches
+
+KIND = "purge_movement_batches"
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete movement batch idempotency keys older than MOVEMENT_KEY_RETENTION_DAYS now, "
+        "or schedule it as a recurring background job."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, help="Retention in days (defaults to MOVEMENT_KEY_RETENTION_DAYS).")
+        parser.add_argument(
+            "--every",
+            type=int,
+            help="Queue a recurring job for run_jobs that purges expired keys every N seconds.",
+        )
+
+    def handle(self, *args, **options):
+        if not options["every"]:
+            self.stdout.write(f"Deleted {purge_expired_batches(options['days'])} expired movement batches.")
+            return
+
+        pending = models.BackgroundJob.objects.filter(kind=KIND, status__in=["queued", "running"])
+        if pending.exists():
+            self.stdout.write("A movement batch purge job is already scheduled.")
+            return
+        payload = {"every": options["every"]}
+        if options["days"] is not None:
+            payload["days"] = options["days"]
+        queued = enqueue(KIND, payload, requested_by="schedule")
+        self.stdout.write(f"Scheduled {queued} every {options['every']} seconds.")
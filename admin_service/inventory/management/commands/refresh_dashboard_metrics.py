@@ -0,0 +1,33 @@
+"""Recompute the dashboard metrics in inventory_metrics."""
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from inventory import models
+from inventory.services.dashboard import refresh_metrics
+from inventory.services.jobs import enqueue
+
+KIND = "refresh_dashboard_metrics"
+
+
+class Command(BaseCommand):
+    help = "Recompute computed dashboard metrics now, or schedule them as a recurring background job."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--every",
+            type=int,
+            help="Queue a recurring job for run_jobs that refreshes the metrics every N seconds.",
+        )
+
+    def handle(self, *args, **options):
+        if not options["every"]:
+            self.stdout.write(f"Refreshed {refresh_metrics()} dashboard metrics.")
+            return
+
+        pending = models.BackgroundJob.objects.filter(kind=KIND, status__in=["queued", "running"])
+        if pending.exists():
+            self.stdout.write("A dashboard metrics job is already scheduled.")
+            return
+        queued = enqueue(KIND, {"every": options["every"]}, requested_by="schedule")
+        self.stdout.write(f"Scheduled {queued} every {options['every']} seconds.")
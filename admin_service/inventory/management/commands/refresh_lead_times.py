@@ -0,0 +1,17 @@
+"""Fold new purchase order receipts into supplier lead-time statistics."""
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from inventory.services.lead_times import refresh_lead_time_stats
+
+
+class Command(BaseCommand):
+    help = "Refresh supplier lead-time statistics from receipts newer than the last run."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--full", action="store_true", help="Recompute every supplier from scratch.")
+
+    def handle(self, *args, **options):
+        refreshed = refresh_lead_time_stats(full=options["full"])
+        self.stdout.write(f"Refreshed lead-time statistics for {refreshed} suppliers.")
@@ -0,0 +1,14 @@
+"""Recompute cached next-due dates for every maintenance task."""
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from inventory.services.maintenance_schedule import refresh_due_dates
+
+
+class Command(BaseCommand):
+    help = "Recompute maintenance_tasks.next_due_date, picking up records logged outside the admin."
+
+    def handle(self, *args, **options):
+        changed = refresh_due_dates()
+        self.stdout.write(f"Updated due dates for {changed} maintenance tasks.")
@@ -0,0 +1,20 @@
+"""Fold new maintenance records into the monthly reliability rollups."""
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from inventory.services.reliability import rebuild_all, refresh_new_records
+
+
+class Command(BaseCommand):
+    help = "Refresh maintenance_machine_monthly_stats from records newer than the last rollup."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--full", action="store_true", help="Rebuild every month from scratch.")
+
+    def handle(self, *args, **options):
+        if options["full"]:
+            buckets = rebuild_all()
+        else:
+            buckets = refresh_new_records()
+        self.stdout.write(f"Refreshed {buckets} machine-month rollups.")
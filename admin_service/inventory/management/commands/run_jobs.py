@@ -0,0 +1,97 @@
+"""Process queued admin background jobs."""
+from __future__ import annotations
+
+import multiprocessing
+import os
+import signal
+import socket
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+import django
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from inventory.services import jobs
+
+
+def _init_process() -> None:
+    django.setup()
+
+
+def _execute(claimed: jobs.ClaimedJob) -> str:
+    try:
+        return jobs.execute(claimed)
+    finally:
+        # Pool threads/processes outlive the job; do not leak its connection.
+        connections.close_all()
+
+
+class Command(BaseCommand):
+    help = "Claim and run queued background jobs with a thread or process pool."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--concurrency", type=int, default=int(os.environ.get("JOB_CONCURRENCY", "2")))
+        parser.add_argument("--mode", choices=("thread", "process"), default=os.environ.get("JOB_MODE", "thread"))
+        parser.add_argument("--poll", type=float, default=2.0, help="Seconds to wait when the queue is empty.")
+        parser.add_argument(
+            "--stale-after",
+            type=int,
+            default=900,
+            help="Requeue running jobs whose heartbeat is older than this many seconds.",
+        )
+        parser.add_argument("--kind", action="append", dest="kinds", help="Only run these job kinds.")
+        parser.add_argument("--once", action="store_true", help="Exit once the queue is drained.")
+
+    def handle(self, *args, **options):
+        concurrency = max(1, options["concurrency"])
+        worker = f"{socket.gethostname()}:{os.getpid()}"
+        stopping = False
+
+        def stop(signum, frame):
+            nonlocal stopping
+            stopping = True
+            self.stdout.write("Stopping after running jobs finish...")
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+
+        if options["mode"] == "process":
+            connections.close_all()
+            executor = ProcessPoolExecutor(
+                concurrency, mp_context=multiprocessing.get_context("spawn"), initializer=_init_process
+            )
+        else:
+            executor = ThreadPoolExecutor(concurrency, thread_name_prefix="job")
+
+        running: dict[Future, jobs.ClaimedJob] = {}
+        last_maintenance = 0.0
+        self.stdout.write(f"Worker {worker} running {concurrency} {options['mode']}(s).")
+
+        with executor:
+            while not (stopping and not running):
+                if time.monotonic() - last_maintenance >= options["poll"]:
+                    jobs.heartbeat(job.id for job in running.values())
+                    requeued = jobs.requeue_stale(options["stale_after"])
+                    if requeued:
+                        self.stdout.write(f"Requeued {requeued} stale jobs.")
+                    last_maintenance = time.monotonic()
+
+                claimed = [] if stopping else jobs.claim(worker, concurrency - len(running), options["kinds"])
+                for job in claimed:
+                    running[executor.submit(_execute, job)] = job
+
+                if not running:
+                    if options["once"] and not claimed:
+                        break
+                    time.sleep(options["poll"])
+                    continue
+
+                done, _ = wait(running, timeout=options["poll"], return_when=FIRST_COMPLETED)
+                for future in done:
+                    job = running.pop(future)
+                    try:
+                        status = future.result()
+                    except Exception as exc:  # noqa: BLE001 - e.g. a crashed pool process
+                        status = f"crashed ({exc})"
+                    self.stdout.write(f"Job {job.id} ({job.kind}): {status}")
@@ -0,0 +1,81 @@
+"""Inventory and job-queue gauges for ``/metrics``.
+
+Inventory gauges read the latest ``inventory_metric_snapshots`` written by
+``dashboard.refresh_metrics`` (the ``refresh_dashboard_metrics`` job), so a
+scrape never scans items or purchase order lines; their age is exported too,
+so a stalled refresh shows up.  Results are cached by ``forge_admin.metrics``
+between scrapes.
+"""
+from __future__ import annotations
+
+from django.db.models import Count, Min
+from django.utils import timezone
+
+from forge_admin.metrics import Gauge, collector
+
+from . import models
+
+JOB_STATUSES = ("queued", "running")
+
+# (dashboard metric label, gauge name, help)
+SNAPSHOT_GAUGES = (
+    (
+        "Below Reorder Point",
+        "forge_inventory_items_below_reorder_point",
+        "Active items whose available stock is below their reorder point.",
+    ),
+    ("Critical Items", "forge_inventory_items_out_of_stock", "Active items with nothing available after commitments."),
+    (
+        "Open PO Value",
+        "forge_inventory_open_purchase_order_value",
+        "Outstanding quantity times unit cost across open purchase orders.",
+    ),
+)
+
+
+@collector()
+def inventory_gauges() -> list[Gauge]:
+    latest = {
+        row["label"]: row
+        for row in models.InventoryMetricSnapshot.objects.filter(label__in=[label for label, _, _ in SNAPSHOT_GAUGES])
+        .order_by("label", "-period_start")
+        .distinct("label")
+        .values("label", "value", "computed_at")
+    }
+    gauges = [
+        Gauge(name, documentation, [({}, float(latest[label]["value"] or 0))])
+        for label, name, documentation in SNAPSHOT_GAUGES
+        if label in latest
+    ]
+    computed_at = min((row["computed_at"] for row in latest.values()), default=None)
+    if computed_at is not None:
+        age = max(0.0, (timezone.now() - computed_at).total_seconds())
+        gauges.append(
+            Gauge(
+                "forge_inventory_metric_snapshot_age_seconds",
+                "Age of the oldest dashboard snapshot the inventory gauges read.",
+                [({}, age)],
+            )
+        )
+    return gauges
+
+
+@collector(ttl=10)
+def job_queue_gauges() -> list[Gauge]:
+    rows = {
+        row["status"]: row
+        for row in models.BackgroundJob.objects.filter(status__in=JOB_STATUSES)
+        .values("status")
+        .annotate(jobs=Count("id"), oldest=Min("run_after"))
+        .order_by()
+    }
+    depth = Gauge("forge_admin_jobs", "Background jobs by status.")
+    for status in JOB_STATUSES:
+        depth.samples.append(({"status": status}, rows[status]["jobs"] if status in rows else 0))
+
+    oldest = rows.get("queued", {}).get("oldest")
+    age = max(0.0, (timezone.now() - oldest).total_seconds()) if oldest else 0.0
+    return [
+        depth,
+        Gauge("forge_admin_jobs_oldest_queued_seconds", "Age of the oldest queued job that is due or overdue.", [({}, age)]),
+    ]
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("inventory", "0001_configurator_tables"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="""
+            ALTER TABLE storage_locations
+                ADD COLUMN IF NOT EXISTS location_key TEXT COLLATE "C" NULL,
+                ADD COLUMN IF NOT EXISTS path TEXT NULL;
+            """,
+            reverse_sql="SELECT 1;",
+        ),
+        migrations.RunSQL(
+            sql="""
+            CREATE OR REPLACE FUNCTION storage_location_natural_key(value TEXT)
+            RETURNS TEXT
+            LANGUAGE sql
+            IMMUTABLE
+            AS $$
+                SELECT COALESCE(
+                    string_agg(
+                        CASE
+                            WHEN token[1] ~ '^[0-9]+$'
+                                THEN lpad(token[1], GREATEST(12, length(token[1])), '0')
+                            ELSE lower(token[1])
+                        END,
+                        '' ORDER BY position
+                    ),
+                    ''
+                )
+                FROM regexp_matches(btrim(COALESCE(value, '')), '[0-9]+|[^0-9]+', 'g')
+                    WITH ORDINALITY AS matches(token, position);
+            $$;
+            """,
+            reverse_sql="SELECT 1;",
+        ),
+        migrations.RunSQL(
+            sql="""
+            CREATE OR REPLACE FUNCTION storage_location_set_keys()
+            RETURNS TRIGGER AS $$
+            DECLARE
+                parts TEXT[];
+            BEGIN
+                parts := array_remove(
+                    ARRAY[
+                        NULLIF(btrim(NEW.aisle), ''),
+                        NULLIF(btrim(NEW.rack), ''),
+                        NULLIF(btrim(NEW.shelf), ''),
+                        NULLIF(btrim(NEW.bin), '')
+                    ],
+                    NULL
+                );
+
+                IF cardinality(parts) = 0 THEN
+                    parts := ARRAY[btrim(NEW.name)];
+                END IF;
+
+                NEW.path := array_to_string(parts, '.');
+                NEW.location_key := (
+                    SELECT string_agg(storage_location_natural_key(part), E'\\x1f' ORDER BY position)
+                    FROM unnest(parts) WITH ORDINALITY AS p(part, position)
+                );
+                RETURN NEW;
+            END;
+            $$ LANGUAGE plpgsql;
+            """,
+            reverse_sql="SELECT 1;",
+        ),
+        migrations.RunSQL(
+            sql="""
+            DROP TRIGGER IF EXISTS trg_storage_locations_keys ON storage_locations;
+            CREATE TRIGGER trg_storage_locations_keys
+                BEFORE INSERT OR UPDATE OF name, aisle, rack, shelf, bin ON storage_locations
+                FOR EACH ROW
+                EXECUTE FUNCTION storage_location_set_keys();
+            """,
+            reverse_sql="DROP TRIGGER IF EXISTS trg_storage_locations_keys ON storage_locations;",
+        ),
+        migrations.RunSQL(
+            sql="""
+            UPDATE storage_locations SET name = name WHERE location_key IS NULL;
+            """,
+            reverse_sql="SELECT 1;",
+        ),
+        migrations.RunSQL(
+            sql="""
+            CREATE INDEX IF NOT EXISTS idx_storage_locations_location_key
+                ON storage_locations (location_key);
+            CREATE INDEX IF NOT EXISTS idx_storage_locations_sort_key
+                ON storage_locations (sort_order, location_key);
+            """,
+            reverse_sql="""
+            DROP INDEX IF EXISTS idx_storage_locations_sort_key;
+            DROP INDEX IF EXISTS idx_storage_locations_location_key;
+            """,
+        ),
+    ]
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("inventory", "0002_storage_location_keys"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="""
+            CREATE TABLE IF NOT EXISTS supplier_lead_time_stats (
+                id BIGSERIAL PRIMARY KEY,
+                supplier_id BIGINT NOT NULL REFERENCES suppliers(id) ON DELETE CASCADE,
+                inventory_item_id INTEGER NULL REFERENCES inventory_items(id) ON DELETE CASCADE,
+                sample_count INTEGER NOT NULL DEFAULT 0,
+                mean_days NUMERIC(10,2) NULL,
+                p50_days NUMERIC(10,2) NULL,
+                p90_days NUMERIC(10,2) NULL,
+                on_time_rate NUMERIC(5,4) NULL,
+                last_receipt_id BIGINT NOT NULL DEFAULT 0,
+                refreshed_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+            );
+            """,
+            reverse_sql="DROP TABLE IF EXISTS supplier_lead_time_stats;",
+        ),
+        migrations.RunSQL(
+            sql="""
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_supplier_lead_time_stats_scope
+                ON supplier_lead_time_stats (supplier_id, COALESCE(inventory_item_id, 0));
+            CREATE INDEX IF NOT EXISTS idx_supplier_lead_time_stats_item
+                ON supplier_lead_time_stats (inventory_item_id)
+                WHERE inventory_item_id IS NOT NULL;
+            """,
+            reverse_sql="SELECT 1;",
+        ),
+    ]
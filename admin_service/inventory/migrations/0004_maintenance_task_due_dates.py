@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("inventory", "0003_supplier_lead_time_stats"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="""
+            ALTER TABLE maintenance_tasks
+                ADD COLUMN IF NOT EXISTS next_due_date DATE NULL;
+            """,
+            reverse_sql="SELECT 1;",
+        ),
+        migrations.RunSQL(
+            sql="""
+            CREATE INDEX IF NOT EXISTS idx_maintenance_tasks_active_due
+                ON maintenance_tasks (next_due_date)
+                WHERE status = 'active';
+            """,
+            reverse_sql="DROP INDEX IF EXISTS idx_maintenance_tasks_active_due;",
+        ),
+    ]
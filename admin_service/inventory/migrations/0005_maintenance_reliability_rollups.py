@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("inventory", "0004_maintenance_task_due_dates"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="""
+            CREATE TABLE IF NOT EXISTS maintenance_machine_monthly_stats (
+                id BIGSERIAL PRIMARY KEY,
+                machine_id BIGINT NOT NULL REFERENCES maintenance_machines(id) ON DELETE CASCADE,
+                month DATE NOT NULL,
+                record_count INTEGER NOT NULL DEFAULT 0,
+                failure_count INTEGER NOT NULL DEFAULT 0,
+                downtime_minutes INTEGER NOT NULL DEFAULT 0,
+                labor_hours NUMERIC(12,2) NOT NULL DEFAULT 0,
+                last_record_id BIGINT NOT NULL DEFAULT 0,
+                refreshed_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+                UNIQUE (machine_id, month)
+            );
+            """,
+            reverse_sql="DROP TABLE IF EXISTS maintenance_machine_monthly_stats;",
+        ),
+        migrations.RunSQL(
+            sql="""
+            CREATE INDEX IF NOT EXISTS idx_maintenance_machine_monthly_stats_month
+                ON maintenance_machine_monthly_stats (month);
+            CREATE INDEX IF NOT EXISTS idx_maintenance_records_machine_performed
+                ON maintenance_records (machine_id, performed_at);
+            """,
+            reverse_sql="SELECT 1;",
+        ),
+    ]
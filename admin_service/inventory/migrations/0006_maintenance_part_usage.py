@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("inventory", "0005_maintenance_reliability_rollups"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="""
+            CREATE INDEX IF NOT EXISTS idx_maintenance_records_parts_used
+                ON maintenance_records USING GIN (parts_used jsonb_path_ops);
+            CREATE INDEX IF NOT EXISTS idx_maintenance_records_attachments
+                ON maintenance_records USING GIN (attachments jsonb_path_ops);
+            CREATE INDEX IF NOT EXISTS idx_maintenance_machines_documents
+                ON maintenance_machines USING GIN (documents jsonb_path_ops);
+            CREATE INDEX IF NOT EXISTS idx_inventory_items_sku_lower
+                ON inventory_items (lower(sku));
+            """,
+            reverse_sql="""
+            DROP INDEX IF EXISTS idx_maintenance_records_parts_used;
+            DROP INDEX IF EXISTS idx_maintenance_records_attachments;
+            DROP INDEX IF EXISTS idx_maintenance_machines_documents;
+            DROP INDEX IF EXISTS idx_inventory_items_sku_lower;
+            """,
+        ),
+        migrations.RunSQL(
+            sql="""
+            CREATE TABLE IF NOT EXISTS maintenance_record_parts (
+                id BIGSERIAL PRIMARY KEY,
+                record_id BIGINT NOT NULL REFERENCES maintenance_records(id) ON DELETE CASCADE,
+                machine_id BIGINT NOT NULL REFERENCES maintenance_machines(id) ON DELETE CASCADE,
+                position INTEGER NOT NULL,
+                part_text TEXT NOT NULL,
+                part_key TEXT NOT NULL,
+                quantity NUMERIC(18,6) NOT NULL DEFAULT 1,
+                inventory_item_id INTEGER NULL REFERENCES inventory_items(id) ON DELETE SET NULL,
+                performed_on DATE NOT NULL,
+                UNIQUE (record_id, position)
+            );
+            CREATE INDEX IF NOT EXISTS idx_maintenance_record_parts_item
+                ON maintenance_record_parts (inventory_item_id, performed_on)
+                WHERE inventory_item_id IS NOT NULL;
+            CREATE INDEX IF NOT EXISTS idx_maintenance_record_parts_key
+                ON maintenance_record_parts (part_key);
+            """,
+            reverse_sql="DROP TABLE IF EXISTS maintenance_record_parts;",
+        ),
+        migrations.RunSQL(
+            # Entries are free text; "2 x SKU", "2x SKU" and "SKU x 2" carry a
+            # quantity, anything else counts as one of the whole string.
+            sql="""
+            CREATE OR REPLACE FUNCTION maintenance_record_parts_sync(record_ids BIGINT[])
+            RETURNS INTEGER AS $$
+            DECLARE
+                inserted INTEGER;
+            BEGIN
+                DELETE FROM maintenance_record_parts WHERE record_id = ANY(record_ids);
+
+                INSERT INTO maintenance_record_parts (
+                    record_id, machine_id, position, part_text, part_key, quantity,
+                    inventory_item_id, performed_on
+                )
+                SELECT r.id,
+                       r.machine_id,
+                       e.position,
+                       t.part_text,
+                       lower(p.sku),
+                       p.quantity,
+                       i.id,
+                       COALESCE(r.performed_at, r.created_at::date)
+                FROM maintenance_records r
+                CROSS JOIN LATERAL jsonb_array_elements(
+                    CASE WHEN jsonb_typeof(r.parts_used) = 'array' THEN r.parts_used ELSE '[]'::jsonb END
+                ) WITH ORDINALITY AS e(value, position)
+                CROSS JOIN LATERAL (
+                    SELECT btrim(e.value #>> '{}') AS part_text
+                ) AS t
+                CROSS JOIN LATERAL (
+                    SELECT regexp_match(t.part_text, '^([0-9]+(?:[.][0-9]+)?)[[:space:]]*[xX][[:space:]]+(.+)$') AS lead,
+                           regexp_match(t.part_text, '^(.+?)[[:space:]]+[xX][[:space:]]*([0-9]+(?:[.][0-9]+)?)$') AS trail
+                ) AS m
+                CROSS JOIN LATERAL (
+                    SELECT btrim(COALESCE(m.lead[2], m.trail[1], t.part_text)) AS sku,
+                           COALESCE(m.lead[1], m.trail[2], '1')::NUMERIC AS quantity
+                ) AS p
+                LEFT JOIN LATERAL (
+                    SELECT ii.id
+                    FROM inventory_items ii
+                    WHERE lower(ii.sku) = lower(p.sku)
+                    ORDER BY ii.id
+                    LIMIT 1
+                ) AS i ON TRUE
+                WHERE r.id = ANY(record_ids)
+                  AND jsonb_typeof(e.value) = 'string'
+                  AND t.part_text <> '';
+
+                GET DIAGNOSTICS inserted = ROW_COUNT;
+                RETURN inserted;
+            END;
+            $$ LANGUAGE plpgsql;
+            """,
+            reverse_sql="DROP FUNCTION IF EXISTS maintenance_record_parts_sync(BIGINT[]);",
+        ),
+        migrations.RunSQL(
+            sql="""
+            CREATE OR REPLACE FUNCTION maintenance_records_sync_parts()
+            RETURNS TRIGGER AS $$
+            BEGIN
+                PERFORM maintenance_record_parts_sync(ARRAY[NEW.id]);
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql;
+
+            DROP TRIGGER IF EXISTS trg_maintenance_records_parts ON maintenance_records;
+            CREATE TRIGGER trg_maintenance_records_parts
+                AFTER INSERT OR UPDATE OF parts_used, machine_id, performed_at ON maintenance_records
+                FOR EACH ROW EXECUTE FUNCTION maintenance_records_sync_parts();
+
+            CREATE OR REPLACE FUNCTION inventory_items_relink_maintenance_parts()
+            RETURNS TRIGGER AS $$
+            BEGIN
+                UPDATE maintenance_record_parts
+                SET inventory_item_id = NULL
+                WHERE inventory_item_id = NEW.id AND part_key <> lower(NEW.sku);
+
+                UPDATE maintenance_record_parts
+                SET inventory_item_id = NEW.id
+                WHERE part_key = lower(NEW.sku) AND inventory_item_id IS NULL;
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql;
+
+            DROP TRIGGER IF EXISTS trg_inventory_items_maintenance_parts ON inventory_items;
+            CREATE TRIGGER trg_inventory_items_maintenance_parts
+                AFTER INSERT OR UPDATE OF sku ON inventory_items
+                FOR EACH ROW EXECUTE FUNCTION inventory_items_relink_maintenance_parts();
+            """,
+            reverse_sql="""
+            DROP TRIGGER IF EXISTS trg_maintenance_records_parts ON maintenance_records;
+            DROP TRIGGER IF EXISTS trg_inventory_items_maintenance_parts ON inventory_items;
+            """,
+        ),
+        migrations.RunSQL(
+            sql="SELECT maintenance_record_parts_sync(ARRAY(SELECT id FROM maintenance_records));",
+            reverse_sql="SELECT 1;",
+        ),
+    ]
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("inventory", "0006_maintenance_part_usage"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="""
+            CREATE TABLE IF NOT EXISTS maintenance_part_postings (
+                id BIGSERIAL PRIMARY KEY,
+                first_record_id BIGINT NOT NULL,
+                last_record_id BIGINT NOT NULL,
+                inventory_transaction_id INTEGER NULL REFERENCES inventory_transactions(id) ON DELETE SET NULL,
+                record_count INTEGER NOT NULL DEFAULT 0,
+                line_count INTEGER NOT NULL DEFAULT 0,
+                unmatched_count INTEGER NOT NULL DEFAULT 0,
+                short_quantity INTEGER NOT NULL DEFAULT 0,
+                posted_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+            );
+            CREATE INDEX IF NOT EXISTS idx_maintenance_part_postings_last_record
+                ON maintenance_part_postings (last_record_id);
+            """,
+            reverse_sql="DROP TABLE IF EXISTS maintenance_part_postings;",
+        ),
+    ]
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("inventory", "0007_maintenance_part_postings"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="""
+            CREATE TABLE IF NOT EXISTS admin_jobs (
+                id BIGSERIAL PRIMARY KEY,
+                kind TEXT NOT NULL,
+                payload JSONB NOT NULL DEFAULT '{}'::jsonb,
+                status TEXT NOT NULL DEFAULT 'queued'
+                    CHECK (status IN ('queued', 'running', 'succeeded', 'failed', 'cancelled')),
+                attempts INTEGER NOT NULL DEFAULT 0,
+                max_attempts INTEGER NOT NULL DEFAULT 3,
+                run_after TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+                locked_by TEXT NULL,
+                heartbeat_at TIMESTAMPTZ NULL,
+                progress_current INTEGER NOT NULL DEFAULT 0,
+                progress_total INTEGER NULL,
+                progress_message TEXT NULL,
+                result JSONB NULL,
+                error TEXT NULL,
+                requested_by TEXT NULL,
+                created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+                started_at TIMESTAMPTZ NULL,
+                finished_at TIMESTAMPTZ NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_admin_jobs_claimable
+                ON admin_jobs (run_after, id)
+                WHERE status = 'queued';
+            CREATE INDEX IF NOT EXISTS idx_admin_jobs_running_heartbeat
+                ON admin_jobs (heartbeat_at)
+                WHERE status = 'running';
+            """,
+            reverse_sql="DROP TABLE IF EXISTS admin_jobs;",
+        ),
+    ]
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("inventory", "0008_admin_jobs"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="""
+            CREATE TABLE IF NOT EXISTS inventory_metric_snapshots (
+                id BIGSERIAL PRIMARY KEY,
+                label TEXT NOT NULL,
+                period_start DATE NOT NULL,
+                value NUMERIC(20, 6) NULL,
+                computed_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+                UNIQUE (label, period_start)
+            );
+            """,
+            reverse_sql="DROP TABLE IF EXISTS inventory_metric_snapshots;",
+        ),
+    ]
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("inventory", "0009_inventory_metric_snapshots"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="""
+            CREATE EXTENSION IF NOT EXISTS pg_trgm;
+            CREATE INDEX IF NOT EXISTS idx_inventory_items_part_finish_upper
+                ON inventory_items (upper(part_number), finish);
+            CREATE INDEX IF NOT EXISTS idx_inventory_items_part_number_trgm
+                ON inventory_items USING GIN (upper(part_number) gin_trgm_ops);
+            """,
+            reverse_sql="""
+            DROP INDEX IF EXISTS idx_inventory_items_part_number_trgm;
+            DROP INDEX IF EXISTS idx_inventory_items_part_finish_upper;
+            """,
+        ),
+    ]
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("inventory", "0010_estimate_matching_indexes"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="""
+            CREATE TABLE IF NOT EXISTS uom_conversions (
+                id BIGSERIAL PRIMARY KEY,
+                inventory_item_id INTEGER NULL REFERENCES inventory_items(id) ON DELETE CASCADE,
+                unit TEXT NOT NULL,
+                stock_per_unit NUMERIC(18, 6) NOT NULL CHECK (stock_per_unit > 0),
+                notes TEXT NULL
+            );
+            CREATE UNIQUE INDEX IF NOT EXISTS uq_uom_conversions_item_unit
+                ON uom_conversions (COALESCE(inventory_item_id, 0), lower(unit));
+            """,
+            reverse_sql="DROP TABLE IF EXISTS uom_conversions;",
+        ),
+    ]
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from django.db import migrations
+
+# Tables whose writes (from Django or PHP) bump a version in table_change_counters.
+TRACKED_TABLES = (
+    "inventory_items",
+    "inventory_item_locations",
+    "storage_locations",
+    "suppliers",
+    "purchase_orders",
+    "purchase_order_lines",
+    "job_reservations",
+    "job_reservation_items",
+)
+
+
+def _triggers(tables: tuple[str, ...]) -> str:
+    return "\n".join(
+        f"""
+        DROP TRIGGER IF EXISTS trg_{table}_change_counter ON {table};
+        CREATE TRIGGER trg_{table}_change_counter
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table}
+            FOR EACH STATEMENT EXECUTE FUNCTION bump_table_change_counter();
+        """
+        for table in tables
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("inventory", "0011_uom_conversions"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="""
+            CREATE TABLE IF NOT EXISTS table_change_counters (
+                table_name TEXT PRIMARY KEY,
+                version BIGINT NOT NULL DEFAULT 0,
+                changed_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+            );
+
+            -- Statement-level, so a bulk update costs one counter bump.
+            CREATE OR REPLACE FUNCTION bump_table_change_counter()
+            RETURNS TRIGGER AS $$
+            BEGIN
+                INSERT INTO table_change_counters (table_name, version, changed_at)
+                VALUES (TG_TABLE_NAME, 1, NOW())
+                ON CONFLICT (table_name) DO UPDATE SET
+                    version = table_change_counters.version + 1,
+                    changed_at = EXCLUDED.changed_at;
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql;
+            """,
+            reverse_sql="""
+            DROP FUNCTION IF EXISTS bump_table_change_counter() CASCADE;
+            DROP TABLE IF EXISTS table_change_counters;
+            """,
+        ),
+        migrations.RunSQL(
+            sql=_triggers(TRACKED_TABLES)
+            + "INSERT INTO table_change_counters (table_name) VALUES "
+            + ", ".join(f"('{table}')" for table in TRACKED_TABLES)
+            + " ON CONFLICT DO NOTHING;",
+            reverse_sql="\n".join(
+                f"DROP TRIGGER IF EXISTS trg_{table}_change_counter ON {table};" for table in TRACKED_TABLES
+            ),
+        ),
+    ]
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("inventory", "0012_table_change_counters"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="""
+            CREATE TABLE IF NOT EXISTS inventory_movement_batches (
+                idempotency_key TEXT PRIMARY KEY,
+                request_hash TEXT NOT NULL,
+                inventory_transaction_id INTEGER NULL REFERENCES inventory_transactions(id) ON DELETE SET NULL,
+                response JSONB NOT NULL DEFAULT '{}'::jsonb,
+                requested_by TEXT NULL,
+                created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+            );
+            CREATE INDEX IF NOT EXISTS idx_inventory_movement_batches_created
+                ON inventory_movement_batches (created_at);
+            """,
+            reverse_sql="DROP TABLE IF EXISTS inventory_movement_batches;",
+        ),
+    ]
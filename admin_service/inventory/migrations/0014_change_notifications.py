@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from django.db import migrations
+
+# Table -> column whose values are sent as "ids" in the notification.
+NOTIFY_TABLES = {
+    "inventory_items": "id",
+    "inventory_item_locations": "inventory_item_id",
+    "purchase_orders": "id",
+    "job_reservation_items": "inventory_item_id",
+}
+
+# (trigger suffix, event, transition table clause)
+_EVENTS = (
+    ("ins", "INSERT", "NEW TABLE AS changed_rows"),
+    ("upd", "UPDATE", "NEW TABLE AS changed_rows"),
+    ("del", "DELETE", "OLD TABLE AS changed_rows"),
+)
+
+
+def _triggers() -> str:
+    return "\n".join(
+        f"""
+        DROP TRIGGER IF EXISTS trg_{table}_notify_{suffix} ON {table};
+        CREATE TRIGGER trg_{table}_notify_{suffix}
+            AFTER {event} ON {table}
+            REFERENCING {transition}
+            FOR EACH STATEMENT EXECUTE FUNCTION notify_inventory_change('{column}');
+        """
+        for table, column in NOTIFY_TABLES.items()
+        for suffix, event, transition in _EVENTS
+    )
+
+
+def _drop_triggers() -> str:
+    return "\n".join(
+        f"DROP TRIGGER IF EXISTS trg_{table}_notify_{suffix} ON {table};"
+        for table in NOTIFY_TABLES
+        for suffix, _, _ in _EVENTS
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("inventory", "0013_movement_batches"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="""
+            -- One NOTIFY per statement on channel inventory_changes:
+            -- {"table": ..., "op": "insert"|"update"|"delete", "key": <column>, "ids": [...]}.
+            -- Statements touching more than 500 distinct keys send "ids": null,
+            -- meaning "anything in this table may have changed", which keeps
+            -- payloads well under the 8000-byte NOTIFY limit.
+            CREATE OR REPLACE FUNCTION notify_inventory_change()
+            RETURNS TRIGGER AS $$
+            DECLARE
+                key_column TEXT := TG_ARGV[0];
+                changed_ids BIGINT[];
+            BEGIN
+                -- At most 501 distinct keys are read; the 501st only says "too many".
+                EXECUTE format(
+                    'SELECT array_agg(k ORDER BY k) FROM ('
+                    '  SELECT DISTINCT %I AS k FROM changed_rows WHERE %I IS NOT NULL LIMIT 501'
+                    ') changed',
+                    key_column, key_column
+                ) INTO changed_ids;
+                IF changed_ids IS NULL THEN
+                    RETURN NULL;
+                END IF;
+                IF cardinality(changed_ids) > 500 THEN
+                    changed_ids := NULL;
+                END IF;
+                PERFORM pg_notify(
+                    'inventory_changes',
+                    json_build_object(
+                        'table', TG_TABLE_NAME,
+                        'op', lower(TG_OP),
+                        'key', key_column,
+                        'ids', changed_ids
+                    )::text
+                );
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql;
+            """,
+            reverse_sql="DROP FUNCTION IF EXISTS notify_inventory_change() CASCADE;",
+        ),
+        migrations.RunSQL(sql=_triggers(), reverse_sql=_drop_triggers()),
+    ]
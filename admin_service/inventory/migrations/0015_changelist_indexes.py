@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from django.db import migrations
+
+# Indexes matching the admin changelists' ORDER BY (Meta/ModelAdmin ordering
+# plus the "-id" tie-breaker Django appends when the ordering is not unique)
+# and their common filters, so the first page is read in index order.
+# Orderings through a foreign key sort by the related model's ordering, which
+# no index on the table itself can serve.
+# Check them with ``python manage.py audit_admin_indexes``.
+#
+# (name, table, columns, partial-index predicate)
+CHANGELIST_INDEXES = (
+    ("idx_inventory_items_item", "inventory_items", "item, id DESC", None),
+    ("idx_inventory_items_supplier_item", "inventory_items", "supplier, item, id DESC", None),
+    ("idx_inventory_items_supplier_ref_item", "inventory_items", "supplier_id, item, id DESC", None),
+    ("idx_job_reservations_created", "job_reservations", "created_at, id", None),
+    ("idx_job_reservations_status_created", "job_reservations", "status, created_at, id", None),
+    ("idx_cycle_count_sessions_started", "cycle_count_sessions", "started_at, id", None),
+    ("idx_inventory_transactions_created", "inventory_transactions", "created_at, id", None),
+    ("idx_purchase_orders_order_date", "purchase_orders", "order_date, id", None),
+    (
+        "idx_purchase_orders_open_order_date",
+        "purchase_orders",
+        "order_date, id",
+        "status IN ('draft', 'sent', 'partially_received')",
+    ),
+    ("idx_storage_locations_active_sort", "storage_locations", "sort_order, location_key, id DESC", "is_active"),
+    # Tasks order by machine name (a join), so only their filters get an index.
+    ("idx_maintenance_tasks_status_priority", "maintenance_tasks", "status, priority", None),
+    ("idx_maintenance_records_performed", "maintenance_records", "performed_at, created_at, id", None),
+    ("idx_maintenance_machines_equipment_type", "maintenance_machines", "equipment_type, name, id DESC", None),
+)
+
+
+def _create(name: str, table: str, columns: str, predicate: str | None) -> migrations.RunSQL:
+    # CONCURRENTLY keeps the tables writable from PHP while the index builds;
+    # it cannot share a transaction, hence one operation per index.
+    where = f" WHERE {predicate}" if predicate else ""
+    return migrations.RunSQL(
+        sql=f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} ({columns}){where};",
+        reverse_sql=f"DROP INDEX CONCURRENTLY IF EXISTS {name};",
+    )
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("inventory", "0014_change_notifications"),
+    ]
+
+    operations = [_create(*index) for index in CHANGELIST_INDEXES]
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from django.db import migrations
+
+# The statement triggers from 0012 upserted the shared counter row inside every
+# writing statement, holding its row lock until commit, so every transaction
+# writing a tracked table queued behind every other one.  The bump now runs
+# once per table and transaction, at commit.
+TRACKED_TABLES = (
+    "inventory_items",
+    "inventory_item_locations",
+    "storage_locations",
+    "suppliers",
+    "purchase_orders",
+    "purchase_order_lines",
+    "job_reservations",
+    "job_reservation_items",
+)
+
+
+def _triggers(tables: tuple[str, ...]) -> str:
+    # Constraint triggers are row-level only; the function's guard makes the
+    # first row per table and transaction do the bump and the rest return.
+    # TRUNCATE cannot be deferred, but it holds an exclusive lock anyway.
+    return "\n".join(
+        f"""
+        DROP TRIGGER IF EXISTS trg_{table}_change_counter ON {table};
+        CREATE CONSTRAINT TRIGGER trg_{table}_change_counter
+            AFTER INSERT OR UPDATE OR DELETE ON {table}
+            DEFERRABLE INITIALLY DEFERRED
+            FOR EACH ROW EXECUTE FUNCTION bump_table_change_counter();
+        DROP TRIGGER IF EXISTS trg_{table}_change_counter_truncate ON {table};
+        CREATE TRIGGER trg_{table}_change_counter_truncate
+            AFTER TRUNCATE ON {table}
+            FOR EACH STATEMENT EXECUTE FUNCTION bump_table_change_counter();
+        """
+        for table in tables
+    )
+
+
+def _statement_triggers(tables: tuple[str, ...]) -> str:
+    return "\n".join(
+        f"""
+        DROP TRIGGER IF EXISTS trg_{table}_change_counter_truncate ON {table};
+        DROP TRIGGER IF EXISTS trg_{table}_change_counter ON {table};
+        CREATE TRIGGER trg_{table}_change_counter
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table}
+            FOR EACH STATEMENT EXECUTE FUNCTION bump_table_change_counter();
+        """
+        for table in tables
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("inventory", "0015_changelist_indexes"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="""
+            CREATE OR REPLACE FUNCTION bump_table_change_counter()
+            RETURNS TRIGGER AS $$
+            DECLARE
+                flag TEXT := 'table_change_counters.' || TG_TABLE_NAME;
+            BEGIN
+                IF current_setting(flag, true) = 'on' THEN
+                    RETURN NULL;
+                END IF;
+                PERFORM set_config(flag, 'on', true);
+                INSERT INTO table_change_counters (table_name, version, changed_at)
+                VALUES (TG_TABLE_NAME, 1, NOW())
+                ON CONFLICT (table_name) DO UPDATE SET
+                    version = table_change_counters.version + 1,
+                    changed_at = EXCLUDED.changed_at;
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql;
+            """
+            + _triggers(TRACKED_TABLES),
+            reverse_sql="""
+            CREATE OR REPLACE FUNCTION bump_table_change_counter()
+            RETURNS TRIGGER AS $$
+            BEGIN
+                INSERT INTO table_change_counters (table_name, version, changed_at)
+                VALUES (TG_TABLE_NAME, 1, NOW())
+                ON CONFLICT (table_name) DO UPDATE SET
+                    version = table_change_counters.version + 1,
+                    changed_at = EXCLUDED.changed_at;
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql;
+            """
+            + _statement_triggers(TRACKED_TABLES),
+        ),
+    ]
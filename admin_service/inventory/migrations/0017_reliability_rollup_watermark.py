@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("inventory", "0016_deferred_change_counters"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            # One row: the highest maintenance record id refresh_new_records
+            # has scanned.  Admin saves refresh their own buckets and must not
+            # move it past PHP-entered records they never looked at.  Starting
+            # at 0 folds every existing record in once on the next refresh.
+            sql="""
+            CREATE TABLE IF NOT EXISTS maintenance_rollup_watermark (
+                id SMALLINT PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+                last_record_id BIGINT NOT NULL DEFAULT 0,
+                refreshed_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+            );
+            INSERT INTO maintenance_rollup_watermark (id) VALUES (1) ON CONFLICT DO NOTHING;
+            """,
+            reverse_sql="DROP TABLE IF EXISTS maintenance_rollup_watermark;",
+        ),
+    ]
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+from django.db import migrations
+
+# 0016's row-level deferred triggers queued one event per modified row until
+# commit, so bulk writes (a COPY load, update_on_order_quantities) paid memory
+# and a function call per row.  The statement-level triggers from 0012 are
+# back, but they only insert into table_change_log, so writers never wait on
+# each other's counter row.  A deferred trigger on the log stamps each entry
+# as its transaction commits (one event per writing statement), and
+# ``changes.compact_change_log`` folds committed entries into
+# table_change_counters.  A table's version is its counter plus its log rows.
+TRACKED_TABLES = (
+    "inventory_items",
+    "inventory_item_locations",
+    "storage_locations",
+    "suppliers",
+    "purchase_orders",
+    "purchase_order_lines",
+    "job_reservations",
+    "job_reservation_items",
+)
+
+_FOLD_LOG_SQL = """
+WITH folded AS (
+    DELETE FROM table_change_log RETURNING table_name, changed_at
+)
+INSERT INTO table_change_counters (table_name, version, changed_at)
+SELECT table_name, COUNT(*), MAX(changed_at)
+FROM folded
+GROUP BY table_name
+ON CONFLICT (table_name) DO UPDATE SET
+    version = table_change_counters.version + EXCLUDED.version,
+    changed_at = GREATEST(table_change_counters.changed_at, EXCLUDED.changed_at);
+"""
+
+
+def _statement_triggers(tables: tuple[str, ...]) -> str:
+    return "\n".join(
+        f"""
+        DROP TRIGGER IF EXISTS trg_{table}_change_counter_truncate ON {table};
+        DROP TRIGGER IF EXISTS trg_{table}_change_counter ON {table};
+        CREATE TRIGGER trg_{table}_change_counter
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table}
+            FOR EACH STATEMENT EXECUTE FUNCTION bump_table_change_counter();
+        """
+        for table in tables
+    )
+
+
+def _deferred_triggers(tables: tuple[str, ...]) -> str:
+    return "\n".join(
+        f"""
+        DROP TRIGGER IF EXISTS trg_{table}_change_counter ON {table};
+        CREATE CONSTRAINT TRIGGER trg_{table}_change_counter
+            AFTER INSERT OR UPDATE OR DELETE ON {table}
+            DEFERRABLE INITIALLY DEFERRED
+            FOR EACH ROW EXECUTE FUNCTION bump_table_change_counter();
+        CREATE TRIGGER trg_{table}_change_counter_truncate
+            AFTER TRUNCATE ON {table}
+            FOR EACH STATEMENT EXECUTE FUNCTION bump_table_change_counter();
+        """
+        for table in tables
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("inventory", "0017_reliability_rollup_watermark"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="""
+            CREATE TABLE IF NOT EXISTS table_change_log (
+                id BIGSERIAL PRIMARY KEY,
+                table_name TEXT NOT NULL,
+                changed_at TIMESTAMPTZ NOT NULL DEFAULT clock_timestamp()
+            );
+            CREATE INDEX IF NOT EXISTS idx_table_change_log_table
+                ON table_change_log (table_name, changed_at);
+
+            -- clock_timestamp() at commit rather than NOW(), the transaction
+            -- start: a long transaction must not report a change older than
+            -- one already served as Last-Modified.
+            CREATE OR REPLACE FUNCTION stamp_table_change_log()
+            RETURNS TRIGGER AS $$
+            BEGIN
+                UPDATE table_change_log SET changed_at = clock_timestamp() WHERE id = NEW.id;
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql;
+
+            DROP TRIGGER IF EXISTS trg_table_change_log_stamp ON table_change_log;
+            CREATE CONSTRAINT TRIGGER trg_table_change_log_stamp
+                AFTER INSERT ON table_change_log
+                DEFERRABLE INITIALLY DEFERRED
+                FOR EACH ROW EXECUTE FUNCTION stamp_table_change_log();
+
+            CREATE OR REPLACE FUNCTION bump_table_change_counter()
+            RETURNS TRIGGER AS $$
+            BEGIN
+                INSERT INTO table_change_log (table_name) VALUES (TG_TABLE_NAME);
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql;
+            """
+            + _statement_triggers(TRACKED_TABLES),
+            reverse_sql="""
+            CREATE OR REPLACE FUNCTION bump_table_change_counter()
+            RETURNS TRIGGER AS $$
+            DECLARE
+                flag TEXT := 'table_change_counters.' || TG_TABLE_NAME;
+            BEGIN
+                IF current_setting(flag, true) = 'on' THEN
+                    RETURN NULL;
+                END IF;
+                PERFORM set_config(flag, 'on', true);
+                INSERT INTO table_change_counters (table_name, version, changed_at)
+                VALUES (TG_TABLE_NAME, 1, NOW())
+                ON CONFLICT (table_name) DO UPDATE SET
+                    version = table_change_counters.version + 1,
+                    changed_at = EXCLUDED.changed_at;
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql;
+            """
+            + _deferred_triggers(TRACKED_TABLES)
+            + _FOLD_LOG_SQL
+            + """
+            DROP TABLE IF EXISTS table_change_log;
+            DROP FUNCTION IF EXISTS stamp_table_change_log();
+            """,
+        ),
+    ]
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("inventory", "0018_table_change_log"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            # One row: the highest receipt id the periodic lead-time refresh
+            # has scanned.  Admin receipts queue their own supplier's refresh
+            # and never move it.  Seeded from the old per-row watermark.
+            sql="""
+            CREATE TABLE IF NOT EXISTS supplier_lead_time_watermark (
+                id SMALLINT PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+                last_receipt_id BIGINT NOT NULL DEFAULT 0,
+                refreshed_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+            );
+            INSERT INTO supplier_lead_time_watermark (id, last_receipt_id)
+            SELECT 1, COALESCE(MAX(last_receipt_id), 0) FROM supplier_lead_time_stats
+            ON CONFLICT DO NOTHING;
+            """,
+            reverse_sql="DROP TABLE IF EXISTS supplier_lead_time_watermark;",
+        ),
+    ]
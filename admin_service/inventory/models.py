@@ -61,17 +61,22 @@ class StorageLocation(models.Model):
     rack = models.CharField(max_length=255, blank=True, null=True)
     shelf = models.CharField(max_length=255, blank=True, null=True)
     bin = models.CharField(max_length=255, blank=True, null=True)
+    # Maintained by the ``trg_storage_locations_keys`` trigger on every write.
+    location_key = models.TextField(blank=True, null=True, editable=False)
+    path = models.TextField(blank=True, null=True, editable=False)
     created_at = models.DateTimeField()
     updated_at = models.DateTimeField()
 
     class Meta:
         managed = False
         db_table = "storage_locations"
-        ordering = ["sort_order", "aisle", "rack", "shelf", "bin", "name"]
+        ordering = ["sort_order", "location_key"]
         verbose_name = "Storage location"
         verbose_name_plural = "Storage locations"
 
     def __str__(self) -> str:  # pragma: no cover - trivial
+        if self.path:
+            return self.path
         parts = [
             value
             for value in [self.aisle, self.rack, self.shelf, self.bin]
@@ -111,6 +116,34 @@ class InventoryItemLocation(models.Model):
         return f"{self.inventory_item} → {self.storage_location}"
 
 
+class UomConversion(models.Model):
+    """Stock units per purchase unit, globally or for one item."""
+
+    id = models.BigAutoField(primary_key=True)
+    inventory_item = models.ForeignKey(
+        InventoryItem,
+        on_delete=models.CASCADE,
+        db_column="inventory_item_id",
+        related_name="uom_conversions",
+        blank=True,
+        null=True,
+    )
+    unit = models.TextField()
+    stock_per_unit = models.DecimalField(max_digits=18, decimal_places=6)
+    notes = models.TextField(blank=True, null=True)
+
+    class Meta:
+        managed = False
+        db_table = "uom_conversions"
+        ordering = ["inventory_item", "unit"]
+        verbose_name = "Unit conversion"
+        verbose_name_plural = "Unit conversions"
+
+    def __str__(self) -> str:  # pragma: no cover - trivial
+        scope = self.inventory_item or "all items"
+        return f"1 {self.unit} = {self.stock_per_unit.normalize()} ({scope})"
+
+
 class InventoryMetric(models.Model):
     """Key performance metrics displayed in the main dashboard."""
 
@@ -133,6 +166,27 @@ class InventoryMetric(models.Model):
         return self.label
 
 
+class InventoryMetricSnapshot(models.Model):
+    """Computed dashboard metric value as of the latest run in a period."""
+
+    id = models.BigAutoField(primary_key=True)
+    label = models.TextField()
+    period_start = models.DateField()
+    value = models.DecimalField(max_digits=20, decimal_places=6, blank=True, null=True)
+    computed_at = models.DateTimeField()
+
+    class Meta:
+        managed = False
+        db_table = "inventory_metric_snapshots"
+        unique_together = ("label", "period_start")
+        ordering = ["label", "-period_start"]
+        verbose_name = "Inventory metric snapshot"
+        verbose_name_plural = "Inventory metric snapshots"
+
+    def __str__(self) -> str:  # pragma: no cover - trivial
+        return f"{self.label} ({self.period_start})"
+
+
 class JobReservation(models.Model):
     """Represents a reservation request for inventory."""
 
@@ -322,6 +376,45 @@ class Supplier(models.Model):
         return self.name
 
 
+class SupplierLeadTimeStat(models.Model):
+    """Observed lead-time distribution per supplier, or per supplier and item."""
+
+    id = models.BigAutoField(primary_key=True)
+    supplier = models.ForeignKey(
+        Supplier,
+        on_delete=models.CASCADE,
+        db_column="supplier_id",
+        related_name="lead_time_stats",
+    )
+    inventory_item = models.ForeignKey(
+        InventoryItem,
+        on_delete=models.CASCADE,
+        db_column="inventory_item_id",
+        related_name="lead_time_stats",
+        blank=True,
+        null=True,
+    )
+    sample_count = models.IntegerField(default=0)
+    mean_days = models.DecimalField(max_digits=10, decimal_places=2, blank=True, null=True)
+    p50_days = models.DecimalField(max_digits=10, decimal_places=2, blank=True, null=True)
+    p90_days = models.DecimalField(max_digits=10, decimal_places=2, blank=True, null=True)
+    on_time_rate = models.DecimalField(max_digits=5, decimal_places=4, blank=True, null=True)
+    last_receipt_id = models.BigIntegerField(default=0)
+    refreshed_at = models.DateTimeField()
+
+    class Meta:
+        managed = False
+        db_table = "supplier_lead_time_stats"
+        ordering = ["supplier", "inventory_item"]
+        verbose_name = "Supplier lead-time statistic"
+        verbose_name_plural = "Supplier lead-time statistics"
+
+    def __str__(self) -> str:  # pragma: no cover - trivial
+        if self.inventory_item_id:
+            return f"{self.supplier} / {self.inventory_item}"
+        return str(self.supplier)
+
+
 class PurchaseOrder(models.Model):
     """Purchase order header record."""
 
@@ -516,6 +609,8 @@ class MaintenanceTask(models.Model):
     last_completed_at = models.DateField(blank=True, null=True)
     status = models.TextField(default="active")
     priority = models.TextField(default="medium")
+    # Cached by ``services.maintenance_schedule.refresh_due_dates``.
+    next_due_date = models.DateField(blank=True, null=True, editable=False)
     created_at = models.DateTimeField()
     updated_at = models.DateTimeField()
 
@@ -568,6 +663,109 @@ class MaintenanceRecord(models.Model):
         return f"{self.machine} maintenance"
 
 
+class MaintenanceRecordPart(models.Model):
+    """One ``parts_used`` entry of a maintenance record, kept in sync by a trigger."""
+
+    id = models.BigAutoField(primary_key=True)
+    record = models.ForeignKey(
+        MaintenanceRecord,
+        on_delete=models.CASCADE,
+        db_column="record_id",
+        related_name="parts",
+    )
+    machine = models.ForeignKey(
+        MaintenanceMachine,
+        on_delete=models.CASCADE,
+        db_column="machine_id",
+        related_name="parts_used",
+    )
+    position = models.IntegerField()
+    part_text = models.TextField()
+    part_key = models.TextField()
+    quantity = models.DecimalField(max_digits=18, decimal_places=6, default=1)
+    inventory_item = models.ForeignKey(
+        InventoryItem,
+        on_delete=models.SET_NULL,
+        db_column="inventory_item_id",
+        related_name="maintenance_parts",
+        blank=True,
+        null=True,
+    )
+    performed_on = models.DateField()
+
+    class Meta:
+        managed = False
+        db_table = "maintenance_record_parts"
+        ordering = ["record", "position"]
+        unique_together = ("record", "position")
+        verbose_name = "Maintenance record part"
+        verbose_name_plural = "Maintenance record parts"
+
+    def __str__(self) -> str:  # pragma: no cover - trivial
+        return self.part_text
+
+
+class MaintenancePartPosting(models.Model):
+    """A batch of maintenance records whose parts were posted to the ledger."""
+
+    id = models.BigAutoField(primary_key=True)
+    first_record_id = models.BigIntegerField()
+    last_record_id = models.BigIntegerField()
+    inventory_transaction = models.ForeignKey(
+        InventoryTransaction,
+        on_delete=models.SET_NULL,
+        db_column="inventory_transaction_id",
+        related_name="maintenance_postings",
+        blank=True,
+        null=True,
+    )
+    record_count = models.IntegerField(default=0)
+    line_count = models.IntegerField(default=0)
+    unmatched_count = models.IntegerField(default=0)
+    short_quantity = models.IntegerField(default=0)
+    posted_at = models.DateTimeField()
+
+    class Meta:
+        managed = False
+        db_table = "maintenance_part_postings"
+        ordering = ["-last_record_id"]
+        verbose_name = "Maintenance part posting"
+        verbose_name_plural = "Maintenance part postings"
+
+    def __str__(self) -> str:  # pragma: no cover - trivial
+        return f"Records #{self.first_record_id}-{self.last_record_id}"
+
+
+class MaintenanceMachineMonthlyStat(models.Model):
+    """Per-machine monthly reliability rollup maintained from maintenance records."""
+
+    id = models.BigAutoField(primary_key=True)
+    machine = models.ForeignKey(
+        MaintenanceMachine,
+        on_delete=models.CASCADE,
+        db_column="machine_id",
+        related_name="monthly_stats",
+    )
+    month = models.DateField()
+    record_count = models.IntegerField(default=0)
+    failure_count = models.IntegerField(default=0)
+    downtime_minutes = models.IntegerField(default=0)
+    labor_hours = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    last_record_id = models.BigIntegerField(default=0)
+    refreshed_at = models.DateTimeField()
+
+    class Meta:
+        managed = False
+        db_table = "maintenance_machine_monthly_stats"
+        ordering = ["machine", "-month"]
+        unique_together = ("machine", "month")
+        verbose_name = "Machine monthly reliability"
+        verbose_name_plural = "Machine monthly reliability"
+
+    def __str__(self) -> str:  # pragma: no cover - trivial
+        return f"{self.machine} {self.month:%Y-%m}"
+
+
 class ConfiguratorPartUseOption(models.Model):
     """Configurator use tree that also encodes part type roots."""
 
@@ -752,3 +950,82 @@ class ConfiguratorConfigurationDoor(models.Model):
 
     def __str__(self) -> str:  # pragma: no cover - trivial
         return self.door_tag
+
+
+class BackgroundJob(models.Model):
+    """Queued admin work picked up by ``manage.py run_jobs``."""
+
+    id = models.BigAutoField(primary_key=True)
+    kind = models.TextField()
+    payload = models.JSONField(default=dict)
+    status = models.TextField(default="queued")
+    attempts = models.IntegerField(default=0)
+    max_attempts = models.IntegerField(default=3)
+    run_after = models.DateTimeField()
+    locked_by = models.TextField(blank=True, null=True)
+    heartbeat_at = models.DateTimeField(blank=True, null=True)
+    progress_current = models.IntegerField(default=0)
+    progress_total = models.IntegerField(blank=True, null=True)
+    progress_message = models.TextField(blank=True, null=True)
+    result = models.JSONField(blank=True, null=True)
+    error = models.TextField(blank=True, null=True)
+    requested_by = models.TextField(blank=True, null=True)
+    created_at = models.DateTimeField()
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        managed = False
+        db_table = "admin_jobs"
+        ordering = ["-id"]
+        verbose_name = "Background job"
+        verbose_name_plural = "Background jobs"
+
+    def __str__(self) -> str:  # pragma: no cover - trivial
+        return f"{self.kind} #{self.pk}"
+
+
+class MovementBatch(models.Model):
+    """A posted movements API batch, kept so retries with the same key replay."""
+
+    idempotency_key = models.TextField(primary_key=True)
+    request_hash = models.TextField()
+    inventory_transaction = models.ForeignKey(
+        InventoryTransaction,
+        on_delete=models.SET_NULL,
+        db_column="inventory_transaction_id",
+        related_name="movement_batches",
+        blank=True,
+        null=True,
+    )
+    response = models.JSONField(default=dict)
+    requested_by = models.TextField(blank=True, null=True)
+    created_at = models.DateTimeField()
+
+    class Meta:
+        managed = False
+        db_table = "inventory_movement_batches"
+        ordering = ["-created_at"]
+        verbose_name = "Movement batch"
+        verbose_name_plural = "Movement batches"
+
+    def __str__(self) -> str:  # pragma: no cover - trivial
+        return self.idempotency_key
+
+
+class TableChangeCounter(models.Model):
+    """Compacted per-table write count; pending changes are in ``table_change_log`` (see ``services.changes``)."""
+
+    table_name = models.TextField(primary_key=True)
+    version = models.BigIntegerField(default=0)
+    changed_at = models.DateTimeField()
+
+    class Meta:
+        managed = False
+        db_table = "table_change_counters"
+        ordering = ["table_name"]
+        verbose_name = "Table change counter"
+        verbose_name_plural = "Table change counters"
+
+    def __str__(self) -> str:  # pragma: no cover - trivial
+        return f"{self.table_name} v{self.version}"
@@ -0,0 +1,293 @@
+"""Change feed from the ``inventory_changes`` NOTIFY channel (migration 0014).
+
+Statement-level triggers on ``inventory_items``, ``inventory_item_locations``,
+``purchase_orders`` and ``job_reservation_items`` notify with the table,
+operation and the ids the statement touched, whether the write came from
+Django or PHP.  :class:`ChangeFeed` listens on its own connection in a
+background thread, coalesces notifications arriving within
+``CHANGE_FEED_COALESCE_SECONDS`` into one :class:`ChangeBatch`, then:
+
+* sends :data:`inventory_changed` so in-process caches can invalidate
+  (see ``skus`` and ``uom``), and
+* keeps the last ``BACKLOG_SIZE`` batches for the server-sent events
+  endpoint, which resumes from ``Last-Event-ID`` when it can.
+
+A lost connection is retried with backoff; the first batch after reconnecting
+marks every table as changed, since notifications sent meanwhile are gone.
+"""
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import logging
+import select
+import threading
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.db import connections
+from django.dispatch import Signal
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "inventory_changes"
+TABLES = ("inventory_items", "inventory_item_locations", "purchase_orders", "job_reservation_items")
+BACKLOG_SIZE = 1000
+MAX_BACKOFF_SECONDS = 30.0
+
+# Sent from the listener thread with ``batch=ChangeBatch``.
+inventory_changed = Signal()
+
+
+@dataclass(frozen=True)
+class ChangeEvent:
+    """One decoded notification."""
+
+    table: str
+    op: str
+    key: str
+    # ``None`` when the statement touched too many rows to list.
+    ids: frozenset[int] | None
+
+
+def parse_payload(payload: str) -> ChangeEvent | None:
+    try:
+        data = json.loads(payload)
+        ids = data.get("ids")
+        return ChangeEvent(
+            data["table"], data["op"], data["key"], None if ids is None else frozenset(int(i) for i in ids)
+        )
+    except (ValueError, TypeError, KeyError, AttributeError):
+        logger.warning("Ignoring malformed %s payload: %.200s", CHANNEL, payload)
+        return None
+
+
+@dataclass(frozen=True)
+class ChangeBatch:
+    """Coalesced changes: table -> ids touched, or ``None`` for "anything"."""
+
+    seq: int
+    tables: dict[str, frozenset[int] | None]
+    ops: dict[str, frozenset[str]]
+
+    def changed(self, table: str) -> bool:
+        return table in self.tables
+
+    def ids(self, table: str) -> frozenset[int] | None:
+        """Ids touched in ``table``; ``None`` means any row may have changed."""
+
+        return self.tables.get(table, frozenset())
+
+    def as_dict(self) -> dict:
+        return {
+            "seq": self.seq,
+            "tables": {
+                table: {"ops": sorted(self.ops.get(table, ())), "ids": None if ids is None else sorted(ids)}
+                for table, ids in sorted(self.tables.items())
+            },
+        }
+
+
+class _Coalescer:
+    def __init__(self) -> None:
+        self.tables: dict[str, set[int] | None] = {}
+        self.ops: dict[str, set[str]] = {}
+
+    def __bool__(self) -> bool:
+        return bool(self.tables)
+
+    def add(self, event: ChangeEvent) -> None:
+        self.ops.setdefault(event.table, set()).add(event.op)
+        if event.table in self.tables and self.tables[event.table] is None:
+            return
+        if event.ids is None:
+            self.tables[event.table] = None
+        else:
+            self.tables.setdefault(event.table, set()).update(event.ids)
+
+    def everything(self) -> None:
+        for table in TABLES:
+            self.tables[table] = None
+            self.ops.setdefault(table, set()).add("resync")
+
+    def batch(self, seq: int) -> ChangeBatch:
+        return ChangeBatch(
+            seq,
+            {table: None if ids is None else frozenset(ids) for table, ids in self.tables.items()},
+            {table: frozenset(ops) for table, ops in self.ops.items()},
+        )
+
+
+class ChangeFeed:
+    """Process-wide LISTEN connection and the recent batches it produced."""
+
+    def __init__(self, alias: str = "default") -> None:
+        self.alias = alias
+        # Sequence numbers are per process; the epoch tells a resuming SSE
+        # client whether its Last-Event-ID came from this process.
+        self.epoch = uuid.uuid4().hex[:8]
+        self._seq = itertools.count(1)
+        self._last_seq = 0
+        self._backlog: deque[ChangeBatch] = deque(maxlen=BACKLOG_SIZE)
+        self._lock = threading.Lock()
+        self._waiters: set[tuple[asyncio.AbstractEventLoop, asyncio.Event]] = set()
+        self._thread: threading.Thread | None = None
+        self._stopping = threading.Event()
+        self._refused = False
+
+    @property
+    def last_seq(self) -> int:
+        return self._last_seq
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        with self._lock:
+            if self.running or self._refused:
+                return
+            if settings.DB_PGBOUNCER and not settings.CHANGE_FEED_DB_HOST:
+                # LISTEN through a transaction pool succeeds but never
+                # receives anything; say so once instead of going quiet.
+                logger.error(
+                    "Change feed not started: DB_PGBOUNCER is set, so CHANGE_FEED_DB_HOST (and CHANGE_FEED_DB_PORT) "
+                    "must point at the primary directly."
+                )
+                self._refused = True
+                return
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._run, name="inventory-change-feed", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    def since(self, seq: int) -> list[ChangeBatch] | None:
+        """Batches after ``seq``, or ``None`` when some have already left the backlog."""
+
+        with self._lock:
+            if seq >= self._last_seq:
+                return []
+            if not self._backlog or self._backlog[0].seq > seq + 1:
+                return None
+            return [batch for batch in self._backlog if batch.seq > seq]
+
+    async def wait(self, seq: int, timeout: float) -> list[ChangeBatch] | None:
+        """Like :meth:`since`, but waits up to ``timeout`` seconds for a new batch."""
+
+        event = asyncio.Event()
+        waiter = (asyncio.get_running_loop(), event)
+        with self._lock:
+            self._waiters.add(waiter)
+        try:
+            batches = self.since(seq)
+            if batches == []:
+                try:
+                    await asyncio.wait_for(event.wait(), timeout)
+                except asyncio.TimeoutError:
+                    return []
+                batches = self.since(seq)
+            return batches
+        finally:
+            with self._lock:
+                self._waiters.discard(waiter)
+
+    def _publish(self, pending: _Coalescer) -> None:
+        with self._lock:
+            batch = pending.batch(next(self._seq))
+            self._backlog.append(batch)
+            self._last_seq = batch.seq
+            waiters = list(self._waiters)
+        # Caches first, so a client reacting to the event reads fresh data.
+        for receiver, result in inventory_changed.send_robust(sender=ChangeFeed, batch=batch):
+            if isinstance(result, Exception):
+                logger.error("inventory_changed receiver %r failed", receiver, exc_info=result)
+        for loop, event in waiters:
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:  # the waiter's loop has closed
+                pass
+
+    def _connect(self):
+        wrapper = connections[self.alias]
+        params = wrapper.get_connection_params()
+        if settings.CHANGE_FEED_DB_HOST:
+            params["host"] = settings.CHANGE_FEED_DB_HOST
+        if settings.CHANGE_FEED_DB_PORT:
+            params["port"] = settings.CHANGE_FEED_DB_PORT
+        raw = wrapper.get_new_connection(params)
+        raw.autocommit = True
+        with raw.cursor() as cursor:
+            cursor.execute(f"LISTEN {CHANNEL}")
+        return raw
+
+    def _run(self) -> None:
+        # The LISTEN connection is the driver's own, outside Django's error wrapping.
+        errors = (connections[self.alias].Database.Error, OSError)
+        backoff = 1.0
+        resync = False
+        while not self._stopping.is_set():
+            try:
+                raw = self._connect()
+            except errors:
+                logger.warning("Change feed cannot connect; retrying in %.0fs", backoff, exc_info=True)
+                self._stopping.wait(backoff)
+                backoff = min(backoff * 2, MAX_BACKOFF_SECONDS)
+                resync = True
+                continue
+
+            backoff = 1.0
+            if resync:
+                pending = _Coalescer()
+                pending.everything()
+                self._publish(pending)
+            try:
+                self._listen(raw)
+            except errors as exc:
+                logger.warning("Change feed connection lost: %s", exc)
+                resync = True
+            finally:
+                try:
+                    raw.close()
+                except errors:
+                    pass
+
+    def _listen(self, raw) -> None:
+        window = settings.CHANGE_FEED_COALESCE_SECONDS
+        pending = _Coalescer()
+        deadline = None
+        while not self._stopping.is_set():
+            timeout = 1.0 if deadline is None else max(0.0, deadline - time.monotonic())
+            if select.select([raw], [], [], timeout)[0]:
+                raw.poll()
+                while raw.notifies:
+                    event = parse_payload(raw.notifies.pop(0).payload)
+                    if event is not None:
+                        pending.add(event)
+                if pending and deadline is None:
+                    deadline = time.monotonic() + window
+            if deadline is not None and time.monotonic() >= deadline:
+                self._publish(pending)
+                pending, deadline = _Coalescer(), None
+
+
+_feed: ChangeFeed | None = None
+_feed_lock = threading.Lock()
+
+
+def change_feed() -> ChangeFeed:
+    """The process's feed, started on first use when ``CHANGE_FEED_ENABLED``."""
+
+    global _feed
+
+    with _feed_lock:
+        if _feed is None:
+            _feed = ChangeFeed()
+        if settings.CHANGE_FEED_ENABLED and not _feed.running:
+            _feed.start()
+        return _feed
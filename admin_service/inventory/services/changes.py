@@ -0,0 +1,86 @@
+"""Table versions from ``table_change_counters`` and ``table_change_log``.
+
+Statement-level triggers on the tracked tables (migrations 0012 and 0018)
+append one ``table_change_log`` row per writing statement, from Django or
+PHP, stamped as its transaction commits.  A table's version is its compacted
+counter plus its log rows, so "has anything this response depends on
+changed?" is two index lookups instead of a scan of the data itself, and
+writers never wait on a shared counter row.  :func:`compact_change_log`,
+run by the recurring ``compact_table_changes`` job, keeps the log short.
+"""
+from __future__ import annotations
+
+import datetime
+import hashlib
+from dataclasses import dataclass
+from typing import Iterable
+
+from django.db import connection, transaction
+
+_VERSIONS_SQL = """
+    SELECT t.table_name,
+           COALESCE(c.version, 0) + l.changes,
+           GREATEST(c.changed_at, l.changed_at)
+    FROM unnest(%s::text[]) AS t(table_name)
+    LEFT JOIN table_change_counters c ON c.table_name = t.table_name
+    CROSS JOIN LATERAL (
+        SELECT COUNT(*) AS changes, MAX(changed_at) AS changed_at
+        FROM table_change_log
+        WHERE table_name = t.table_name
+    ) AS l
+"""
+
+# Committed log rows only: a running transaction's rows are invisible here
+# and are folded by a later run.  GREATEST keeps changed_at from moving back.
+_COMPACT_SQL = """
+    WITH folded AS (
+        DELETE FROM table_change_log RETURNING table_name, changed_at
+    )
+    INSERT INTO table_change_counters (table_name, version, changed_at)
+    SELECT table_name, COUNT(*), MAX(changed_at)
+    FROM folded
+    GROUP BY table_name
+    ON CONFLICT (table_name) DO UPDATE SET
+        version = table_change_counters.version + EXCLUDED.version,
+        changed_at = GREATEST(table_change_counters.changed_at, EXCLUDED.changed_at)
+"""
+
+
+@dataclass(frozen=True)
+class TableVersions:
+    versions: dict[str, int]
+    changed_at: datetime.datetime | None
+
+    def token(self, *extra: str) -> str:
+        """Stable digest of the versions plus any caller-supplied context."""
+
+        parts = [f"{table}:{version}" for table, version in sorted(self.versions.items())]
+        return hashlib.sha1("|".join([*parts, *extra]).encode()).hexdigest()[:20]
+
+
+def table_versions(tables: Iterable[str]) -> TableVersions:
+    """Current version of each table; untracked tables report version 0."""
+
+    tables = sorted(set(tables))
+    with connection.cursor() as cursor:
+        cursor.execute(_VERSIONS_SQL, [tables])
+        rows = cursor.fetchall()
+    versions = dict.fromkeys(tables, 0)
+    changed_at = None
+    for table, version, changed in rows:
+        versions[table] = version
+        if changed is not None:
+            changed_at = changed if changed_at is None else max(changed_at, changed)
+    return TableVersions(versions, changed_at)
+
+
+def compact_change_log() -> int:
+    """Fold committed ``table_change_log`` rows into the counters; returns the tables updated.
+
+    Versions read before and after are equal, since the delete and the
+    counter update commit together.
+    """
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(_COMPACT_SQL)
+        return cursor.rowcount
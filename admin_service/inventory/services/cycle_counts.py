@@ -0,0 +1,116 @@
+"""Batch posting of completed cycle count sessions."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from django.db import connection, transaction
+
+from .. import models
+from .ledger import (
+    LedgerError,
+    LedgerLine,
+    apply_primary_location_deltas,
+    lock_inventory_items,
+    lock_item_locations,
+    post_transaction,
+)
+
+
+class CycleCountPostingError(LedgerError):
+    """Raised when a session cannot be posted."""
+
+
+@dataclass(frozen=True)
+class CycleCountPostingResult:
+    session_id: int
+    inventory_transaction_id: int | None
+    adjusted_items: int
+    skipped_lines: int
+    net_variance: int
+
+
+def post_cycle_count_session(session_id: int) -> CycleCountPostingResult:
+    """Close a session and post its variances as one inventory transaction.
+
+    Counted lines whose variance has not been recorded yet adjust stock by
+    ``counted_qty - expected_qty`` so movements made while the count was in
+    progress are preserved.  Lines counted through the PHP workspace already
+    carry a variance (``recordCycleCount`` adjusts stock immediately) and are
+    not posted twice.  Lines that were never counted are closed as skipped
+    with zero variance, matching ``completeCycleCountSession``.
+    """
+
+    with transaction.atomic():
+        try:
+            session = models.CycleCountSession.objects.select_for_update().get(pk=session_id)
+        except models.CycleCountSession.DoesNotExist as exc:
+            raise CycleCountPostingError(f"Cycle count session {session_id} not found.") from exc
+
+        if session.status == "completed":
+            raise CycleCountPostingError(f"Cycle count session {session.name} is already completed.")
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT inventory_item_id, SUM(counted_qty - expected_qty) AS variance
+                FROM cycle_count_lines
+                WHERE session_id = %s AND counted_qty IS NOT NULL AND variance IS NULL
+                GROUP BY inventory_item_id
+                HAVING SUM(counted_qty - expected_qty) <> 0
+                ORDER BY inventory_item_id
+                """,
+                [session.pk],
+            )
+            variances = {int(item_id): int(variance) for item_id, variance in cursor.fetchall()}
+
+        locked_stock = lock_inventory_items(variances)
+        lock_item_locations(variances)
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                WITH updated AS (
+                    UPDATE cycle_count_lines
+                    SET variance = COALESCE(counted_qty - expected_qty, 0),
+                        is_skipped = (counted_qty IS NULL),
+                        counted_qty = COALESCE(counted_qty, expected_qty),
+                        counted_at = COALESCE(counted_at, CURRENT_TIMESTAMP)
+                    WHERE session_id = %s AND variance IS NULL
+                    RETURNING is_skipped
+                )
+                SELECT COUNT(*) FILTER (WHERE is_skipped) FROM updated
+                """,
+                [session.pk],
+            )
+            skipped_lines = int(cursor.fetchone()[0])
+
+        header = post_transaction(
+            session.name,
+            (
+                LedgerLine(item_id, variance, note="Cycle count variance")
+                for item_id, variance in variances.items()
+            ),
+            notes=f"Cycle count session #{session.pk}",
+            locked_stock=locked_stock,
+        )
+        apply_primary_location_deltas(variances)
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                UPDATE cycle_count_sessions
+                SET status = 'completed',
+                    completed_lines = total_lines,
+                    completed_at = COALESCE(completed_at, CURRENT_TIMESTAMP)
+                WHERE id = %s
+                """,
+                [session.pk],
+            )
+
+    return CycleCountPostingResult(
+        session_id=session.pk,
+        inventory_transaction_id=header.pk if header else None,
+        adjusted_items=len(variances),
+        skipped_lines=skipped_lines,
+        net_variance=sum(variances.values()),
+    )
@@ -0,0 +1,303 @@
+"""Computed dashboard metrics for ``inventory_metrics``.
+
+The PHP dashboard (``loadMetrics``) renders whatever is in
+``inventory_metrics``.  Labels registered here with :func:`dashboard_metric`
+are computed instead of hand-edited: :func:`refresh_metrics` loads every
+figure they need in a single summary query, records this period's value in
+``inventory_metric_snapshots`` and rewrites value, delta and timeframe, with
+the delta taken against the last value recorded in the previous period.
+Labels that are not registered are left alone.
+"""
+from __future__ import annotations
+
+import datetime
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Callable
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .receiving import OPEN_STATUSES
+
+COUNT_ACCURACY_WINDOW_DAYS = 30
+
+PERIOD_NAMES = {"day": "yesterday", "week": "last week", "month": "last month", "quarter": "last quarter"}
+
+_SUMMARY_SQL = """
+    WITH latest_cost AS (
+        SELECT DISTINCT ON (inventory_item_id) inventory_item_id, unit_cost
+        FROM purchase_order_lines
+        WHERE inventory_item_id IS NOT NULL
+        ORDER BY inventory_item_id, created_at DESC, id DESC
+    ),
+    items AS (
+        SELECT
+            COUNT(*) AS skus,
+            COALESCE(SUM(i.stock), 0) AS units_on_hand,
+            COUNT(*) FILTER (WHERE i.stock < i.committed_qty + i.reorder_point) AS below_reorder,
+            COUNT(*) FILTER (WHERE i.stock <= i.committed_qty) AS critical,
+            COALESCE(SUM(i.stock * c.unit_cost), 0) AS stock_value
+        FROM inventory_items i
+        LEFT JOIN latest_cost c ON c.inventory_item_id = i.id
+        WHERE lower(i.status) <> 'discontinued'
+    )
+    SELECT
+        items.skus,
+        items.units_on_hand,
+        items.below_reorder,
+        items.critical,
+        items.stock_value,
+        (
+            SELECT COALESCE(SUM(GREATEST(
+                pol.quantity_ordered - pol.quantity_received - COALESCE(pol.quantity_cancelled, 0), 0
+            ) * pol.unit_cost), 0)
+            FROM purchase_order_lines pol
+            JOIN purchase_orders po ON po.id = pol.purchase_order_id
+            WHERE po.status = ANY(%(open_statuses)s)
+        ) AS open_po_value,
+        (
+            SELECT COUNT(*)
+            FROM maintenance_tasks
+            WHERE status = 'active' AND next_due_date < %(today)s
+        ) AS overdue_maintenance,
+        (
+            SELECT AVG(CASE WHEN counted_qty = expected_qty THEN 1.0 ELSE 0.0 END)
+            FROM cycle_count_lines
+            WHERE counted_at >= %(count_since)s AND counted_qty IS NOT NULL AND NOT is_skipped
+        ) AS count_accuracy,
+        (
+            SELECT SUM(on_time_rate * sample_count) / NULLIF(SUM(sample_count), 0)
+            FROM supplier_lead_time_stats
+            WHERE inventory_item_id IS NULL AND on_time_rate IS NOT NULL
+        ) AS supplier_on_time
+    FROM items
+"""
+
+
+@dataclass(frozen=True)
+class DashboardMetric:
+    label: str
+    compute: Callable[[dict], Decimal | int | None]
+    kind: str
+    timeframe: str
+    period: str
+    sort_order: int
+    accent: Callable[[Decimal], bool] | None = None
+
+    def format_value(self, value: Decimal | None) -> str:
+        if value is None:
+            return "-"
+        if self.kind == "money":
+            return f"${value:,.0f}"
+        if self.kind == "percent":
+            return f"{value * 100:.0f}%"
+        return f"{value:.0f}"
+
+    def format_delta(self, value: Decimal | None, previous: Decimal | None) -> str | None:
+        if value is None or previous is None:
+            return None
+        change = value - previous
+        if self.kind == "money":
+            amount = f"{'-' if change < 0 else '+'}${abs(change):,.0f}"
+        elif self.kind == "percent":
+            amount = f"{change * 100:+.0f} pts"
+        else:
+            amount = f"{change:+.0f}"
+        return f"{amount} vs. {PERIOD_NAMES[self.period]}"
+
+
+_metrics: dict[str, DashboardMetric] = {}
+
+
+def dashboard_metric(
+    label: str,
+    *,
+    timeframe: str,
+    period: str,
+    sort_order: int,
+    kind: str = "count",
+    accent: Callable[[Decimal], bool] | None = None,
+):
+    """Register ``func(summary) -> value`` as the computation behind ``label``."""
+
+    if period not in PERIOD_NAMES:
+        raise ValueError(f"Unknown metric period: {period}")
+
+    def decorator(func):
+        _metrics[label] = DashboardMetric(label, func, kind, timeframe, period, sort_order, accent)
+        return func
+
+    return decorator
+
+
+def computed_labels() -> set[str]:
+    return set(_metrics)
+
+
+def period_start(period: str, today: datetime.date) -> datetime.date:
+    if period == "week":
+        return today - datetime.timedelta(days=today.weekday())
+    if period == "month":
+        return today.replace(day=1)
+    if period == "quarter":
+        return today.replace(month=(today.month - 1) // 3 * 3 + 1, day=1)
+    return today
+
+
+def load_summary(today: datetime.date) -> dict:
+    """Every figure the registered metrics read, in one round trip."""
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            _SUMMARY_SQL,
+            {
+                "open_statuses": list(OPEN_STATUSES),
+                "today": today,
+                "count_since": today - datetime.timedelta(days=COUNT_ACCURACY_WINDOW_DAYS),
+            },
+        )
+        columns = [column[0] for column in cursor.description]
+        return dict(zip(columns, cursor.fetchone()))
+
+
+def refresh_metrics(today: datetime.date | None = None) -> int:
+    """Recompute every registered metric; returns how many rows were written."""
+
+    today = today or timezone.localdate()
+    summary = load_summary(today)
+    metrics = sorted(_metrics.values(), key=lambda metric: metric.sort_order)
+    values = [metric.compute(summary) for metric in metrics]
+    values = [None if value is None else Decimal(value) for value in values]
+    labels = [metric.label for metric in metrics]
+    starts = [period_start(metric.period, today) for metric in metrics]
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            """
+            INSERT INTO inventory_metric_snapshots (label, period_start, value, computed_at)
+            SELECT label, period_start, value, NOW()
+            FROM unnest(%s::text[], %s::date[], %s::numeric[]) AS v(label, period_start, value)
+            ON CONFLICT (label, period_start) DO UPDATE SET
+                value = EXCLUDED.value,
+                computed_at = EXCLUDED.computed_at
+            """,
+            [labels, starts, values],
+        )
+        cursor.execute(
+            """
+            SELECT DISTINCT ON (s.label) s.label, s.value
+            FROM inventory_metric_snapshots s
+            JOIN unnest(%s::text[], %s::date[]) AS v(label, period_start)
+                ON s.label = v.label AND s.period_start < v.period_start
+            ORDER BY s.label, s.period_start DESC
+            """,
+            [labels, starts],
+        )
+        previous = dict(cursor.fetchall())
+
+        rows = [
+            (
+                metric.label,
+                metric.format_value(value),
+                metric.format_delta(value, previous.get(metric.label)),
+                metric.timeframe,
+                None if metric.accent is None or value is None else metric.accent(value),
+                metric.sort_order,
+            )
+            for metric, value in zip(metrics, values)
+        ]
+        label_col, value_col, delta_col, timeframe_col, accent_col, sort_col = map(list, zip(*rows))
+        # New labels take the registered sort order; existing rows keep any
+        # hand-set order and, for metrics without an accent rule, accent.
+        cursor.execute(
+            """
+            INSERT INTO inventory_metrics (label, value, timeframe, sort_order)
+            SELECT label, '-', timeframe, sort_order
+            FROM unnest(%s::text[], %s::text[], %s::integer[]) AS v(label, timeframe, sort_order)
+            ON CONFLICT (label) DO NOTHING
+            """,
+            [label_col, timeframe_col, sort_col],
+        )
+        cursor.execute(
+            """
+            UPDATE inventory_metrics AS m
+            SET value = v.value,
+                delta = v.delta,
+                timeframe = v.timeframe,
+                accent = COALESCE(v.accent, m.accent)
+            FROM unnest(%s::text[], %s::text[], %s::text[], %s::text[], %s::boolean[])
+                AS v(label, value, delta, timeframe, accent)
+            WHERE m.label = v.label
+            """,
+            [label_col, value_col, delta_col, timeframe_col, accent_col],
+        )
+    return len(rows)
+
+
+@dashboard_metric("SKUs Tracked", timeframe="Quarter to date", period="quarter", sort_order=10)
+def _skus_tracked(summary: dict):
+    return summary["skus"]
+
+
+@dashboard_metric("Units on Hand", timeframe="Weekly", period="week", sort_order=20)
+def _units_on_hand(summary: dict):
+    return summary["units_on_hand"]
+
+
+@dashboard_metric(
+    "Critical Items", timeframe="Daily", period="day", sort_order=30, accent=lambda value: value > 0
+)
+def _critical_items(summary: dict):
+    # Nothing left to pick once open reservations are honoured.
+    return summary["critical"]
+
+
+@dashboard_metric(
+    "Supplier OTIF",
+    kind="percent",
+    timeframe="Monthly",
+    period="month",
+    sort_order=40,
+    accent=lambda value: value < Decimal("0.9"),
+)
+def _supplier_on_time(summary: dict):
+    # Receipts are not tracked against ordered quantity per delivery, so this
+    # is the on-time share of receipts weighted by each supplier's sample count.
+    return summary["supplier_on_time"]
+
+
+@dashboard_metric(
+    "Below Reorder Point", timeframe="Daily", period="day", sort_order=50, accent=lambda value: value > 0
+)
+def _below_reorder_point(summary: dict):
+    return summary["below_reorder"]
+
+
+@dashboard_metric("Stock Value", kind="money", timeframe="Monthly", period="month", sort_order=60)
+def _stock_value(summary: dict):
+    return summary["stock_value"]
+
+
+@dashboard_metric("Open PO Value", kind="money", timeframe="Weekly", period="week", sort_order=70)
+def _open_po_value(summary: dict):
+    return summary["open_po_value"]
+
+
+@dashboard_metric(
+    "Overdue Maintenance", timeframe="Daily", period="day", sort_order=80, accent=lambda value: value > 0
+)
+def _overdue_maintenance(summary: dict):
+    return summary["overdue_maintenance"]
+
+
+@dashboard_metric(
+    "Count Accuracy",
+    kind="percent",
+    timeframe=f"Last {COUNT_ACCURACY_WINDOW_DAYS} days",
+    period="month",
+    sort_order=90,
+    accent=lambda value: value < Decimal("0.95"),
+)
+def _count_accuracy(summary: dict):
+    return summary["count_accuracy"]
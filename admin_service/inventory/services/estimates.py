@@ -0,0 +1,379 @@
+"""Estimate-versus-inventory analysis, ported from ``analyzeEstimateRequirements``.
+
+Workbook rows are streamed sheet by sheet (Accessories, Stock Lengths, then
+Special Length, as in PHP) and folded into one requirement per part number
+and finish.  Every requirement is then resolved in a single statement: exact
+SKU, then part number plus finish, then a trigram match on the part number
+for rows nothing else matched.  The same statement sums outstanding
+quantities on open purchase order lines, so shortfalls are reported both
+against available stock and after incoming stock.
+"""
+from __future__ import annotations
+
+import re
+import time
+from dataclasses import dataclass, field
+from decimal import ROUND_HALF_UP, Decimal
+from typing import IO, Iterable, Iterator
+
+from django.db import connection, transaction
+
+from . import xlsx
+from .receiving import OPEN_STATUSES
+from .skus import compose_sku, normalize_finish, variant_index
+
+FUZZY_THRESHOLD = 0.5
+HEADER_SCAN_ROWS = 60
+EMPTY_ROWS_TO_STOP = 6
+# Largest quantity a row may ask for (the integer stock columns' limit).
+MAX_QUANTITY = 2**31 - 1
+
+SHEET_GROUPS = (
+    re.compile(r"^accessories(\b|\s|\(|-|$)"),
+    re.compile(r"^stock lengths(\b|\s|\(|-|$)"),
+    re.compile(r"^special length(\b|\s|\(|-|$)"),
+)
+DEFAULT_SHEETS = (
+    "Accessories",
+    "Accessories (2)",
+    "Accessories (3)",
+    "Stock Lengths",
+    "Stock Lengths (2)",
+    "Stock Lengths (3)",
+    "Special Length",
+)
+STATUS_ORDER = {"missing": 0, "short": 1, "on_order": 2, "available": 3}
+
+_NUMBER_RE = re.compile(r"^[+-]?(\d+(\.\d*)?|\.\d+)([eE][+-]?\d+)?")
+
+_RESOLVE_SQL = """
+    SELECT
+        v.ord,
+        i.id,
+        i.sku,
+        i.stock - i.committed_qty AS available,
+        CASE
+            WHEN by_sku.id IS NOT NULL THEN 'sku'
+            WHEN by_part.id IS NOT NULL THEN 'part'
+            WHEN fuzzy.id IS NOT NULL THEN 'fuzzy'
+        END AS match,
+        fuzzy.score,
+        COALESCE(incoming.outstanding, 0) AS on_order,
+        incoming.next_expected
+    FROM unnest(%(parts)s::text[], %(finishes)s::text[], %(skus)s::text[])
+        WITH ORDINALITY AS v(part, finish, sku, ord)
+    LEFT JOIN LATERAL (
+        SELECT id FROM inventory_items WHERE lower(sku) = v.sku ORDER BY id LIMIT 1
+    ) AS by_sku ON TRUE
+    LEFT JOIN LATERAL (
+        SELECT id
+        FROM inventory_items
+        WHERE by_sku.id IS NULL
+          AND upper(part_number) = v.part
+          AND finish IS NOT DISTINCT FROM v.finish
+        ORDER BY id
+        LIMIT 1
+    ) AS by_part ON TRUE
+    LEFT JOIN LATERAL (
+        SELECT id, similarity(upper(part_number), v.part) AS score
+        FROM inventory_items
+        WHERE by_sku.id IS NULL AND by_part.id IS NULL
+          AND upper(part_number) %% v.part
+          AND finish IS NOT DISTINCT FROM v.finish
+        ORDER BY score DESC, id
+        LIMIT 1
+    ) AS fuzzy ON TRUE
+    LEFT JOIN inventory_items i ON i.id = COALESCE(by_sku.id, by_part.id, fuzzy.id)
+    LEFT JOIN LATERAL (
+        SELECT
+            SUM(GREATEST(pol.quantity_ordered - pol.quantity_received - COALESCE(pol.quantity_cancelled, 0), 0))
+                AS outstanding,
+            MIN(COALESCE(pol.expected_date, po.expected_date)) AS next_expected
+        FROM purchase_order_lines pol
+        JOIN purchase_orders po ON po.id = pol.purchase_order_id
+        WHERE pol.inventory_item_id = i.id AND po.status = ANY(%(open_statuses)s)
+    ) AS incoming ON TRUE
+"""
+
+
+class EstimateAnalysisError(ValueError):
+    """Raised when an estimate workbook cannot be analysed at all."""
+
+
+@dataclass
+class EstimateLine:
+    part_number: str
+    finish: str | None
+    required: int
+    status: str = "missing"
+    sku: str | None = None
+    inventory_item_id: int | None = None
+    match: str | None = None
+    similarity: float | None = None
+    available: int | None = None
+    on_order: Decimal = Decimal("0")
+    next_expected: object = None
+    shortfall: int = 0
+    uncovered: Decimal = Decimal("0")
+    other_finishes: tuple[str, ...] = ()
+
+
+@dataclass
+class EstimateAnalysis:
+    lines: list[EstimateLine] = field(default_factory=list)
+    messages: list[tuple[str, str]] = field(default_factory=list)
+    counts: dict[str, int] = field(default_factory=dict)
+    log: list[tuple[float, str]] = field(default_factory=list)
+
+
+class _Log:
+    def __init__(self, entries: list[tuple[float, str]]) -> None:
+        self.entries = entries
+        self.started = time.perf_counter()
+
+    def __call__(self, message: str) -> None:
+        self.entries.append((time.perf_counter() - self.started, message))
+
+
+def sheet_order(available: Iterable[str]) -> list[str]:
+    """Accessories, stock length and special length sheets, in that order."""
+
+    groups: list[list[str]] = [[] for _ in SHEET_GROUPS]
+    for name in available:
+        normalized = name.strip().lower()
+        for index, pattern in enumerate(SHEET_GROUPS):
+            if pattern.match(normalized):
+                groups[index].append(name)
+                break
+    return list(dict.fromkeys(name for group in groups for name in group))
+
+
+def _header_index(cells: list[str], candidates: tuple[str, ...]) -> int | None:
+    for index, value in enumerate(cells):
+        normalized = " ".join(value.strip().lower().split())
+        for candidate in candidates:
+            if normalized == candidate:
+                return index
+            if candidate == "part" and "part" in normalized:
+                return index
+            if candidate == "qty" and ("qty" in normalized or "quantity" in normalized):
+                return index
+            if candidate in ("finish", "color") and candidate in normalized:
+                return index
+    return None
+
+
+def find_columns(cells: list[str]) -> tuple[int, int, int | None] | None:
+    """``(qty, part, finish)`` column indexes if ``cells`` is a header row."""
+
+    if sum(1 for value in cells if value.strip()) < 2:
+        return None
+    qty = _header_index(cells, ("qty", "quantity"))
+    part = _header_index(cells, ("part #", "part#", "part no", "part", "item"))
+    if qty is None or part is None or qty == part:
+        return None
+    return qty, part, _header_index(cells, ("finish", "color"))
+
+
+def parse_quantity(raw: str) -> int | None:
+    """PHP ``(float)`` semantics on the cleaned cell, rounded half up; ``None`` if not positive.
+
+    Raises ``ValueError`` above ``MAX_QUANTITY``.
+    """
+
+    match = _NUMBER_RE.match(raw.replace(",", "").replace(" ", ""))
+    if not match:
+        return None
+    value = Decimal(match.group(0))
+    if not value.is_finite() or value <= 0:
+        return None
+    if value > MAX_QUANTITY:
+        raise ValueError(f'quantity "{raw}" is too large')
+    quantity = int(value.quantize(Decimal("1"), rounding=ROUND_HALF_UP))
+    return quantity or None
+
+
+def _cell(row: list[str], index: int | None) -> str:
+    return row[index].strip() if index is not None and index < len(row) else ""
+
+
+def iter_sheet_requirements(
+    rows: Iterator[tuple[int, list[str]]], sheet: str, analysis: EstimateAnalysis, log: _Log
+) -> Iterator[tuple[str, str | None, int]]:
+    """Yield ``(part_number, finish, quantity)`` for each data row of one sheet."""
+
+    columns = None
+    for number, row in rows:
+        if number > HEADER_SCAN_ROWS:
+            break
+        columns = find_columns(row)
+        if columns is not None:
+            log(f'Headers located on row {number} (qty={columns[0]}, part={columns[1]}, finish={columns[2]}).')
+            break
+    if columns is None:
+        analysis.messages.append(
+            ("warning", f"Sheet {sheet}: no headers (qty/part) detected in top {HEADER_SCAN_ROWS} rows.")
+        )
+        return
+
+    qty_col, part_col, finish_col = columns
+    previous = number
+    empty_streak = 0
+    for number, row in rows:
+        # Rows absent from the sheet XML are empty rows.
+        empty_streak += number - previous - 1
+        previous = number
+        if empty_streak >= EMPTY_ROWS_TO_STOP:
+            break
+        qty_raw, part_raw, finish_raw = _cell(row, qty_col), _cell(row, part_col), _cell(row, finish_col)
+        if not (qty_raw or part_raw or finish_raw):
+            empty_streak += 1
+            if empty_streak >= EMPTY_ROWS_TO_STOP:
+                break
+            continue
+        empty_streak = 0
+
+        if not part_raw:
+            analysis.messages.append(("warning", f"Sheet {sheet} row {number} skipped: part number missing."))
+            continue
+        try:
+            quantity = parse_quantity(qty_raw)
+        except ValueError as exc:
+            analysis.messages.append(("warning", f"Sheet {sheet} row {number} skipped: {exc}."))
+            continue
+        if quantity is None:
+            continue
+        finish = normalize_finish(finish_raw) if finish_raw else None
+        if finish_raw and finish is None:
+            analysis.messages.append(
+                (
+                    "warning",
+                    f'Sheet {sheet} row {number} has unrecognised finish "{finish_raw}"; treated as unspecified.',
+                )
+            )
+        yield part_raw.upper(), finish, quantity
+
+
+def read_requirements(
+    source: str | IO[bytes], analysis: EstimateAnalysis, log: _Log
+) -> dict[tuple[str, str | None], int]:
+    archive = xlsx.open_workbook(source)
+    with archive:
+        sheets = sheet_order(xlsx.list_sheets(archive))
+        if not sheets:
+            sheets = list(DEFAULT_SHEETS)
+            log("Falling back to default sheet list: " + ", ".join(sheets))
+        shared = xlsx.shared_strings(archive)
+
+        requirements: dict[tuple[str, str | None], int] = {}
+        for sheet in sheets:
+            try:
+                rows = xlsx.iter_rows(archive, sheet, shared)
+                line_count = 0
+                for part, finish, quantity in iter_sheet_requirements(rows, sheet, analysis, log):
+                    requirements[part, finish] = requirements.get((part, finish), 0) + quantity
+                    line_count += 1
+            except xlsx.XlsxError as exc:
+                analysis.messages.append(("warning", f"Sheet {sheet} not found or unreadable."))
+                log(f'Failed to read sheet "{sheet}": {exc}')
+                continue
+            log(f'Sheet "{sheet}" contributed {line_count} line items.')
+    return requirements
+
+
+def resolve(requirements: dict[tuple[str, str | None], int], log: _Log | None = None) -> list[EstimateLine]:
+    """Match requirements to inventory and incoming stock in one statement."""
+
+    keys = list(requirements)
+    lines = [EstimateLine(part, finish, requirements[part, finish]) for part, finish in keys]
+    if not keys:
+        return lines
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute("SELECT set_config('pg_trgm.similarity_threshold', %s, true)", [str(FUZZY_THRESHOLD)])
+        cursor.execute(
+            _RESOLVE_SQL,
+            {
+                "parts": [part for part, _ in keys],
+                "finishes": [finish for _, finish in keys],
+                "skus": [compose_sku(part, finish).lower() for part, finish in keys],
+                "open_statuses": list(OPEN_STATUSES),
+            },
+        )
+        rows = cursor.fetchall()
+    if log is not None:
+        log(f"Resolved {len(keys)} unique requirements against inventory.")
+
+    for ordinal, item_id, sku, available, match, score, on_order, next_expected in rows:
+        line = lines[ordinal - 1]
+        if item_id is None:
+            continue
+        line.inventory_item_id, line.sku, line.match = item_id, sku, match
+        line.similarity = float(score) if score is not None else None
+        line.available, line.on_order, line.next_expected = available, on_order, next_expected
+
+    _allocate(lines)
+
+    # Parts stocked only in another finish are still missing, but say which.
+    index = variant_index()
+    for line in lines:
+        if line.inventory_item_id is None:
+            line.other_finishes = tuple(variant.finish or "-" for variant in index.variants(line.part_number))
+    return lines
+
+
+def _allocate(lines: list[EstimateLine]) -> None:
+    """Set shortfalls, drawing down each item's stock and incoming quantity once."""
+
+    remaining: dict[int, list] = {}
+    for line in sorted(lines, key=lambda line: (line.part_number, line.finish or "")):
+        if line.inventory_item_id is None:
+            line.status, line.shortfall, line.uncovered = "missing", line.required, Decimal(line.required)
+            continue
+        stock, incoming = remaining.setdefault(line.inventory_item_id, [max(0, line.available), line.on_order])
+        from_stock = min(stock, line.required)
+        line.shortfall = line.required - from_stock
+        from_incoming = min(incoming, Decimal(line.shortfall))
+        line.uncovered = Decimal(line.shortfall) - from_incoming
+        remaining[line.inventory_item_id] = [stock - from_stock, incoming - from_incoming]
+        if line.shortfall == 0:
+            line.status = "available"
+        elif line.uncovered == 0:
+            line.status = "on_order"
+        else:
+            line.status = "short"
+
+
+def analyze_estimate(source: str | IO[bytes]) -> EstimateAnalysis:
+    """Analyse an estimate workbook given as a path or a binary file object."""
+
+    analysis = EstimateAnalysis()
+    log = _Log(analysis.log)
+    try:
+        requirements = read_requirements(source, analysis, log)
+    except xlsx.XlsxError as exc:
+        raise EstimateAnalysisError(str(exc)) from exc
+
+    analysis.lines = resolve(requirements, log)
+    analysis.lines.sort(key=lambda line: (STATUS_ORDER[line.status], line.part_number))
+    analysis.counts = {"total": len(analysis.lines), **{status: 0 for status in STATUS_ORDER}}
+    for line in analysis.lines:
+        analysis.counts[line.status] += 1
+    fuzzy = sum(1 for line in analysis.lines if line.match == "fuzzy")
+    if fuzzy:
+        analysis.messages.append(("warning", f"{fuzzy} part numbers matched approximately; check the suggested SKUs."))
+    other_finish = sum(1 for line in analysis.lines if line.other_finishes)
+    if other_finish:
+        analysis.messages.append(
+            ("info", f"{other_finish} missing parts are stocked in a different finish; see the SKU column.")
+        )
+    if not analysis.lines:
+        analysis.messages.append(
+            (
+                "error",
+                'No line items detected. Check that the sheet contains headers like "Qty", "Part #", '
+                "and rows beneath them.",
+            )
+        )
+    log("Analysis complete. " + ", ".join(f"{key}={value}" for key, value in analysis.counts.items()) + ".")
+    return analysis
@@ -0,0 +1,211 @@
+"""Database-backed job queue for admin work too slow for a request.
+
+Jobs live in ``admin_jobs``.  Workers claim them with ``FOR UPDATE SKIP
+LOCKED`` so any number of ``run_jobs`` processes can share the table without
+an external broker.  Handlers are plain functions registered with
+:func:`job`; they receive the JSON payload and a :class:`JobContext` for
+progress reporting, and whatever JSON-serialisable value they return is
+stored as the job result.
+"""
+from __future__ import annotations
+
+import datetime
+import logging
+import time
+import traceback
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable
+
+from django.db import connection
+from django.utils import timezone
+
+from .. import models
+
+logger = logging.getLogger(__name__)
+
+RETRY_BASE_SECONDS = 30
+PROGRESS_INTERVAL_SECONDS = 1.0
+
+_handlers: dict[str, Callable[[dict, "JobContext"], Any]] = {}
+
+
+class JobError(RuntimeError):
+    """Raised for unknown job kinds or invalid queue operations."""
+
+
+def job(kind: str):
+    """Register ``func(payload, context)`` as the handler for ``kind``."""
+
+    def decorator(func):
+        _handlers[kind] = func
+        return func
+
+    return decorator
+
+
+def registered_kinds() -> list[str]:
+    return sorted(_handlers)
+
+
+def enqueue(
+    kind: str,
+    payload: dict | None = None,
+    *,
+    requested_by: str | None = None,
+    max_attempts: int = 3,
+    run_after: datetime.datetime | None = None,
+) -> models.BackgroundJob:
+    if kind not in _handlers:
+        raise JobError(f"Unknown job kind: {kind}")
+
+    now = timezone.now()
+    return models.BackgroundJob.objects.create(
+        kind=kind,
+        payload=payload or {},
+        max_attempts=max_attempts,
+        run_after=run_after or now,
+        requested_by=requested_by,
+        created_at=now,
+    )
+
+
+@dataclass(frozen=True)
+class ClaimedJob:
+    id: int
+    kind: str
+    payload: dict
+    attempts: int
+    max_attempts: int
+    worker: str
+
+
+def claim(worker: str, limit: int = 1, kinds: Iterable[str] | None = None) -> list[ClaimedJob]:
+    """Atomically move up to ``limit`` due jobs to ``running`` for ``worker``."""
+
+    if limit <= 0:
+        return []
+
+    kinds = sorted(kinds) if kinds is not None else registered_kinds()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            UPDATE admin_jobs AS j
+            SET status = 'running',
+                attempts = j.attempts + 1,
+                locked_by = %s,
+                started_at = NOW(),
+                heartbeat_at = NOW(),
+                error = NULL
+            FROM (
+                SELECT id
+                FROM admin_jobs
+                WHERE status = 'queued' AND run_after <= NOW() AND kind = ANY(%s)
+                ORDER BY run_after, id
+                FOR UPDATE SKIP LOCKED
+                LIMIT %s
+            ) AS due
+            WHERE j.id = due.id
+            RETURNING j.id, j.kind, j.payload, j.attempts, j.max_attempts, j.locked_by
+            """,
+            [worker, kinds, limit],
+        )
+        rows = cursor.fetchall()
+    return [ClaimedJob(*row) for row in sorted(rows)]
+
+
+def heartbeat(job_ids: Iterable[int]) -> None:
+    ids = sorted(job_ids)
+    if ids:
+        models.BackgroundJob.objects.filter(pk__in=ids, status="running").update(heartbeat_at=timezone.now())
+
+
+def requeue_stale(timeout_seconds: int) -> int:
+    """Return jobs whose worker stopped heartbeating to the queue."""
+
+    cutoff = timezone.now() - datetime.timedelta(seconds=timeout_seconds)
+    return models.BackgroundJob.objects.filter(status="running", heartbeat_at__lt=cutoff).update(
+        status="queued", locked_by=None, run_after=timezone.now()
+    )
+
+
+class JobContext:
+    """Handed to handlers for progress reporting; writes are throttled."""
+
+    def __init__(self, job_id: int) -> None:
+        self.job_id = job_id
+        self._last_write = 0.0
+
+    def progress(
+        self,
+        current: int,
+        total: int | None = None,
+        message: str | None = None,
+        *,
+        force: bool = False,
+    ) -> None:
+        now = time.monotonic()
+        if not force and now - self._last_write < PROGRESS_INTERVAL_SECONDS:
+            return
+        self._last_write = now
+        models.BackgroundJob.objects.filter(pk=self.job_id).update(
+            progress_current=current,
+            progress_total=total,
+            progress_message=message,
+            heartbeat_at=timezone.now(),
+        )
+
+
+def execute(claimed: ClaimedJob) -> str:
+    """Run a claimed job to completion and record the outcome; returns the status."""
+
+    handler = _handlers.get(claimed.kind)
+    context = JobContext(claimed.id)
+    try:
+        if handler is None:
+            raise JobError(f"No handler registered for {claimed.kind}")
+        result = handler(claimed.payload, context)
+    except Exception as exc:  # noqa: BLE001 - any handler failure is recorded on the job
+        logger.exception("Job %s (%s) failed", claimed.id, claimed.kind)
+        return _fail(claimed, f"{exc}\n\n{traceback.format_exc()}")
+
+    # A job requeued as stale and claimed elsewhere is no longer ours to finish.
+    _owned(claimed).update(
+        status="succeeded",
+        result=result,
+        finished_at=timezone.now(),
+        locked_by=None,
+    )
+    return "succeeded"
+
+
+def _owned(claimed: ClaimedJob):
+    return models.BackgroundJob.objects.filter(pk=claimed.id, status="running", locked_by=claimed.worker)
+
+
+def _fail(claimed: ClaimedJob, error: str) -> str:
+    if claimed.attempts < claimed.max_attempts:
+        delay = RETRY_BASE_SECONDS * 2 ** (claimed.attempts - 1)
+        status = "queued"
+        changes = {"run_after": timezone.now() + datetime.timedelta(seconds=delay)}
+    else:
+        status = "failed"
+        changes = {"finished_at": timezone.now()}
+
+    _owned(claimed).update(status=status, error=error, locked_by=None, **changes)
+    return status
+
+
+def retry(job_ids: Iterable[int]) -> int:
+    """Queue failed or cancelled jobs again with a fresh attempt budget."""
+
+    return models.BackgroundJob.objects.filter(pk__in=list(job_ids), status__in=["failed", "cancelled"]).update(
+        status="queued", attempts=0, run_after=timezone.now(), finished_at=None
+    )
+
+
+def cancel(job_ids: Iterable[int]) -> int:
+    """Cancel jobs that have not started yet."""
+
+    return models.BackgroundJob.objects.filter(pk__in=list(job_ids), status="queued").update(
+        status="cancelled", finished_at=timezone.now()
+    )
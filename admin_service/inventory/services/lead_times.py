@@ -0,0 +1,170 @@
+"""Observed supplier lead times computed from purchase order receipt history."""
+from __future__ import annotations
+
+import datetime
+from decimal import Decimal
+from typing import Iterable
+
+import numpy as np
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .. import models
+from .jobs import enqueue
+
+# Receipts are folded in this long after they are posted: queued refreshes
+# wait this long so a burst shares one run, and the periodic scan re-reads
+# receipts this recent in case one committed after a higher id.
+SETTLE_SECONDS = 300
+
+_SAMPLES_SQL = """
+    SELECT
+        po.supplier_id,
+        pol.inventory_item_id,
+        GROUPING(pol.inventory_item_id) = 1 AS supplier_level,
+        array_agg(r.created_at::date - po.order_date) AS lead_days,
+        array_agg(r.created_at::date <= COALESCE(pol.expected_date, po.expected_date))
+            FILTER (WHERE COALESCE(pol.expected_date, po.expected_date) IS NOT NULL) AS on_time,
+        MAX(r.id) AS last_receipt_id
+    FROM purchase_order_receipt_lines rl
+    JOIN purchase_order_receipts r ON r.id = rl.receipt_id
+    JOIN purchase_order_lines pol ON pol.id = rl.purchase_order_line_id
+    JOIN purchase_orders po ON po.id = r.purchase_order_id
+    WHERE rl.quantity_received > 0
+      AND po.supplier_id IS NOT NULL
+      AND po.order_date IS NOT NULL
+      {supplier_filter}
+    GROUP BY GROUPING SETS ((po.supplier_id), (po.supplier_id, pol.inventory_item_id))
+"""
+
+
+def _decimal(value: float | None, places: str = "0.01") -> Decimal | None:
+    if value is None or np.isnan(value):
+        return None
+    return Decimal(str(value)).quantize(Decimal(places))
+
+
+def _summarise(supplier_id, item_id, lead_days, on_time, last_receipt_id, refreshed_at):
+    days = np.asarray(lead_days, dtype=float)
+    days = days[days >= 0]
+    if days.size:
+        mean = float(days.mean())
+        p50, p90 = (float(value) for value in np.percentile(days, [50, 90]))
+    else:
+        mean = p50 = p90 = None
+
+    flags = np.asarray(on_time or [], dtype=bool)
+    on_time_rate = float(flags.mean()) if flags.size else None
+
+    return models.SupplierLeadTimeStat(
+        supplier_id=supplier_id,
+        inventory_item_id=item_id,
+        sample_count=int(days.size),
+        mean_days=_decimal(mean),
+        p50_days=_decimal(p50),
+        p90_days=_decimal(p90),
+        on_time_rate=_decimal(on_time_rate, "0.0001"),
+        last_receipt_id=last_receipt_id,
+        refreshed_at=refreshed_at,
+    )
+
+
+def compute_lead_time_stats(supplier_ids: Iterable[int] | None = None) -> list[models.SupplierLeadTimeStat]:
+    """Compute supplier- and item-level distributions in one grouped pass."""
+
+    params: list = []
+    supplier_filter = ""
+    if supplier_ids is not None:
+        supplier_filter = "AND po.supplier_id = ANY(%s)"
+        params.append(sorted({int(value) for value in supplier_ids}))
+
+    with connection.cursor() as cursor:
+        cursor.execute(_SAMPLES_SQL.format(supplier_filter=supplier_filter), params)
+        rows = cursor.fetchall()
+
+    refreshed_at = timezone.now()
+    return [
+        _summarise(supplier_id, None if supplier_level else item_id, lead_days, on_time, last_receipt_id, refreshed_at)
+        for supplier_id, item_id, supplier_level, lead_days, on_time, last_receipt_id in rows
+        if supplier_level or item_id is not None
+    ]
+
+
+def _replace_stats(supplier_ids: list[int] | None) -> int:
+    with connection.cursor() as cursor:
+        # Serialises refreshes; only the job worker and management commands
+        # get here, never a request.
+        cursor.execute("LOCK TABLE supplier_lead_time_stats IN SHARE ROW EXCLUSIVE MODE")
+    stats = compute_lead_time_stats(supplier_ids)
+    existing = models.SupplierLeadTimeStat.objects.all()
+    if supplier_ids is not None:
+        existing = existing.filter(supplier_id__in=supplier_ids)
+    existing.delete()
+    models.SupplierLeadTimeStat.objects.bulk_create(stats)
+    return len({stat.supplier_id for stat in stats}) if supplier_ids is None else len(supplier_ids)
+
+
+def refresh_lead_time_stats(*, full: bool = False, supplier_ids: Iterable[int] | None = None) -> int:
+    """Recompute statistics for the given suppliers, or for those with new receipts.
+
+    Without ``supplier_ids`` this catches receipts posted by the PHP
+    application: suppliers with receipts past the watermark, or created in the
+    last ``SETTLE_SECONDS`` so one that committed after a higher id is not
+    skipped, are recomputed and the watermark moves to the highest id scanned.
+    Returns the number of suppliers refreshed.
+    """
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        if supplier_ids is not None:
+            return _replace_stats(sorted({int(value) for value in supplier_ids}))
+
+        cursor.execute("SELECT last_receipt_id FROM supplier_lead_time_watermark WHERE id = 1 FOR UPDATE")
+        row = cursor.fetchone()
+        watermark = row[0] if row else 0
+        cursor.execute("SELECT COALESCE(MAX(id), 0) FROM purchase_order_receipts")
+        ceiling = cursor.fetchone()[0]
+        if full:
+            refreshed = _replace_stats(None)
+        else:
+            cursor.execute(
+                """
+                SELECT DISTINCT po.supplier_id
+                FROM purchase_order_receipts r
+                JOIN purchase_orders po ON po.id = r.purchase_order_id
+                WHERE po.supplier_id IS NOT NULL
+                  AND r.id <= %s
+                  AND (r.id > %s OR r.created_at >= NOW() - make_interval(secs => %s))
+                """,
+                [ceiling, watermark, SETTLE_SECONDS],
+            )
+            supplier_ids = sorted(supplier_id for (supplier_id,) in cursor.fetchall())
+            refreshed = _replace_stats(supplier_ids) if supplier_ids else 0
+        cursor.execute(
+            """
+            INSERT INTO supplier_lead_time_watermark (id, last_receipt_id, refreshed_at)
+            VALUES (1, %s, NOW())
+            ON CONFLICT (id) DO UPDATE SET
+                last_receipt_id = GREATEST(supplier_lead_time_watermark.last_receipt_id, EXCLUDED.last_receipt_id),
+                refreshed_at = EXCLUDED.refreshed_at
+            """,
+            [ceiling],
+        )
+    return refreshed
+
+
+def schedule_lead_time_refresh(supplier_id: int | None) -> None:
+    """Queue a refresh of one supplier's statistics for the job worker.
+
+    Queued inside the caller's transaction, so the job only becomes visible
+    once the receipt has committed.  Receipts within ``SETTLE_SECONDS`` of a
+    queued refresh for the same supplier share it.
+    """
+
+    if supplier_id is None:
+        return
+    pending = models.BackgroundJob.objects.filter(
+        kind="refresh_lead_times", status="queued", payload__supplier_ids=[supplier_id]
+    )
+    if not pending.exists():
+        run_after = timezone.now() + datetime.timedelta(seconds=SETTLE_SECONDS)
+        enqueue("refresh_lead_times", {"supplier_ids": [supplier_id]}, requested_by="receipt", run_after=run_after)
@@ -0,0 +1,275 @@
+"""Set-based helpers for posting stock movements to the inventory ledger.
+
+The PHP ``recordInventoryTransaction`` locks, updates and inserts one row at a
+time.  These helpers keep the same rules (no negative stock, one
+``inventory_transactions`` header per posting, ``stock_before``/``stock_after``
+recorded per line) but issue a constant number of statements regardless of
+how many lines are posted.  Callers are expected to run inside
+``transaction.atomic()``.
+"""
+from __future__ import annotations
+
+import datetime
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Iterable
+
+from django.db import connection
+from django.utils import timezone
+
+from .. import models
+
+
+# Mirrors inventoryAverageDailyUseWindowDays().
+AVERAGE_DAILY_USE_WINDOW_DAYS = 30
+
+
+class LedgerError(ValueError):
+    """Raised when a posting would leave inventory in an invalid state."""
+
+
+@dataclass(frozen=True)
+class LedgerLine:
+    """A single quantity change destined for ``inventory_transaction_lines``."""
+
+    inventory_item_id: int
+    quantity_change: int
+    note: str | None = None
+
+
+def lock_inventory_items(item_ids: Iterable[int]) -> dict[int, int]:
+    """Lock the given inventory rows in id order and return their stock."""
+
+    ids = sorted({int(item_id) for item_id in item_ids})
+    if not ids:
+        return {}
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT id, stock FROM inventory_items WHERE id = ANY(%s) ORDER BY id FOR UPDATE",
+            [ids],
+        )
+        stock = {int(row[0]): int(row[1]) for row in cursor.fetchall()}
+
+    missing = set(ids) - stock.keys()
+    if missing:
+        raise LedgerError(f"Inventory items not found: {', '.join(map(str, sorted(missing)))}")
+    return stock
+
+
+def lock_item_locations(item_ids: Iterable[int]) -> None:
+    """Lock every bin assignment of the given items in id order."""
+
+    ids = sorted({int(item_id) for item_id in item_ids})
+    if not ids:
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT id FROM inventory_item_locations WHERE inventory_item_id = ANY(%s) ORDER BY id FOR UPDATE",
+            [ids],
+        )
+
+
+def post_transaction(
+    reference: str,
+    lines: Iterable[LedgerLine],
+    *,
+    notes: str | None = None,
+    locked_stock: dict[int, int] | None = None,
+    record_usage: bool = False,
+) -> models.InventoryTransaction | None:
+    """Write one transaction with all ``lines`` and apply the stock deltas.
+
+    ``locked_stock`` may be passed when the caller already holds the item
+    locks (see :func:`lock_inventory_items`); otherwise they are taken here.
+    Returns ``None`` when every line nets to zero.
+    """
+
+    pending = [line for line in lines if line.quantity_change != 0]
+    if not pending:
+        return None
+
+    if locked_stock is None:
+        locked_stock = lock_inventory_items(line.inventory_item_id for line in pending)
+
+    running = dict(locked_stock)
+    transaction_lines: list[models.InventoryTransactionLine] = []
+    deltas: dict[int, int] = defaultdict(int)
+
+    for line in pending:
+        item_id = int(line.inventory_item_id)
+        if item_id not in running:
+            raise LedgerError(f"Inventory item {item_id} was not locked for posting.")
+
+        stock_before = running[item_id]
+        stock_after = stock_before + int(line.quantity_change)
+        if stock_after < 0:
+            raise LedgerError(f"Transaction would reduce stock of item {item_id} below zero.")
+
+        running[item_id] = stock_after
+        deltas[item_id] += int(line.quantity_change)
+        transaction_lines.append(
+            models.InventoryTransactionLine(
+                inventory_item_id=item_id,
+                quantity_change=int(line.quantity_change),
+                note=line.note,
+                stock_before=stock_before,
+                stock_after=stock_after,
+            )
+        )
+
+    header = models.InventoryTransaction.objects.create(
+        reference=reference,
+        notes=notes,
+        created_at=timezone.now(),
+    )
+    for transaction_line in transaction_lines:
+        transaction_line.transaction = header
+    models.InventoryTransactionLine.objects.bulk_create(transaction_lines)
+
+    apply_stock_deltas(deltas)
+
+    if record_usage:
+        usage = {item_id: -delta for item_id, delta in deltas.items() if delta < 0}
+        record_daily_usage(timezone.localdate(header.created_at), usage)
+
+    return header
+
+
+def apply_stock_deltas(deltas: dict[int, int]) -> None:
+    """Add each delta to ``inventory_items.stock`` in a single statement."""
+
+    changes = [(item_id, delta) for item_id, delta in sorted(deltas.items()) if delta]
+    if not changes:
+        return
+
+    item_ids, amounts = zip(*changes)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            UPDATE inventory_items AS i
+            SET stock = i.stock + v.delta
+            FROM unnest(%s::integer[], %s::integer[]) AS v(id, delta)
+            WHERE i.id = v.id
+            """,
+            [list(item_ids), list(amounts)],
+        )
+
+
+def apply_primary_location_deltas(deltas: dict[int, int]) -> None:
+    """Apply item-level deltas to each item's fullest bin in one statement.
+
+    Items without any ``inventory_item_locations`` row are left untouched;
+    bin quantities never drop below zero.
+    """
+
+    changes = [(item_id, delta) for item_id, delta in sorted(deltas.items()) if delta]
+    if not changes:
+        return
+
+    item_ids, amounts = zip(*changes)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            UPDATE inventory_item_locations AS l
+            SET quantity = GREATEST(l.quantity + target.delta, 0)
+            FROM (
+                SELECT DISTINCT ON (a.inventory_item_id) a.id, v.delta
+                FROM unnest(%s::integer[], %s::integer[]) AS v(item_id, delta)
+                JOIN inventory_item_locations a ON a.inventory_item_id = v.item_id
+                ORDER BY a.inventory_item_id, a.quantity DESC, a.id
+            ) AS target
+            WHERE l.id = target.id
+            """,
+            [list(item_ids), list(amounts)],
+        )
+
+
+def apply_location_deltas(deltas: dict[tuple[int, int], int]) -> None:
+    """Add ``(item_id, storage_location_id) -> delta`` to bin quantities in one upsert.
+
+    Missing assignments are created.  Callers check that decrements are
+    covered by the bin; existing quantities are still clamped at zero.
+    """
+
+    changes = [(key, delta) for key, delta in sorted(deltas.items()) if delta]
+    if not changes:
+        return
+
+    keys, amounts = zip(*changes)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            INSERT INTO inventory_item_locations (inventory_item_id, storage_location_id, quantity)
+            SELECT v.item_id, v.location_id, v.delta
+            FROM unnest(%s::integer[], %s::integer[], %s::integer[]) AS v(item_id, location_id, delta)
+            ON CONFLICT (inventory_item_id, storage_location_id) DO UPDATE
+            SET quantity = GREATEST(inventory_item_locations.quantity + EXCLUDED.quantity, 0)
+            """,
+            [[item_id for item_id, _ in keys], [location_id for _, location_id in keys], list(amounts)],
+        )
+
+
+def record_daily_usage(usage_date: datetime.date, usage_by_item: dict[int, int]) -> None:
+    """Accumulate consumption into ``inventory_daily_usage`` in one upsert."""
+
+    record_usage_rows((item_id, usage_date, quantity) for item_id, quantity in usage_by_item.items())
+
+
+def record_usage_rows(rows: Iterable[tuple[int, datetime.date, int]]) -> None:
+    """Upsert ``(item_id, usage_date, quantity)`` rows spanning any number of days.
+
+    ``average_daily_use`` of the touched items is refreshed afterwards, as
+    ``recordInventoryTransaction`` does.
+    """
+
+    totals: dict[tuple[int, datetime.date], int] = defaultdict(int)
+    for item_id, usage_date, quantity in rows:
+        if quantity > 0:
+            totals[(int(item_id), usage_date)] += int(quantity)
+    if not totals:
+        return
+
+    keys = sorted(totals)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            INSERT INTO inventory_daily_usage (inventory_item_id, usage_date, quantity_used)
+            SELECT v.item_id, v.usage_date, v.quantity
+            FROM unnest(%s::integer[], %s::date[], %s::integer[]) AS v(item_id, usage_date, quantity)
+            ON CONFLICT (inventory_item_id, usage_date) DO UPDATE
+            SET quantity_used = inventory_daily_usage.quantity_used + EXCLUDED.quantity_used
+            """,
+            [[item_id for item_id, _ in keys], [day for _, day in keys], [totals[key] for key in keys]],
+        )
+
+    refresh_average_daily_use({item_id for item_id, _ in keys})
+
+
+def refresh_average_daily_use(item_ids: Iterable[int]) -> None:
+    """Recompute ``average_daily_use`` like ``inventoryCalculateAverageDailyUseMap``."""
+
+    ids = sorted({int(item_id) for item_id in item_ids})
+    if not ids:
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            UPDATE inventory_items AS i
+            SET average_daily_use = COALESCE(
+                round(u.total_used::numeric / GREATEST(1, LEAST(%(window)s, %(today)s::date - u.first_usage + 1)), 4),
+                0
+            )
+            FROM unnest(%(ids)s::integer[]) AS v(id)
+            LEFT JOIN (
+                SELECT inventory_item_id, SUM(quantity_used) AS total_used, MIN(usage_date) AS first_usage
+                FROM inventory_daily_usage
+                WHERE usage_date >= %(today)s::date - (%(window)s - 1) AND inventory_item_id = ANY(%(ids)s)
+                GROUP BY inventory_item_id
+            ) AS u ON u.inventory_item_id = v.id
+            WHERE i.id = v.id
+            """,
+            {"ids": ids, "today": timezone.localdate(), "window": AVERAGE_DAILY_USE_WINDOW_DAYS},
+        )
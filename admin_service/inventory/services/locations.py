@@ -0,0 +1,182 @@
+"""Storage location keys, cached hierarchy tree and pick-path ordering."""
+from __future__ import annotations
+
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Iterable
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .. import models
+
+KEY_SEPARATOR = "\x1f"
+TREE_TTL_SECONDS = 60
+
+_TOKEN_RE = re.compile(r"[0-9]+|[^0-9]+")
+
+
+def natural_key(value: str | None) -> str:
+    """Python twin of the ``storage_location_natural_key`` SQL function."""
+
+    tokens = _TOKEN_RE.findall((value or "").strip())
+    return "".join(token.zfill(12) if token.isdigit() else token.lower() for token in tokens)
+
+
+def location_parts(aisle=None, rack=None, shelf=None, bin=None, name=None) -> list[str]:
+    """Return the non-empty hierarchy components, falling back to the name."""
+
+    parts = [str(value).strip() for value in (aisle, rack, shelf, bin) if value not in (None, "") and str(value).strip()]
+    if not parts:
+        parts = [(name or "").strip()]
+    return parts
+
+
+def location_key(*parts: str) -> str:
+    """Build the natural-sort key stored in ``storage_locations.location_key``."""
+
+    return KEY_SEPARATOR.join(natural_key(part) for part in parts)
+
+
+@dataclass
+class LocationNode:
+    """A level of the aisle → rack → shelf → bin hierarchy."""
+
+    label: str
+    key: str
+    depth: int
+    children: dict[str, "LocationNode"] = field(default_factory=dict)
+    location_ids: list[int] = field(default_factory=list)
+
+    def sorted_children(self) -> list["LocationNode"]:
+        return sorted(self.children.values(), key=lambda node: node.key)
+
+    def iter_location_ids(self) -> Iterable[int]:
+        yield from self.location_ids
+        for child in self.sorted_children():
+            yield from child.iter_location_ids()
+
+
+class LocationTree:
+    """In-memory snapshot of every storage location, keyed by hierarchy."""
+
+    def __init__(self, rows: Iterable[tuple]) -> None:
+        self.root = LocationNode(label="", key="", depth=0)
+        self.paths: dict[int, str] = {}
+        self.keys: dict[int, str] = {}
+        self.active: set[int] = set()
+        self._rank: dict[int, int] | None = None
+
+        for location_id, name, aisle, rack, shelf, bin_, is_active in rows:
+            parts = location_parts(aisle, rack, shelf, bin_, name)
+            self.paths[location_id] = ".".join(parts)
+            self.keys[location_id] = location_key(*parts)
+            if is_active:
+                self.active.add(location_id)
+
+            node = self.root
+            for depth, part in enumerate(parts, start=1):
+                key = natural_key(part)
+                child = node.children.get(key)
+                if child is None:
+                    child = node.children[key] = LocationNode(label=part, key=key, depth=depth)
+                node = child
+            node.location_ids.append(location_id)
+
+    def node(self, *labels: str) -> LocationNode | None:
+        """Return the node addressed by the given aisle/rack/shelf labels."""
+
+        node = self.root
+        for label in labels:
+            node = node.children.get(natural_key(label))
+            if node is None:
+                return None
+        return node
+
+    def choices(self, *labels: str) -> list[tuple[str, str]]:
+        """Return ``(value, label)`` pairs for the children of a node."""
+
+        node = self.node(*labels)
+        if node is None:
+            return []
+        return [(child.label, child.label) for child in node.sorted_children()]
+
+    def pick_path(self, location_ids: Iterable[int] | None = None, *, active_only: bool = True) -> list[int]:
+        """Order locations along a serpentine pick path.
+
+        Aisles are walked in natural order; racks run forwards in odd
+        aisles and backwards in even ones so pickers never double back
+        along an aisle.  Shelves and bins keep natural order.
+        """
+
+        wanted = None if location_ids is None else {int(value) for value in location_ids}
+        ordered: list[int] = []
+
+        for aisle_index, aisle in enumerate(self.root.sorted_children()):
+            ordered.extend(aisle.location_ids)
+            racks = aisle.sorted_children()
+            if aisle_index % 2 == 1:
+                racks.reverse()
+            for rack in racks:
+                ordered.extend(rack.iter_location_ids())
+
+        if active_only:
+            ordered = [location_id for location_id in ordered if location_id in self.active]
+        if wanted is not None:
+            ordered = [location_id for location_id in ordered if location_id in wanted]
+        return ordered
+
+    def pick_path_rank(self) -> dict[int, int]:
+        """Return a location id → position map along the pick path."""
+
+        if self._rank is None:
+            self._rank = {
+                location_id: rank
+                for rank, location_id in enumerate(self.pick_path(active_only=False), start=1)
+            }
+        return self._rank
+
+
+_lock = threading.Lock()
+_tree: LocationTree | None = None
+_loaded_at = 0.0
+
+
+def location_tree() -> LocationTree:
+    """Return the cached hierarchy, reloading it with one query when stale.
+
+    Admin writes invalidate the cache immediately; the TTL covers changes
+    made from the PHP workspace.
+    """
+
+    global _tree, _loaded_at
+
+    with _lock:
+        if _tree is None or time.monotonic() - _loaded_at > TREE_TTL_SECONDS:
+            rows = models.StorageLocation.objects.values_list(
+                "id", "name", "aisle", "rack", "shelf", "bin", "is_active"
+            )
+            _tree = LocationTree(rows.order_by().iterator(chunk_size=5000))
+            _loaded_at = time.monotonic()
+        return _tree
+
+
+def invalidate_location_tree() -> None:
+    global _tree
+
+    with _lock:
+        _tree = None
+
+
+def pick_path_order(location_ids: Iterable[int] | None = None, *, active_only: bool = True) -> list[int]:
+    """Return storage location ids in pick-path order."""
+
+    return location_tree().pick_path(location_ids, active_only=active_only)
+
+
+@receiver(post_save, sender=models.StorageLocation, dispatch_uid="storage_location_tree_save")
+@receiver(post_delete, sender=models.StorageLocation, dispatch_uid="storage_location_tree_delete")
+def _storage_location_changed(sender, **kwargs) -> None:
+    invalidate_location_tree()
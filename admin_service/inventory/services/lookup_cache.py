@@ -0,0 +1,138 @@
+"""Table-versioned cache for admin lookups such as list-filter choices.
+
+Each table has a version number in Django's cache (``CACHES``), bumped once
+the write commits by ``post_save``/``post_delete`` for inventory models and by
+the change feed for writes made outside Django.  A cached lookup is keyed by
+the versions of the tables it reads, so a write orphans the stale entry
+instead of having to find and delete it, and a repeat lookup is two cache
+reads and no SQL.  Stock movements update ``inventory_items`` constantly, so
+feed updates to the tables in ``WATCHED_COLUMNS`` only bump the version once
+a re-read shows one of the columns the lookups use has changed.
+Writes neither path sees (bulk SQL with the change feed off, or another
+process's local-memory cache) age out after ``LOOKUP_CACHE_SECONDS``.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable, Iterable, TypeVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .change_feed import inventory_changed
+
+T = TypeVar("T")
+
+_VERSION_KEY = "table-version:{}"
+_ROW_KEY = "lookup-row:{}:{}"
+_MISSING = object()
+
+# Columns the cached lookups read from tables that see constant stock-only
+# updates.  Change-feed updates to these tables are checked against the
+# columns' last seen values before the version is bumped.
+WATCHED_COLUMNS = {
+    "inventory_items": ("sku", "item", "status", "supplier", "supplier_id"),
+}
+
+_lock = threading.Lock()
+_touched: dict[str, set[int]] = {}
+
+
+def _fresh_version() -> int:
+    # Clock-based, so a version evicted from the cache never comes back as a
+    # number some old entry was stored under.
+    return time.time_ns() // 1000
+
+
+def lookup_versions(tables: Iterable[str]) -> dict[str, int]:
+    """Current cache version of each table, starting a version for tables without one."""
+
+    keys = {table: _VERSION_KEY.format(table) for table in tables}
+    found = cache.get_many(keys.values())
+    versions = {}
+    for table, key in keys.items():
+        if key not in found:
+            version = _fresh_version()
+            # Another process may have started the version first; use theirs.
+            found[key] = version if cache.add(key, version, timeout=None) else cache.get(key, version)
+        versions[table] = found[key]
+    return versions
+
+
+def bump_tables(*tables: str) -> None:
+    for table in tables:
+        key = _VERSION_KEY.format(table)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, _fresh_version(), timeout=None)
+
+
+def cached_lookup(name: str, tables: Iterable[str], compute: Callable[[], T], timeout: int | None = None) -> T:
+    """``compute()``, cached until one of ``tables`` changes or the timeout passes."""
+
+    tables = sorted(set(tables))
+    _check_touched(tables)
+    versions = lookup_versions(tables)
+    key = f"lookup:{name}:" + ".".join(str(versions[table]) for table in tables)
+    value = cache.get(key, _MISSING)
+    if value is _MISSING:
+        value = compute()
+        cache.set(key, value, settings.LOOKUP_CACHE_SECONDS if timeout is None else timeout)
+    return value
+
+
+@receiver(post_save, dispatch_uid="lookup_cache_save")
+@receiver(post_delete, dispatch_uid="lookup_cache_delete")
+def _model_changed(sender, using=None, **kwargs) -> None:
+    # After commit, or a concurrent request could cache choices read from the
+    # old rows under the new version.
+    if sender._meta.app_label == "inventory":
+        table = sender._meta.db_table
+        transaction.on_commit(lambda: bump_tables(table), using=using)
+
+
+def _rows_changed(table: str, ids: set[int]) -> bool:
+    """Whether any row's watched columns differ from the values last seen for it."""
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT id, {', '.join(WATCHED_COLUMNS[table])} FROM {table} WHERE id = ANY(%s)", [sorted(ids)]
+        )
+        current = {row[0]: list(row[1:]) for row in cursor.fetchall()}
+    keys = {item_id: _ROW_KEY.format(table, item_id) for item_id in ids}
+    seen = cache.get_many(keys.values())
+    changed = {
+        keys[item_id]: current.get(item_id)
+        for item_id in ids
+        if seen.get(keys[item_id], _MISSING) != current.get(item_id)
+    }
+    cache.set_many(changed, timeout=None)
+    return bool(changed)
+
+
+def _check_touched(tables: Iterable[str]) -> None:
+    # Resolved here, in the request thread, rather than in the feed's
+    # listener thread, which keeps no database connection of its own.
+    for table in tables:
+        with _lock:
+            ids = _touched.pop(table, None)
+        if ids and _rows_changed(table, ids):
+            bump_tables(table)
+
+
+@receiver(inventory_changed, dispatch_uid="lookup_cache_change_feed")
+def _tables_notified(sender, batch, **kwargs) -> None:
+    bumped = []
+    for table in batch.tables:
+        ids = batch.ids(table)
+        if table in WATCHED_COLUMNS and ids is not None and batch.ops.get(table) == frozenset({"update"}):
+            with _lock:
+                _touched.setdefault(table, set()).update(ids)
+        else:
+            bumped.append(table)
+    bump_tables(*bumped)
@@ -0,0 +1,141 @@
+"""Post maintenance parts consumption to the inventory ledger in batches.
+
+Records are taken in id order past the watermark kept in
+``maintenance_part_postings`` (the highest ``last_record_id``).  Each batch
+becomes one ``inventory_transactions`` header whose lines come from the
+normalised ``maintenance_record_parts`` rows, so parts are resolved to
+inventory items without any per-part lookups.
+"""
+from __future__ import annotations
+
+import datetime
+from dataclasses import dataclass
+from decimal import ROUND_HALF_UP
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .. import models
+from .ledger import LedgerLine, lock_inventory_items, post_transaction, record_usage_rows
+
+BATCH_SIZE = 500
+# Records younger than this are left for the next run so a slow PHP
+# transaction holding a lower id cannot be skipped by the watermark.
+SETTLE_SECONDS = 60
+
+
+@dataclass(frozen=True)
+class ConsumptionPostingResult:
+    posting_id: int
+    first_record_id: int
+    last_record_id: int
+    inventory_transaction_id: int | None
+    record_count: int
+    line_count: int
+    unmatched_count: int
+    short_quantity: int
+
+
+def post_next_batch(batch_size: int = BATCH_SIZE) -> ConsumptionPostingResult | None:
+    """Post the next batch of unposted records; ``None`` when caught up.
+
+    Consumption never takes stock below zero: a part needing more than is on
+    hand posts what is available and the remainder is reported as short.
+    Parts that do not match an inventory SKU are counted but not posted.
+    """
+
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute("LOCK TABLE maintenance_part_postings IN SHARE ROW EXCLUSIVE MODE")
+            cursor.execute(
+                """
+                SELECT r.id
+                FROM maintenance_records r
+                WHERE r.id > (SELECT COALESCE(MAX(last_record_id), 0) FROM maintenance_part_postings)
+                  AND r.created_at < NOW() - make_interval(secs => %s)
+                ORDER BY r.id
+                LIMIT %s
+                """,
+                [SETTLE_SECONDS, batch_size],
+            )
+            record_ids = [row[0] for row in cursor.fetchall()]
+            if not record_ids:
+                return None
+
+            cursor.execute(
+                """
+                SELECT record_id, part_text, quantity, inventory_item_id, performed_on
+                FROM maintenance_record_parts
+                WHERE record_id = ANY(%s)
+                ORDER BY record_id, position
+                """,
+                [record_ids],
+            )
+            parts = cursor.fetchall()
+
+        locked_stock = lock_inventory_items(item_id for _, _, _, item_id, _ in parts if item_id is not None)
+        available = dict(locked_stock)
+        lines: list[LedgerLine] = []
+        usage: list[tuple[int, datetime.date, int]] = []
+        unmatched = 0
+        short = 0
+
+        for record_id, part_text, quantity, item_id, performed_on in parts:
+            if item_id is None:
+                unmatched += 1
+                continue
+
+            wanted = int(quantity.to_integral_value(rounding=ROUND_HALF_UP))
+            taken = min(wanted, available[item_id])
+            short += wanted - taken
+            if taken <= 0:
+                continue
+
+            available[item_id] -= taken
+            note = f"Maintenance record #{record_id}: {part_text}"
+            if taken < wanted:
+                note += f" (short {wanted - taken})"
+            lines.append(LedgerLine(item_id, -taken, note))
+            usage.append((item_id, performed_on, taken))
+
+        first_record_id, last_record_id = record_ids[0], record_ids[-1]
+        header = post_transaction(
+            f"Maintenance parts #{first_record_id}-{last_record_id}",
+            lines,
+            notes=f"Parts used by {len(record_ids)} maintenance records.",
+            locked_stock=locked_stock,
+        )
+        # Usage is booked on the day the work was performed, not the posting day.
+        record_usage_rows(usage)
+
+        posting = models.MaintenancePartPosting.objects.create(
+            first_record_id=first_record_id,
+            last_record_id=last_record_id,
+            inventory_transaction=header,
+            record_count=len(record_ids),
+            line_count=len(lines),
+            unmatched_count=unmatched,
+            short_quantity=short,
+            posted_at=timezone.now(),
+        )
+
+    return ConsumptionPostingResult(
+        posting_id=posting.pk,
+        first_record_id=first_record_id,
+        last_record_id=last_record_id,
+        inventory_transaction_id=header.pk if header else None,
+        record_count=len(record_ids),
+        line_count=len(lines),
+        unmatched_count=unmatched,
+        short_quantity=short,
+    )
+
+
+def post_pending(batch_size: int = BATCH_SIZE) -> list[ConsumptionPostingResult]:
+    """Post batches until every settled record is covered by the watermark."""
+
+    results = []
+    while (result := post_next_batch(batch_size)) is not None:
+        results.append(result)
+    return results
+
@@ -0,0 +1,99 @@
+"""Index-backed lookups over maintenance part usage and machine documents.
+
+``maintenance_record_parts`` is the normalised form of
+``maintenance_records.parts_used``; the ``trg_maintenance_records_parts``
+trigger rebuilds a record's rows whenever the PHP app or the admin writes
+it, and ``trg_inventory_items_maintenance_parts`` relinks rows when SKUs
+change.
+"""
+from __future__ import annotations
+
+import datetime
+from typing import Iterable
+
+from django.db import connection
+from django.db.models import Count, QuerySet, Sum
+
+from .. import models
+
+
+def part_key(value: str) -> str:
+    """Normalise a SKU the way the sync trigger stores ``part_key``."""
+
+    return value.strip().lower()
+
+
+def records_using(sku: str) -> QuerySet:
+    """Maintenance records with a ``parts_used`` entry for ``sku``."""
+
+    parts = models.MaintenanceRecordPart.objects.filter(part_key=part_key(sku))
+    return models.MaintenanceRecord.objects.filter(pk__in=parts.values("record_id"))
+
+
+def machines_with_document(label: str) -> QuerySet:
+    """Machines carrying a document with exactly this label (``documents @> ...``)."""
+
+    return models.MaintenanceMachine.objects.filter(documents__contains=[{"label": label}])
+
+
+def document_labels() -> list[str]:
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT DISTINCT d.value ->> 'label'
+            FROM maintenance_machines m
+            CROSS JOIN LATERAL jsonb_array_elements(m.documents) AS d(value)
+            WHERE jsonb_typeof(m.documents) = 'array' AND d.value ->> 'label' <> ''
+            ORDER BY 1
+            """
+        )
+        return [label for (label,) in cursor.fetchall()]
+
+
+def most_used_items(limit: int = 25) -> list[tuple[int, str, str]]:
+    """``(item_id, sku, item)`` for the items most often used in maintenance."""
+
+    rows = (
+        models.MaintenanceRecordPart.objects.filter(inventory_item__isnull=False)
+        .values("inventory_item_id", "inventory_item__sku", "inventory_item__item")
+        .annotate(uses=Count("id"))
+        .order_by("-uses", "inventory_item__sku")[:limit]
+    )
+    return [(row["inventory_item_id"], row["inventory_item__sku"], row["inventory_item__item"]) for row in rows]
+
+
+def part_consumption(
+    start: datetime.date | None = None,
+    end: datetime.date | None = None,
+    machine_ids: Iterable[int] | None = None,
+) -> dict[int, dict]:
+    """Quantity of each linked inventory item used by maintenance in ``[start, end]``."""
+
+    parts = models.MaintenanceRecordPart.objects.filter(inventory_item__isnull=False)
+    if start is not None:
+        parts = parts.filter(performed_on__gte=start)
+    if end is not None:
+        parts = parts.filter(performed_on__lte=end)
+    if machine_ids is not None:
+        parts = parts.filter(machine_id__in=list(machine_ids))
+
+    rows = (
+        parts.values("inventory_item_id")
+        .annotate(quantity=Sum("quantity"), records=Count("record_id", distinct=True))
+        .order_by()
+    )
+    return {row["inventory_item_id"]: {"quantity": row["quantity"], "records": row["records"]} for row in rows}
+
+
+def sync_record_parts(record_ids: Iterable[int] | None = None) -> int:
+    """Rebuild normalised part rows; ``None`` resyncs every record."""
+
+    with connection.cursor() as cursor:
+        if record_ids is None:
+            cursor.execute("SELECT maintenance_record_parts_sync(ARRAY(SELECT id FROM maintenance_records))")
+        else:
+            cursor.execute(
+                "SELECT maintenance_record_parts_sync(%s::bigint[])",
+                [sorted({int(record_id) for record_id in record_ids})],
+            )
+        return cursor.fetchone()[0]
@@ -0,0 +1,201 @@
+"""Vectorised due-date computation for preventive maintenance tasks."""
+from __future__ import annotations
+
+import datetime
+from dataclasses import dataclass
+from typing import Iterable
+
+import numpy as np
+from django.db import connection
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .. import models
+
+UNITS = ("day", "week", "month", "year")
+
+_SCHEDULE_SQL = """
+    SELECT t.id, t.interval_count, t.interval_unit,
+           COALESCE(MAX(r.performed_at), t.last_completed_at, t.start_date) AS base_date
+    FROM maintenance_tasks t
+    LEFT JOIN maintenance_records r ON r.task_id = t.id AND r.performed_at IS NOT NULL
+    WHERE t.interval_count IS NOT NULL AND t.interval_unit IS NOT NULL {task_filter}
+    GROUP BY t.id
+"""
+
+
+@dataclass
+class Schedule:
+    """Parallel arrays describing each scheduled task."""
+
+    task_ids: np.ndarray
+    counts: np.ndarray
+    units: np.ndarray
+    base_dates: np.ndarray
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[tuple]) -> "Schedule":
+        rows = [row for row in rows if row[3] is not None and row[2] in UNITS and row[1]]
+        return cls(
+            task_ids=np.array([row[0] for row in rows], dtype=np.int64),
+            counts=np.array([row[1] for row in rows], dtype=np.int64),
+            units=np.array([row[2] for row in rows], dtype=object),
+            base_dates=np.array([row[3] for row in rows], dtype="datetime64[D]"),
+        )
+
+    def occurrence(self, multiple: int = 1) -> np.ndarray:
+        """Return ``base + multiple * interval`` for every task."""
+
+        return add_intervals(self.base_dates, self.counts * multiple, self.units)
+
+
+def add_intervals(base: np.ndarray, counts: np.ndarray, units: np.ndarray) -> np.ndarray:
+    """Add per-row intervals to ``datetime64[D]`` dates.
+
+    Month and year steps clamp to the end of the target month, matching
+    PostgreSQL's ``date + interval`` used by ``maintenanceTasksList``.
+    """
+
+    result = base.copy()
+
+    days = units == "day"
+    result[days] = base[days] + counts[days]
+    weeks = units == "week"
+    result[weeks] = base[weeks] + counts[weeks] * 7
+
+    months = np.where(units == "year", counts * 12, counts)
+    calendar = (units == "month") | (units == "year")
+    if calendar.any():
+        start_month = base[calendar].astype("datetime64[M]")
+        day_offset = base[calendar] - start_month.astype("datetime64[D]")
+        target_month = start_month + months[calendar]
+        month_end = (target_month + 1).astype("datetime64[D]") - 1
+        result[calendar] = np.minimum(target_month.astype("datetime64[D]") + day_offset, month_end)
+
+    return result
+
+
+def load_schedule(task_ids: Iterable[int] | None = None) -> Schedule:
+    params: list = []
+    task_filter = ""
+    if task_ids is not None:
+        task_filter = "AND t.id = ANY(%s)"
+        params.append(sorted({int(task_id) for task_id in task_ids}))
+
+    with connection.cursor() as cursor:
+        cursor.execute(_SCHEDULE_SQL.format(task_filter=task_filter), params)
+        return Schedule.from_rows(cursor.fetchall())
+
+
+def refresh_due_dates(task_ids: Iterable[int] | None = None) -> int:
+    """Recompute ``maintenance_tasks.next_due_date`` and return rows changed."""
+
+    task_ids = None if task_ids is None else sorted({int(task_id) for task_id in task_ids})
+    schedule = load_schedule(task_ids)
+    due = schedule.occurrence()
+
+    scope_sql = "" if task_ids is None else "WHERE m.id = ANY(%(scope)s)"
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            UPDATE maintenance_tasks AS t
+            SET next_due_date = v.due
+            FROM (
+                SELECT m.id, c.due
+                FROM maintenance_tasks m
+                LEFT JOIN unnest(%(ids)s::bigint[], %(dues)s::date[]) AS c(id, due) ON c.id = m.id
+                {scope_sql}
+            ) AS v
+            WHERE t.id = v.id
+              AND t.next_due_date IS DISTINCT FROM v.due
+            """,
+            {
+                "ids": schedule.task_ids.tolist(),
+                "dues": due.astype(datetime.date).tolist(),
+                "scope": task_ids or [],
+            },
+        )
+        return cursor.rowcount
+
+
+def overdue_by(next_due: datetime.date | None, today: datetime.date | None = None) -> int | None:
+    """Days past due, or ``None`` when the task is not overdue."""
+
+    if next_due is None:
+        return None
+    days = ((today or timezone.localdate()) - next_due).days
+    return days if days > 0 else None
+
+
+def _first_multiples_from(schedule: Schedule, start: np.datetime64, minimum: int = 1) -> np.ndarray:
+    """Smallest ``multiple >= minimum`` per task whose occurrence falls on or after ``start``.
+
+    Day and week steps divide the elapsed days; month and year steps divide
+    the elapsed months, and the clamped day can leave the estimate one step
+    short, which the final comparison corrects.
+    """
+
+    units, counts, base = schedule.units, schedule.counts, schedule.base_dates
+    calendar = (units == "month") | (units == "year")
+    months = np.where(units == "year", counts * 12, counts)
+    steps = np.where(calendar, months, np.where(units == "week", counts * 7, counts))
+    elapsed = np.where(
+        calendar,
+        (start.astype("datetime64[M]") - base.astype("datetime64[M]")).astype(np.int64),
+        (start - base).astype(np.int64),
+    )
+
+    multiples = np.maximum(-(-elapsed // steps), minimum)
+    behind = add_intervals(schedule.base_dates, schedule.counts * multiples, schedule.units) < start
+    return multiples + behind
+
+
+def forecast(start: datetime.date, days: int = 28) -> dict[datetime.date, list[int]]:
+    """Return active task ids due on each date in ``[start, start + days)``.
+
+    Overdue tasks are reported on ``start``.  Later recurrences start from
+    each task's first occurrence inside the window, computed directly, and
+    only tasks with another occurrence before the window ends are stepped.
+    """
+
+    active_ids = models.MaintenanceTask.objects.filter(status="active").values_list("id", flat=True)
+    schedule = load_schedule(active_ids)
+    window_start = np.datetime64(start, "D")
+    window_end = window_start + days
+    calendar: dict[datetime.date, list[int]] = {}
+
+    def add(task_ids: np.ndarray, dates: np.ndarray) -> None:
+        for task_id, when in zip(task_ids, dates):
+            calendar.setdefault(when.astype(datetime.date), []).append(int(task_id))
+
+    # The next occurrence; overdue tasks surface once on the first day, not
+    # for every missed cycle.
+    due = schedule.occurrence()
+    hits = due < window_end
+    add(schedule.task_ids[hits], np.maximum(due[hits], window_start))
+
+    multiples = _first_multiples_from(schedule, window_start, minimum=2)
+    pending = np.arange(schedule.task_ids.size)
+    while pending.size:
+        due = add_intervals(
+            schedule.base_dates[pending], schedule.counts[pending] * multiples[pending], schedule.units[pending]
+        )
+        hits = due < window_end
+        pending, due = pending[hits], due[hits]
+        add(schedule.task_ids[pending], due)
+        multiples[pending] += 1
+
+    return dict(sorted(calendar.items()))
+
+
+@receiver(post_save, sender=models.MaintenanceRecord, dispatch_uid="maintenance_record_due_save")
+@receiver(post_delete, sender=models.MaintenanceRecord, dispatch_uid="maintenance_record_due_delete")
+def _record_changed(sender, instance, **kwargs) -> None:
+    if instance.task_id:
+        refresh_due_dates([instance.task_id])
+
+
+@receiver(post_save, sender=models.MaintenanceTask, dispatch_uid="maintenance_task_due_save")
+def _task_changed(sender, instance, **kwargs) -> None:
+    refresh_due_dates([instance.pk])
@@ -0,0 +1,341 @@
+"""Batch posting of issue, receive and transfer movements.
+
+Backs ``POST /api/v1/movements/``.  A batch is validated against one locked
+prefetch of its items, one of its storage locations and one of the items'
+bin assignments, then written as a single ``inventory_transactions`` header
+with bulk lines and set-based updates to ``inventory_items`` and
+``inventory_item_locations``.
+
+Every batch carries an idempotency key, claimed in the same transaction as
+the posting: a retry with the same key and payload replays the stored
+response, a concurrent retry waits for the first attempt to commit, and
+reusing a key for a different payload is rejected.  A batch that fails
+validation rolls back its claim, so the corrected batch may reuse the key.
+Keys are kept for ``MOVEMENT_KEY_RETENTION_DAYS`` and then removed by
+:func:`purge_expired_batches`.
+"""
+from __future__ import annotations
+
+import datetime
+import hashlib
+import json
+from collections import defaultdict
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .. import models
+from .ledger import (
+    LedgerError,
+    LedgerLine,
+    apply_location_deltas,
+    apply_primary_location_deltas,
+    post_transaction,
+)
+
+MOVEMENT_TYPES = ("issue", "receive", "transfer")
+MAX_MOVEMENTS = 1000
+PURGE_CHUNK_SIZE = 5000
+
+
+class MovementError(LedgerError):
+    """Raised when a batch is rejected; ``errors`` lists per-movement problems."""
+
+    def __init__(self, message: str, errors: list[dict] | None = None, status: int = 422) -> None:
+        super().__init__(message)
+        self.errors = errors or []
+        self.status = status
+
+
+@dataclass(frozen=True)
+class Movement:
+    type: str
+    quantity: int
+    item_id: int | None = None
+    sku: str | None = None
+    # Storage locations by id (int) or name (str).
+    from_location: int | str | None = None
+    to_location: int | str | None = None
+    note: str | None = None
+
+
+@dataclass(frozen=True)
+class BatchResult:
+    response: dict
+    replayed: bool
+
+
+def request_hash(payload) -> str:
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, separators=(",", ":")).encode()).hexdigest()
+
+
+def _location_ref(value) -> int | str | None:
+    if value in (None, ""):
+        return None
+    if isinstance(value, bool) or not isinstance(value, (int, str)):
+        raise ValueError("locations are given by id or name")
+    return value.strip() if isinstance(value, str) else value
+
+
+def parse_movements(entries) -> list[Movement]:
+    """Check the shape of each movement; raises :class:`MovementError` (400) listing every problem."""
+
+    if not isinstance(entries, list) or not entries:
+        raise MovementError("movements must be a non-empty list.", status=400)
+    if len(entries) > MAX_MOVEMENTS:
+        raise MovementError(f"A batch may hold at most {MAX_MOVEMENTS} movements.", status=400)
+
+    movements: list[Movement] = []
+    errors: list[dict] = []
+    for index, entry in enumerate(entries):
+        try:
+            if not isinstance(entry, dict):
+                raise ValueError("each movement must be an object")
+            kind = entry.get("type")
+            if kind not in MOVEMENT_TYPES:
+                raise ValueError(f"type must be one of {', '.join(MOVEMENT_TYPES)}")
+            quantity = entry.get("quantity")
+            if isinstance(quantity, bool) or not isinstance(quantity, int) or quantity <= 0:
+                raise ValueError("quantity must be a positive integer")
+            item_id, sku = entry.get("item_id"), entry.get("sku")
+            if item_id is not None and (isinstance(item_id, bool) or not isinstance(item_id, int)):
+                raise ValueError("item_id must be an integer")
+            if item_id is None and not (isinstance(sku, str) and sku.strip()):
+                raise ValueError("item_id or sku is required")
+            movement = Movement(
+                type=kind,
+                quantity=quantity,
+                item_id=item_id,
+                sku=sku.strip() if item_id is None else None,
+                from_location=_location_ref(entry.get("from")),
+                to_location=_location_ref(entry.get("to")),
+                note=str(entry["note"]) if entry.get("note") else None,
+            )
+            if kind == "transfer" and (movement.from_location is None or movement.to_location is None):
+                raise ValueError("transfers need both from and to")
+            if kind == "issue" and movement.to_location is not None:
+                raise ValueError("issues take a from location only")
+            if kind == "receive" and movement.from_location is not None:
+                raise ValueError("receipts take a to location only")
+        except ValueError as exc:
+            errors.append({"index": index, "error": str(exc)})
+            continue
+        movements.append(movement)
+    if errors:
+        raise MovementError("Some movements are malformed.", errors, status=400)
+    return movements
+
+
+def _claim(idempotency_key: str, payload_hash: str, requested_by: str | None) -> BatchResult | None:
+    """Claim the key, or return the stored result when it was already posted."""
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            INSERT INTO inventory_movement_batches (idempotency_key, request_hash, requested_by, created_at)
+            VALUES (%s, %s, %s, NOW())
+            ON CONFLICT (idempotency_key) DO NOTHING
+            RETURNING idempotency_key
+            """,
+            [idempotency_key, payload_hash, requested_by],
+        )
+        if cursor.fetchone() is not None:
+            return None
+
+    batch = models.MovementBatch.objects.get(pk=idempotency_key)
+    if batch.request_hash != payload_hash:
+        raise MovementError("This idempotency key was already used for a different batch.", status=409)
+    return BatchResult(batch.response, replayed=True)
+
+
+def _prefetch(movements: list[Movement]) -> tuple[dict, dict, dict, dict]:
+    """Lock and load items, load locations, then lock the items' bins: three statements."""
+
+    ids = sorted({movement.item_id for movement in movements if movement.item_id is not None})
+    skus = sorted({movement.sku.lower() for movement in movements if movement.sku})
+    location_refs = {
+        ref for movement in movements for ref in (movement.from_location, movement.to_location) if ref is not None
+    }
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT id, lower(sku), sku, stock
+            FROM inventory_items
+            WHERE id = ANY(%s) OR lower(sku) = ANY(%s)
+            ORDER BY id
+            FOR UPDATE
+            """,
+            [ids, skus],
+        )
+        items: dict[int, tuple[str, int]] = {}
+        by_sku: dict[str, int] = {}
+        for item_id, sku_key, sku, stock in cursor.fetchall():
+            items[item_id] = (sku, stock)
+            by_sku[sku_key] = item_id
+
+        cursor.execute(
+            """
+            SELECT id, lower(name), is_active
+            FROM storage_locations
+            WHERE id = ANY(%s) OR lower(name) = ANY(%s)
+            """,
+            [
+                sorted(ref for ref in location_refs if isinstance(ref, int)),
+                sorted(ref.lower() for ref in location_refs if isinstance(ref, str)),
+            ],
+        )
+        locations: dict[int | str, tuple[int, bool]] = {}
+        for location_id, name, is_active in cursor.fetchall():
+            locations[location_id] = locations[name] = (location_id, is_active)
+
+        cursor.execute(
+            """
+            SELECT inventory_item_id, storage_location_id, quantity
+            FROM inventory_item_locations
+            WHERE inventory_item_id = ANY(%s)
+            ORDER BY id
+            FOR UPDATE
+            """,
+            [list(items)],
+        )
+        bins = {(item_id, location_id): quantity for item_id, location_id, quantity in cursor.fetchall()}
+    return items, by_sku, locations, bins
+
+
+def post_movements(
+    movements: list[Movement],
+    *,
+    idempotency_key: str,
+    payload_hash: str,
+    reference: str | None = None,
+    notes: str | None = None,
+    requested_by: str | None = None,
+) -> BatchResult:
+    """Validate and post a batch, or replay the result stored under ``idempotency_key``."""
+
+    with transaction.atomic():
+        replay = _claim(idempotency_key, payload_hash, requested_by)
+        if replay is not None:
+            return replay
+
+        items, by_sku, locations, bins = _prefetch(movements)
+        stock = {item_id: item_stock for item_id, (_, item_stock) in items.items()}
+        bins = dict(bins)
+        ledger_lines: list[LedgerLine] = []
+        bin_deltas: dict[tuple[int, int], int] = defaultdict(int)
+        unbinned: dict[int, int] = defaultdict(int)
+        errors: list[dict] = []
+
+        for index, movement in enumerate(movements):
+            item_id = movement.item_id if movement.item_id is not None else by_sku.get(movement.sku.lower())
+            if item_id not in items:
+                errors.append({"index": index, "error": f"Unknown item {movement.item_id or movement.sku}."})
+                continue
+            source = target = None
+            if movement.from_location is not None:
+                source = locations.get(_location_key(movement.from_location))
+                if source is None:
+                    errors.append({"index": index, "error": f"Unknown location {movement.from_location}."})
+                    continue
+            if movement.to_location is not None:
+                target = locations.get(_location_key(movement.to_location))
+                if target is None or not target[1]:
+                    errors.append({"index": index, "error": f"Unknown or inactive location {movement.to_location}."})
+                    continue
+            if source is not None and target is not None and source[0] == target[0]:
+                errors.append({"index": index, "error": "from and to are the same location."})
+                continue
+
+            quantity = movement.quantity
+            if movement.type != "receive" and stock[item_id] < quantity:
+                errors.append({"index": index, "error": f"Only {stock[item_id]} in stock."})
+                continue
+            if source is not None:
+                held = bins.get((item_id, source[0]), 0)
+                if held < quantity:
+                    errors.append({"index": index, "error": f"Only {held} in {movement.from_location}."})
+                    continue
+                bins[item_id, source[0]] = held - quantity
+
+            note = movement.note or _default_note(movement)
+            if movement.type == "transfer":
+                # Out and back in, so the ledger shows the move with no net change.
+                ledger_lines += [LedgerLine(item_id, -quantity, note), LedgerLine(item_id, quantity, note)]
+            else:
+                change = quantity if movement.type == "receive" else -quantity
+                stock[item_id] += change
+                ledger_lines.append(LedgerLine(item_id, change, note))
+                if source is None and target is None:
+                    unbinned[item_id] += change
+            if source is not None:
+                bin_deltas[item_id, source[0]] -= quantity
+            if target is not None:
+                bin_deltas[item_id, target[0]] += quantity
+                bins[item_id, target[0]] = bins.get((item_id, target[0]), 0) + quantity
+
+        if errors:
+            raise MovementError("No movements were posted; fix the listed movements and resend.", errors)
+
+        header = post_transaction(
+            reference or f"Movements {idempotency_key}",
+            ledger_lines,
+            notes=notes,
+            locked_stock={item_id: item_stock for item_id, (_, item_stock) in items.items()},
+            record_usage=True,
+        )
+        apply_location_deltas(bin_deltas)
+        apply_primary_location_deltas(unbinned)
+
+        touched = sorted({line.inventory_item_id for line in ledger_lines})
+        response = {
+            "transaction_id": header.pk if header else None,
+            "movements": len(movements),
+            "items": [{"id": item_id, "sku": items[item_id][0], "stock": stock[item_id]} for item_id in touched],
+        }
+        models.MovementBatch.objects.filter(pk=idempotency_key).update(
+            response=response, inventory_transaction=header
+        )
+    return BatchResult(response, replayed=False)
+
+
+def _location_key(ref: int | str) -> int | str:
+    return ref.lower() if isinstance(ref, str) else ref
+
+
+def _default_note(movement: Movement) -> str:
+    if movement.type == "transfer":
+        return f"Transfer {movement.from_location} -> {movement.to_location}"
+    where = movement.from_location if movement.type == "issue" else movement.to_location
+    return f"{movement.type.capitalize()}{f' @ {where}' if where is not None else ''}"
+
+
+def purge_expired_batches(days: int | None = None) -> int:
+    """Delete idempotency keys older than the retention window; returns rows deleted.
+
+    Works through ``created_at`` order in chunks, so each statement is a short
+    index range scan and posting is never blocked for long.
+    """
+
+    days = settings.MOVEMENT_KEY_RETENTION_DAYS if days is None else days
+    cutoff = timezone.now() - datetime.timedelta(days=days)
+    deleted = 0
+    while True:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                DELETE FROM inventory_movement_batches
+                WHERE idempotency_key IN (
+                    SELECT idempotency_key
+                    FROM inventory_movement_batches
+                    WHERE created_at < %s
+                    ORDER BY created_at
+                    LIMIT %s
+                )
+                """,
+                [cutoff, PURGE_CHUNK_SIZE],
+            )
+            deleted += cursor.rowcount
+            if cursor.rowcount < PURGE_CHUNK_SIZE:
+                return deleted
@@ -0,0 +1,275 @@
+"""Set-based posting of purchase order receipts."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Mapping
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .. import models
+from .lead_times import schedule_lead_time_refresh
+from .ledger import LedgerError, LedgerLine, lock_inventory_items, post_transaction
+from .uom import units_for
+
+OPEN_STATUSES = ("draft", "sent", "partially_received")
+ZERO = Decimal("0")
+
+
+class ReceivingError(LedgerError):
+    """Raised when a receipt cannot be posted."""
+
+
+@dataclass(frozen=True)
+class ReceiptChange:
+    receive: Decimal = ZERO
+    cancel: Decimal = ZERO
+    # Unit the quantities were counted in; ``None`` means the line's stock unit.
+    unit: str | None = None
+
+
+@dataclass(frozen=True)
+class ReceivedLine:
+    id: int
+    received_delta: Decimal
+    cancelled_delta: Decimal
+    received_total: Decimal
+    cancelled_total: Decimal
+
+
+@dataclass(frozen=True)
+class ReceiptResult:
+    lines: list[ReceivedLine]
+    status: str
+    inventory_transaction_id: int | None
+    receipt_id: int | None
+
+
+def _as_change(value: ReceiptChange | Decimal | int | float | str) -> ReceiptChange:
+    if isinstance(value, ReceiptChange):
+        return value
+    return ReceiptChange(receive=Decimal(str(value)))
+
+
+def post_receipt(
+    purchase_order_id: int,
+    changes: Mapping[int, ReceiptChange | Decimal | int | float | str],
+    reference: str | None = None,
+    notes: str | None = None,
+) -> ReceiptResult:
+    """Receive and/or cancel quantities against purchase order lines.
+
+    Mirrors ``recordPurchaseOrderReceipt``: receipts are clamped to the
+    outstanding quantity, cancellations to what remains afterwards, and the
+    purchase order status and ``on_order_qty`` caches are recalculated.  The
+    number of statements issued does not depend on the number of lines.
+    Changes given in another unit are converted with the line's own pack
+    size and units.
+    """
+
+    if not changes:
+        return ReceiptResult([], "", None, None)
+
+    reference = reference or f"PO {purchase_order_id} receipt"
+    line_ids = sorted({int(line_id) for line_id in changes})
+
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT supplier_id FROM purchase_orders WHERE id = %s FOR UPDATE", [purchase_order_id])
+            order = cursor.fetchone()
+            if order is None:
+                raise ReceivingError(f"Purchase order {purchase_order_id} not found.")
+
+            cursor.execute(
+                """
+                SELECT id, inventory_item_id, quantity_ordered, quantity_received, quantity_cancelled,
+                       pack_size, purchase_uom, stock_uom
+                FROM purchase_order_lines
+                WHERE purchase_order_id = %s AND id = ANY(%s)
+                ORDER BY id
+                FOR UPDATE
+                """,
+                [purchase_order_id, line_ids],
+            )
+            rows = cursor.fetchall()
+
+        if not rows:
+            raise ReceivingError("No purchase order lines found for receipt.")
+
+        received: list[ReceivedLine] = []
+        ledger_lines: list[LedgerLine] = []
+        affected_items: set[int] = set()
+
+        for line_id, item_id, ordered, received_so_far, cancelled_so_far, *line_units in rows:
+            change = _as_change(changes.get(line_id, changes.get(str(line_id), ZERO)))
+            if change.unit is not None:
+                units = units_for(item_id, *line_units)
+                change = ReceiptChange(
+                    receive=units.to_stock(change.receive, change.unit),
+                    cancel=units.to_stock(change.cancel, change.unit),
+                )
+            ordered = ordered or ZERO
+            received_so_far = received_so_far or ZERO
+            cancelled_so_far = cancelled_so_far or ZERO
+
+            remaining = max(ZERO, ordered - received_so_far - cancelled_so_far)
+            if remaining <= ZERO:
+                continue
+
+            receipt_qty = min(max(ZERO, change.receive), remaining)
+            cancel_qty = min(max(ZERO, change.cancel), remaining - receipt_qty)
+            if receipt_qty <= ZERO and cancel_qty <= ZERO:
+                continue
+
+            received.append(
+                ReceivedLine(
+                    id=line_id,
+                    received_delta=receipt_qty,
+                    cancelled_delta=cancel_qty,
+                    received_total=received_so_far + receipt_qty,
+                    cancelled_total=cancelled_so_far + cancel_qty,
+                )
+            )
+
+            if item_id is not None:
+                affected_items.add(item_id)
+                quantity_change = int(receipt_qty.to_integral_value(rounding=ROUND_HALF_UP))
+                if quantity_change:
+                    ledger_lines.append(
+                        LedgerLine(item_id, quantity_change, f"PO #{purchase_order_id} line {line_id} receipt")
+                    )
+
+        if not received:
+            return ReceiptResult([], "", None, None)
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                UPDATE purchase_order_lines AS pol
+                SET quantity_received = v.received,
+                    quantity_cancelled = v.cancelled,
+                    updated_at = NOW()
+                FROM unnest(%s::bigint[], %s::numeric[], %s::numeric[]) AS v(id, received, cancelled)
+                WHERE pol.id = v.id
+                """,
+                [
+                    [line.id for line in received],
+                    [line.received_total for line in received],
+                    [line.cancelled_total for line in received],
+                ],
+            )
+
+        header = post_transaction(
+            reference,
+            ledger_lines,
+            notes=notes,
+            locked_stock=lock_inventory_items(affected_items),
+        )
+
+        receipt = models.PurchaseOrderReceipt.objects.create(
+            purchase_order_id=purchase_order_id,
+            inventory_transaction=header,
+            reference=reference,
+            notes=notes,
+            created_at=timezone.now(),
+        )
+        models.PurchaseOrderReceiptLine.objects.bulk_create(
+            [
+                models.PurchaseOrderReceiptLine(
+                    receipt=receipt,
+                    purchase_order_line_id=line.id,
+                    quantity_received=line.received_delta,
+                    quantity_cancelled=line.cancelled_delta,
+                )
+                for line in received
+            ]
+        )
+
+        status = recalculate_status(purchase_order_id)
+        update_on_order_quantities(affected_items)
+        schedule_lead_time_refresh(order[0])
+
+    return ReceiptResult(
+        lines=received,
+        status=status,
+        inventory_transaction_id=header.pk if header else None,
+        receipt_id=receipt.pk,
+    )
+
+
+def receive_outstanding(purchase_order_id: int, reference: str | None = None) -> ReceiptResult:
+    """Receive every outstanding quantity on a purchase order."""
+
+    outstanding = {
+        line_id: ordered - received - cancelled
+        for line_id, ordered, received, cancelled in models.PurchaseOrderLine.objects.filter(
+            purchase_order_id=purchase_order_id
+        ).values_list("id", "quantity_ordered", "quantity_received", "quantity_cancelled")
+        if ordered - received - cancelled > ZERO
+    }
+    return post_receipt(purchase_order_id, outstanding, reference=reference)
+
+
+def recalculate_status(purchase_order_id: int) -> str:
+    """Port of ``purchaseOrderRecalculateStatus`` as a single statement."""
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            UPDATE purchase_orders AS po
+            SET status = CASE
+                    WHEN t.total_ordered <= 0 THEN 'draft'
+                    WHEN t.outstanding <= 0.000001 THEN
+                        CASE
+                            WHEN t.total_received > 0.000001 THEN 'closed'
+                            WHEN t.total_cancelled > 0.000001 THEN 'cancelled'
+                            ELSE 'closed'
+                        END
+                    WHEN t.total_received > 0 THEN 'partially_received'
+                    ELSE 'sent'
+                END,
+                updated_at = NOW()
+            FROM (
+                SELECT
+                    COALESCE(SUM(GREATEST(quantity_ordered - quantity_received - COALESCE(quantity_cancelled, 0), 0)), 0) AS outstanding,
+                    COALESCE(SUM(quantity_received), 0) AS total_received,
+                    COALESCE(SUM(quantity_ordered), 0) AS total_ordered,
+                    COALESCE(SUM(quantity_cancelled), 0) AS total_cancelled
+                FROM purchase_order_lines
+                WHERE purchase_order_id = %s
+            ) AS t
+            WHERE po.id = %s
+            RETURNING po.status
+            """,
+            [purchase_order_id, purchase_order_id],
+        )
+        row = cursor.fetchone()
+    return row[0] if row else ""
+
+
+def update_on_order_quantities(item_ids) -> None:
+    """Refresh ``inventory_items.on_order_qty`` for the given items in one statement."""
+
+    ids = sorted({int(item_id) for item_id in item_ids})
+    if not ids:
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            UPDATE inventory_items AS i
+            SET on_order_qty = COALESCE(o.outstanding, 0)
+            FROM unnest(%s::integer[]) AS v(id)
+            LEFT JOIN (
+                SELECT pol.inventory_item_id,
+                       SUM(GREATEST(pol.quantity_ordered - pol.quantity_received - COALESCE(pol.quantity_cancelled, 0), 0)) AS outstanding
+                FROM purchase_order_lines pol
+                JOIN purchase_orders po ON po.id = pol.purchase_order_id
+                WHERE po.status = ANY(%s) AND pol.inventory_item_id = ANY(%s)
+                GROUP BY pol.inventory_item_id
+            ) AS o ON o.inventory_item_id = v.id
+            WHERE i.id = v.id
+            """,
+            [ids, list(OPEN_STATUSES), ids],
+        )
@@ -0,0 +1,224 @@
+"""Monthly machine reliability rollups (downtime, labour, MTBF/MTTR)."""
+from __future__ import annotations
+
+import datetime
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Iterable
+
+from django.db import connection, transaction
+from django.db.models import Sum
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .. import models
+
+RELIABILITY_WINDOW_MONTHS = 12
+
+_MONTH_SQL = "date_trunc('month', COALESCE(r.performed_at, r.created_at::date))::date"
+
+_ROLLUP_SQL = f"""
+    INSERT INTO maintenance_machine_monthly_stats (
+        machine_id, month, record_count, failure_count, downtime_minutes,
+        labor_hours, last_record_id, refreshed_at
+    )
+    SELECT r.machine_id,
+           {_MONTH_SQL},
+           COUNT(*),
+           COUNT(*) FILTER (WHERE COALESCE(r.downtime_minutes, 0) > 0),
+           COALESCE(SUM(r.downtime_minutes), 0),
+           COALESCE(SUM(r.labor_hours), 0),
+           MAX(r.id),
+           NOW()
+    FROM maintenance_records r
+    {{scope}}
+    GROUP BY r.machine_id, {_MONTH_SQL}
+"""
+
+
+def record_month(performed_at: datetime.date | None, created_at: datetime.datetime | None) -> datetime.date:
+    """Rollup bucket for a record, mirroring ``_MONTH_SQL``."""
+
+    day = performed_at or (timezone.localdate(created_at) if created_at else timezone.localdate())
+    return day.replace(day=1)
+
+
+def refresh_buckets(buckets: Iterable[tuple[int, datetime.date]]) -> int:
+    """Rebuild the given ``(machine_id, month)`` rollups from raw records.
+
+    Buckets are deleted and re-inserted so months whose last record was
+    removed disappear from the rollup.
+    """
+
+    pairs = sorted({(int(machine_id), month.replace(day=1)) for machine_id, month in buckets})
+    if not pairs:
+        return 0
+
+    params = [[machine_id for machine_id, _ in pairs], [month for _, month in pairs]]
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            """
+            DELETE FROM maintenance_machine_monthly_stats AS s
+            USING unnest(%s::bigint[], %s::date[]) AS b(machine_id, month)
+            WHERE s.machine_id = b.machine_id AND s.month = b.month
+            """,
+            params,
+        )
+        cursor.execute(
+            _ROLLUP_SQL.format(
+                scope=f"""
+                JOIN unnest(%s::bigint[], %s::date[]) AS b(machine_id, month)
+                    ON b.machine_id = r.machine_id AND b.month = {_MONTH_SQL}
+                """
+            ),
+            params,
+        )
+    return len(pairs)
+
+
+_ADVANCE_WATERMARK_SQL = """
+    INSERT INTO maintenance_rollup_watermark (id, last_record_id, refreshed_at)
+    VALUES (1, %s, NOW())
+    ON CONFLICT (id) DO UPDATE SET
+        last_record_id = GREATEST(maintenance_rollup_watermark.last_record_id, EXCLUDED.last_record_id),
+        refreshed_at = EXCLUDED.refreshed_at
+"""
+
+
+def refresh_new_records() -> int:
+    """Fold records past the watermark into their buckets.
+
+    This catches records inserted by the PHP application, which bypasses the
+    Django signal handlers below.  The watermark lives in its own row and only
+    moves here, to the highest id scanned; the per-bucket ``last_record_id``
+    also moves on admin saves and would skip lower-id records elsewhere.
+    """
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute("SELECT last_record_id FROM maintenance_rollup_watermark WHERE id = 1 FOR UPDATE")
+        row = cursor.fetchone()
+        watermark = row[0] if row else 0
+        cursor.execute("SELECT MAX(id) FROM maintenance_records WHERE id > %s", [watermark])
+        ceiling = cursor.fetchone()[0]
+        if ceiling is None:
+            return 0
+        cursor.execute(
+            f"""
+            SELECT DISTINCT r.machine_id, {_MONTH_SQL}
+            FROM maintenance_records r
+            WHERE r.id > %s AND r.id <= %s
+            """,
+            [watermark, ceiling],
+        )
+        refreshed = refresh_buckets(cursor.fetchall())
+        cursor.execute(_ADVANCE_WATERMARK_SQL, [ceiling])
+    return refreshed
+
+
+def rebuild_all() -> int:
+    """Recompute every rollup from scratch and return the bucket count."""
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute("LOCK TABLE maintenance_machine_monthly_stats IN SHARE ROW EXCLUSIVE MODE")
+        cursor.execute("DELETE FROM maintenance_machine_monthly_stats")
+        cursor.execute(_ROLLUP_SQL.format(scope=""))
+        buckets = cursor.rowcount
+        cursor.execute("SELECT COALESCE(MAX(id), 0) FROM maintenance_records")
+        cursor.execute(_ADVANCE_WATERMARK_SQL, [cursor.fetchone()[0]])
+        return buckets
+
+
+@dataclass(frozen=True)
+class Reliability:
+    """Window totals for one machine with derived MTBF/MTTR estimates.
+
+    A failure is a record with downtime; MTBF is uptime in the window divided
+    by failures and MTTR is downtime per failure.
+    """
+
+    failures: int
+    downtime_minutes: int
+    period_hours: float
+    records: int = 0
+    labor_hours: Decimal = Decimal("0")
+
+    @classmethod
+    def for_window(cls, months: int = RELIABILITY_WINDOW_MONTHS, **totals) -> "Reliability":
+        return cls(period_hours=window_hours(months), **totals)
+
+    @property
+    def mttr_minutes(self) -> float | None:
+        if not self.failures:
+            return None
+        return self.downtime_minutes / self.failures
+
+    @property
+    def mtbf_hours(self) -> float | None:
+        if not self.failures:
+            return None
+        return max(self.period_hours - self.downtime_minutes / 60, 0) / self.failures
+
+
+def window_start(months: int, today: datetime.date | None = None) -> datetime.date:
+    """First day of the month ``months - 1`` months before ``today``'s month."""
+
+    today = today or timezone.localdate()
+    index = today.year * 12 + today.month - 1 - (months - 1)
+    return datetime.date(index // 12, index % 12 + 1, 1)
+
+
+def window_hours(months: int, today: datetime.date | None = None) -> float:
+    """Elapsed hours from ``window_start`` through the end of ``today``."""
+
+    today = today or timezone.localdate()
+    return ((today - window_start(months, today)).days + 1) * 24.0
+
+
+def machine_reliability(months: int = RELIABILITY_WINDOW_MONTHS) -> dict[int, Reliability]:
+    """Aggregate the rollups over a trailing window, one query for all machines."""
+
+    rows = (
+        models.MaintenanceMachineMonthlyStat.objects.filter(month__gte=window_start(months))
+        .values("machine_id")
+        .annotate(
+            records=Sum("record_count"),
+            failures=Sum("failure_count"),
+            downtime=Sum("downtime_minutes"),
+            labor=Sum("labor_hours"),
+        )
+        .order_by()
+    )
+    return {
+        row["machine_id"]: Reliability.for_window(
+            months,
+            failures=row["failures"] or 0,
+            downtime_minutes=row["downtime"] or 0,
+            records=row["records"] or 0,
+            labor_hours=row["labor"] or Decimal("0"),
+        )
+        for row in rows
+    }
+
+
+@receiver(pre_save, sender=models.MaintenanceRecord, dispatch_uid="maintenance_record_rollup_pre_save")
+def _remember_previous_bucket(sender, instance, **kwargs) -> None:
+    instance._previous_rollup_bucket = None
+    if instance.pk:
+        previous = (
+            models.MaintenanceRecord.objects.filter(pk=instance.pk)
+            .values_list("machine_id", "performed_at", "created_at")
+            .first()
+        )
+        if previous:
+            instance._previous_rollup_bucket = (previous[0], record_month(previous[1], previous[2]))
+
+
+@receiver(post_save, sender=models.MaintenanceRecord, dispatch_uid="maintenance_record_rollup_save")
+@receiver(post_delete, sender=models.MaintenanceRecord, dispatch_uid="maintenance_record_rollup_delete")
+def _record_changed(sender, instance, **kwargs) -> None:
+    buckets = [(instance.machine_id, record_month(instance.performed_at, instance.created_at))]
+    previous = getattr(instance, "_previous_rollup_bucket", None)
+    if previous:
+        buckets.append(previous)
+    transaction.on_commit(lambda: refresh_buckets(buckets))
@@ -0,0 +1,192 @@
+"""Row sources for the long-running admin exports.
+
+Each report is a queryset (so it can be streamed in keyset pages or with a
+server-side cursor) plus a function turning one ``values()`` row into CSV
+cells.  The replenishment columns follow ``inventoryLoadReplenishmentSnapshot``.
+"""
+from __future__ import annotations
+
+import datetime
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Callable
+
+from django.db.models import F, OuterRef, QuerySet, Subquery
+
+from .. import models
+from .uom import ConversionTable, ItemUnits, conversion_table
+
+ZERO = Decimal("0")
+
+
+@dataclass(frozen=True)
+class Report:
+    filename: str
+    header: tuple[str, ...]
+    queryset: QuerySet
+    row: Callable[[dict], list]
+    # Synchronous setup run once before rows stream, e.g. loading lookup tables.
+    prepare: Callable[[], None] | None = None
+
+
+def _latest_unit_cost() -> Subquery:
+    lines = models.PurchaseOrderLine.objects.filter(inventory_item=OuterRef("pk")).order_by("-created_at", "-id")
+    return Subquery(lines.values("unit_cost")[:1])
+
+
+def stock_valuation() -> Report:
+    """On-hand stock valued at each item's most recent purchase order unit cost."""
+
+    queryset = models.InventoryItem.objects.annotate(unit_cost=_latest_unit_cost()).values(
+        "pk", "sku", "item", "location", "stock", "unit_cost"
+    )
+
+    def row(values: dict) -> list:
+        unit_cost = values["unit_cost"]
+        value = None if unit_cost is None else (unit_cost * values["stock"]).quantize(Decimal("0.01"))
+        return [values["sku"], values["item"], values["location"], values["stock"], unit_cost, value]
+
+    return Report(
+        filename="stock-valuation.csv",
+        header=("sku", "item", "location", "stock", "unit_cost", "value"),
+        queryset=queryset,
+        row=row,
+    )
+
+
+def ledger_lines(start: datetime.date | None = None, end: datetime.date | None = None) -> Report:
+    """Every inventory transaction line, optionally limited to a date range."""
+
+    queryset = models.InventoryTransactionLine.objects.all()
+    if start is not None:
+        queryset = queryset.filter(transaction__created_at__date__gte=start)
+    if end is not None:
+        queryset = queryset.filter(transaction__created_at__date__lte=end)
+    queryset = queryset.values(
+        "pk",
+        "transaction_id",
+        "quantity_change",
+        "stock_before",
+        "stock_after",
+        "note",
+        reference=F("transaction__reference"),
+        created_at=F("transaction__created_at"),
+        sku=F("inventory_item__sku"),
+        item=F("inventory_item__item"),
+    )
+
+    def row(values: dict) -> list:
+        return [
+            values["transaction_id"],
+            values["created_at"].isoformat(),
+            values["reference"],
+            values["sku"],
+            values["item"],
+            values["quantity_change"],
+            values["stock_before"],
+            values["stock_after"],
+            values["note"] or "",
+        ]
+
+    return Report(
+        filename="inventory-ledger.csv",
+        header=(
+            "transaction_id",
+            "created_at",
+            "reference",
+            "sku",
+            "item",
+            "quantity_change",
+            "stock_before",
+            "stock_after",
+            "note",
+        ),
+        queryset=queryset,
+        row=row,
+    )
+
+
+def recommended_order_quantity(reorder_point: int, available_now: Decimal) -> Decimal:
+    """Mirror of ``inventoryCalculateRecommendedOrderQuantity``."""
+
+    shortfall = max(0, reorder_point) - available_now
+    return round(shortfall, 3) if shortfall > 0 else ZERO
+
+
+def replenishment(include_all: bool = False) -> Report:
+    """Replenishment run: lead-time demand, shortfall and suggested order per item."""
+
+    queryset = models.InventoryItem.objects.exclude(status__iexact="discontinued")
+    if not include_all:
+        queryset = queryset.filter(stock__lt=F("committed_qty") + F("reorder_point"))
+    queryset = queryset.values(
+        "pk",
+        "sku",
+        "item",
+        "stock",
+        "committed_qty",
+        "on_order_qty",
+        "average_daily_use",
+        "lead_time_days",
+        "safety_stock",
+        "reorder_point",
+        "pack_size",
+        "purchase_uom",
+        "stock_uom",
+        supplier_name=F("supplier_ref__name"),
+        supplier_lead_time=F("supplier_ref__default_lead_time_days"),
+    )
+
+    tables: dict[str, ConversionTable] = {}
+
+    def prepare() -> None:
+        tables["uom"] = conversion_table()
+
+    def row(values: dict) -> list:
+        available_now = Decimal(values["stock"] - values["committed_qty"])
+        on_order = values["on_order_qty"] or ZERO
+        lead_time = values["lead_time_days"] if values["lead_time_days"] > 0 else values["supplier_lead_time"] or 0
+        daily_use = values["average_daily_use"]
+        demand = daily_use * max(0, lead_time) if daily_use is not None else ZERO
+        target = demand + (values["safety_stock"] or ZERO)
+        projected = available_now + on_order
+        recommended = recommended_order_quantity(values["reorder_point"], available_now)
+        units = ItemUnits(
+            values["pk"], values["pack_size"] or ZERO, values["purchase_uom"], values["stock_uom"], tables["uom"]
+        )
+        purchase_qty, _ = units.order_quantity(recommended)
+        return [
+            values["sku"],
+            values["item"],
+            values["supplier_name"] or "",
+            available_now,
+            on_order,
+            daily_use,
+            lead_time,
+            round(target, 3),
+            round(max(ZERO, target - projected), 3),
+            recommended,
+            purchase_qty,
+            values["purchase_uom"] or values["stock_uom"] or "",
+        ]
+
+    return Report(
+        filename="replenishment.csv",
+        header=(
+            "sku",
+            "item",
+            "supplier",
+            "available_now",
+            "on_order_qty",
+            "average_daily_use",
+            "lead_time_days",
+            "target_stock",
+            "projected_shortfall",
+            "recommended_order_qty",
+            "recommended_purchase_qty",
+            "purchase_uom",
+        ),
+        queryset=queryset,
+        row=row,
+        prepare=prepare,
+    )
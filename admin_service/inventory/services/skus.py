@@ -0,0 +1,203 @@
+"""SKU codec and a cached part-number → finish variant index.
+
+``parse_sku``, ``compose_sku`` and ``normalize_finish`` mirror
+``inventoryParseSku``, ``inventoryComposeSku`` and
+``inventoryNormalizeFinish``.  :func:`variant_index` keeps every item's
+(part number, finish) in memory so "all finishes of this part" and
+finish-agnostic matching are dictionary lookups; the SQL side uses the
+``upper(part_number), finish`` index from migration 0010.
+"""
+from __future__ import annotations
+
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Iterable
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .. import models
+from .change_feed import inventory_changed
+
+FINISH_OPTIONS = ("BL", "C2", "DB", "0R")
+INDEX_TTL_SECONDS = 60
+
+_SEGMENT_RE = re.compile(r"-+")
+
+
+def normalize_finish(finish: str | None) -> str | None:
+    """Upper-cased finish code, or ``None`` when it is not a known finish."""
+
+    if finish is None:
+        return None
+    normalized = finish.strip().upper()
+    return normalized if normalized in FINISH_OPTIONS else None
+
+
+def normalize_part_number(part_number: str | None) -> str:
+    return (part_number or "").strip().upper()
+
+
+def parse_sku(sku: str) -> tuple[str, str | None]:
+    """Split a SKU into ``(part_number, finish)``; a trailing finish code is optional."""
+
+    segments = [segment for segment in _SEGMENT_RE.split(sku.strip()) if segment]
+    finish = None
+    if len(segments) > 1 and segments[-1].upper() in FINISH_OPTIONS:
+        finish = segments.pop().upper()
+    return "-".join(segments), finish
+
+
+def compose_sku(part_number: str, finish: str | None) -> str:
+    return "-".join(segment for segment in (part_number.strip(), normalize_finish(finish) or "") if segment)
+
+
+@dataclass(frozen=True)
+class SkuVariant:
+    """One inventory item as a finish of its part number."""
+
+    item_id: int
+    sku: str
+    part_number: str
+    finish: str | None
+
+
+class VariantIndex:
+    """In-memory snapshot of every item keyed by part number and SKU."""
+
+    def __init__(self, rows: Iterable[tuple]) -> None:
+        self._parts: dict[str, dict[str | None, SkuVariant]] = {}
+        self._skus: dict[str, SkuVariant] = {}
+        self._items: dict[int, SkuVariant] = {}
+
+        for row in rows:
+            variant = self._variant(row)
+            # Duplicate (part, finish) pairs keep the oldest item, as the SQL lookups do.
+            self._parts.setdefault(normalize_part_number(variant.part_number), {}).setdefault(variant.finish, variant)
+            self._skus.setdefault((variant.sku or "").lower(), variant)
+            self._items[variant.item_id] = variant
+
+    @staticmethod
+    def _variant(row: tuple) -> SkuVariant:
+        item_id, sku, part_number, finish = row
+        if not part_number:
+            part_number, parsed_finish = parse_sku(sku or "")
+            finish = finish or parsed_finish
+        return SkuVariant(item_id, sku, part_number, normalize_finish(finish))
+
+    def unchanged(self, rows: Iterable[tuple], item_ids: Iterable[int]) -> bool:
+        """Whether the items' current ``(id, sku, part_number, finish)`` rows match the index.
+
+        Ids in ``item_ids`` without a row count as deleted.
+        """
+
+        current = {variant.item_id: variant for variant in map(self._variant, rows)}
+        return all(self._items.get(item_id) == current.get(item_id) for item_id in item_ids)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def variants(self, part_number: str) -> list[SkuVariant]:
+        """Every finish stocked for ``part_number``, unfinished first."""
+
+        finishes = self._parts.get(normalize_part_number(part_number), {})
+        return sorted(finishes.values(), key=lambda variant: variant.finish or "")
+
+    def get(self, part_number: str, finish: str | None) -> SkuVariant | None:
+        return self._parts.get(normalize_part_number(part_number), {}).get(normalize_finish(finish))
+
+    def match(self, part_number: str, finish: str | None = None) -> SkuVariant | None:
+        """Finish-agnostic lookup: the exact finish, else the unfinished item, else the only variant."""
+
+        finishes = self._parts.get(normalize_part_number(part_number))
+        if not finishes:
+            return None
+        finish = normalize_finish(finish)
+        if finish in finishes:
+            return finishes[finish]
+        if None in finishes:
+            return finishes[None]
+        return next(iter(finishes.values())) if len(finishes) == 1 else None
+
+    def by_sku(self, sku: str) -> SkuVariant | None:
+        """Look a SKU up as stored, falling back to its parsed part number and finish."""
+
+        variant = self._skus.get(sku.strip().lower())
+        if variant is None:
+            variant = self.get(*parse_sku(sku))
+        return variant
+
+    def siblings(self, item_id: int) -> list[SkuVariant]:
+        """The other finishes of the item's part number."""
+
+        variant = self._items.get(item_id)
+        if variant is None:
+            return []
+        return [other for other in self.variants(variant.part_number) if other.item_id != item_id]
+
+
+_lock = threading.Lock()
+_index: VariantIndex | None = None
+_loaded_at = 0.0
+# Items the change feed reported since the index was loaded; most are stock
+# updates, so they are re-read and compared before the index is rebuilt.
+_touched: set[int] = set()
+
+
+def variant_index() -> VariantIndex:
+    """Return the cached index, reloading it with one query when stale.
+
+    Admin writes that change an item's SKU, part number or finish invalidate
+    the cache immediately; items the change feed reports are re-read here and
+    only a real catalogue change reloads it.  The TTL covers PHP writes when
+    the feed is off.
+    """
+
+    global _index, _loaded_at
+
+    with _lock:
+        rows = models.InventoryItem.objects.values_list("id", "sku", "part_number", "finish")
+        if _index is not None and _touched:
+            if not _index.unchanged(rows.filter(id__in=list(_touched)), _touched):
+                _index = None
+            _touched.clear()
+        if _index is None or time.monotonic() - _loaded_at > INDEX_TTL_SECONDS:
+            _index = VariantIndex(rows.order_by("id").iterator(chunk_size=5000))
+            _loaded_at = time.monotonic()
+        return _index
+
+
+def invalidate_variant_index() -> None:
+    global _index
+
+    with _lock:
+        _index = None
+        _touched.clear()
+
+
+@receiver(post_save, sender=models.InventoryItem, dispatch_uid="inventory_item_variant_index_save")
+def _inventory_item_saved(sender, instance, **kwargs) -> None:
+    index = _index
+    row = (instance.pk, instance.sku, instance.part_number, instance.finish)
+    if index is not None and not index.unchanged([row], [instance.pk]):
+        invalidate_variant_index()
+
+
+@receiver(post_delete, sender=models.InventoryItem, dispatch_uid="inventory_item_variant_index_delete")
+def _inventory_item_deleted(sender, **kwargs) -> None:
+    invalidate_variant_index()
+
+
+@receiver(inventory_changed, dispatch_uid="variant_index_change_feed")
+def _inventory_items_notified(sender, batch, **kwargs) -> None:
+    if not batch.changed("inventory_items"):
+        return
+    ids = batch.ids("inventory_items")
+    if ids is None:
+        invalidate_variant_index()
+        return
+    with _lock:
+        if _index is not None:
+            _touched.update(ids)
@@ -0,0 +1,120 @@
+"""Putaway suggestions for received stock based on bin occupancy."""
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+from collections import defaultdict
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Iterable
+
+from .. import models
+from .locations import LocationTree, location_tree
+
+
+@dataclass(frozen=True)
+class PutawaySuggestion:
+    inventory_item_id: int
+    quantity: Decimal
+    storage_location_id: int | None
+    location: str
+    reason: str
+
+
+class OccupancyIndex:
+    """Which items sit in which bins, kept in pick-path rank space.
+
+    Built from a single ``inventory_item_locations`` scan and updated in
+    place as suggestions are handed out, so one index can serve a whole
+    receipt without further queries.
+    """
+
+    def __init__(self, tree: LocationTree, assignments: Iterable[tuple[int, int, int]]) -> None:
+        self.tree = tree
+        self.rank = tree.pick_path_rank()
+        self._by_rank = {rank: location_id for location_id, rank in self.rank.items()}
+        self.item_bins: dict[int, list[int]] = defaultdict(list)
+        occupied: set[int] = set()
+
+        for item_id, location_id, quantity in assignments:
+            if location_id not in self.rank:
+                continue
+            self.item_bins[item_id].append(location_id)
+            if quantity > 0:
+                occupied.add(location_id)
+
+        for bins in self.item_bins.values():
+            bins.sort(key=self.rank.__getitem__)
+
+        self.free_ranks = sorted(
+            self.rank[location_id]
+            for location_id in tree.active
+            if location_id in self.rank and location_id not in occupied
+        )
+
+    @classmethod
+    def load(cls) -> "OccupancyIndex":
+        rows = (
+            models.InventoryItemLocation.objects.order_by()
+            .values_list("inventory_item_id", "storage_location_id", "quantity")
+            .iterator(chunk_size=5000)
+        )
+        return cls(location_tree(), rows)
+
+    def occupy(self, item_id: int, location_id: int) -> None:
+        rank = self.rank[location_id]
+        index = bisect_left(self.free_ranks, rank)
+        if index < len(self.free_ranks) and self.free_ranks[index] == rank:
+            self.free_ranks.pop(index)
+        if location_id not in self.item_bins[item_id]:
+            insort(self.item_bins[item_id], location_id, key=self.rank.__getitem__)
+
+    def nearest_free(self, anchor_rank: int) -> int | None:
+        """Return the free bin closest to ``anchor_rank`` along the pick path."""
+
+        if not self.free_ranks:
+            return None
+        index = bisect_left(self.free_ranks, anchor_rank)
+        candidates = self.free_ranks[max(index - 1, 0) : index + 1]
+        best = min(candidates, key=lambda rank: (abs(rank - anchor_rank), rank))
+        return self._by_rank[best]
+
+    def suggest(self, item_id: int, quantity: Decimal) -> PutawaySuggestion:
+        bins = [location_id for location_id in self.item_bins.get(item_id, ()) if location_id in self.tree.active]
+        if bins:
+            location_id = bins[0]
+            reason = "existing bin"
+        else:
+            anchor = self.rank[self.item_bins[item_id][0]] if self.item_bins.get(item_id) else 0
+            location_id = self.nearest_free(anchor)
+            reason = "nearest free bin"
+
+        if location_id is None:
+            return PutawaySuggestion(item_id, quantity, None, "", "no free bin")
+
+        self.occupy(item_id, location_id)
+        return PutawaySuggestion(item_id, quantity, location_id, self.tree.paths[location_id], reason)
+
+
+def suggest_putaway(
+    lines: Iterable[tuple[int, Decimal]],
+    index: OccupancyIndex | None = None,
+) -> list[PutawaySuggestion]:
+    """Suggest a bin for each ``(inventory_item_id, quantity)`` line."""
+
+    index = index or OccupancyIndex.load()
+    return [index.suggest(int(item_id), Decimal(quantity)) for item_id, quantity in lines]
+
+
+def suggest_for_receipt(receipt_id: int) -> list[PutawaySuggestion]:
+    """Suggest bins for every stocked line received on a purchase order receipt."""
+
+    lines = (
+        models.PurchaseOrderReceiptLine.objects.filter(
+            receipt_id=receipt_id,
+            quantity_received__gt=0,
+            purchase_order_line__inventory_item__isnull=False,
+        )
+        .order_by("id")
+        .values_list("purchase_order_line__inventory_item_id", "quantity_received")
+    )
+    return suggest_putaway(lines)
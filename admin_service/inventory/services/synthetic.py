@@ -0,0 +1,854 @@
+"""Synthetic, internally consistent datasets for load tests and benchmarks.
+
+:func:`generate` plans every row from a seeded RNG, spools each table to a
+temporary CSV file and loads it with one ``COPY`` per table, in foreign-key
+order and inside one transaction.  The data hangs together the way the
+services expect:
+
+* each item's ledger lines chain ``stock_before``/``stock_after`` in time
+  order and end at ``inventory_items.stock``, which its bins add up to;
+* purchase order receipts post their own ledger transaction, and closed,
+  partially received and cancelled orders carry matching line quantities;
+* issues feed ``inventory_daily_usage``, in-progress cycle counts hold
+  uncounted and unposted lines, and maintenance records list parts by SKU.
+
+Derived columns and rollups (committed and on-order quantities, item
+status, average daily use, task due dates, reliability, lead times and
+dashboard metrics) are then rebuilt by the services that own them.
+
+Names, SKUs and document numbers start with a prefix, so a dataset is easy
+to tell apart from real rows and several can be loaded side by side.  Ids
+are taken above the current maximum while the tables are locked against
+other writers: load into a test or staging database.
+"""
+from __future__ import annotations
+
+import csv
+import datetime
+import json
+import random
+import tempfile
+import time
+from collections import defaultdict
+from typing import Callable
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from . import dashboard, lead_times, maintenance_schedule, reliability
+from .ledger import refresh_average_daily_use
+from .lookup_cache import bump_tables
+from .receiving import update_on_order_quantities
+from .skus import FINISH_OPTIONS, compose_sku
+
+SCALES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+MIN_ITEMS = 100
+HISTORY_DAYS = 365
+
+_NULL = r"\N"
+_FINISHES = (None, None, *FINISH_OPTIONS)
+_MATERIALS = ("Aluminum", "Steel", "Stainless", "Brass", "Bronze", "Nylon", "Vinyl", "Zinc")
+_PARTS = (
+    "Hinge Jamb", "Lock Jamb", "Door Head", "Threshold", "Glass Stop", "Pivot", "Closer Arm", "Push Bar",
+    "Sill Angle", "Setting Block", "Corner Key", "Anchor Clip", "Weatherstrip", "Screw Pack", "Rivet Pack",
+)
+_SIZES = ("1/4in", "3/8in", "1/2in", "1in", "2in", "8ft", "12ft", "16ft", "24ft")
+_SUPPLIER_WORDS = (
+    ("Northern", "Atlas", "Summit", "Keystone", "Pioneer", "Lakeside", "Granite", "Harbor", "Union", "Prairie"),
+    ("Metals", "Glass", "Hardware", "Fasteners", "Extrusions", "Supply", "Industrial", "Architectural"),
+)
+_PEOPLE = ("A. Novak", "B. Ortiz", "C. Reyes", "D. Walsh", "E. Chen", "F. Haddad", "G. Lindqvist", "H. Okafor")
+_JOB_SITES = ("Riverside", "Oak Street", "Harbor View", "Maple Court", "Civic Center", "North Campus", "Mill Yard")
+_JOB_KINDS = ("storefront", "entrance", "curtain wall", "interior glazing", "retrofit", "vestibule")
+_TRANSACTION_KINDS = ("Job issue", "Shop floor issue", "Stock adjustment", "Restock", "Return to stock")
+_EQUIPMENT_TYPES = ("CNC Machining Center", "Chop saw", "Upcut Saw", "Drill Press", "Punch Press")
+_MANUFACTURERS = ("Emmegi", "Haffner", "Elumatec", "Kalamazoo", "Clausing", "Pertici")
+_TASK_TITLES = (
+    "Lubricate spindle", "Replace coolant", "Inspect blade", "Check belt tension", "Clean chip tray",
+    "Calibrate fence", "Grease bearings", "Inspect air lines", "Replace filters", "Check hydraulic level",
+)
+_DOCUMENTS = ("Operator manual", "Parts list", "Wiring diagram", "Safety checklist")
+_USE_OPTIONS = {
+    "door": ("Door", ("Stile", "Rail", "Door Glass Stop")),
+    "frame": ("Frame", ("Jamb", "Head", "Sill")),
+    "hardware": ("Hardware", ("Hinge", "Closer", "Lock")),
+}
+
+# (value, weight)
+_PO_STATUSES = (("draft", 10), ("sent", 30), ("partially_received", 15), ("closed", 40), ("cancelled", 5))
+_RESERVATION_STATUSES = (
+    ("draft", 10), ("committed", 20), ("active", 25), ("on_hold", 5),
+    ("in_progress", 15), ("fulfilled", 20), ("cancelled", 5),
+)
+_TASK_UNITS = (("day", 10), ("week", 30), ("month", 45), ("year", 15))
+_TASK_COUNTS = {"day": (1, 2, 3, 7), "week": (1, 2, 4), "month": (1, 2, 3, 6), "year": (1,)}
+_TASK_STATUSES = (("active", 85), ("paused", 10), ("retired", 5))
+_PRIORITIES = (("low", 20), ("medium", 50), ("high", 25), ("critical", 5))
+_JOB_SCOPES = (("door_and_frame", 60), ("frame_only", 25), ("door_only", 15))
+_CONFIGURATION_STATUSES = (("draft", 50), ("in_progress", 30), ("released", 20))
+# Generic ledger movements per item, the first being its opening balance.
+_MOVES_PER_ITEM = (1, 1, 2, 2, 2, 3, 3, 4, 5, 6)
+_COUNT_ERRORS = (0, 0, 0, 0, 0, 0, 0, 0, -2, -1, 1, 2)
+_PACK_SIZES = (6, 10, 12, 25, 50, 100)
+
+# Tables given explicit ids, in load order.
+_ID_TABLES = (
+    "suppliers", "storage_locations", "inventory_items", "inventory_item_locations", "uom_conversions",
+    "inventory_transactions", "inventory_transaction_lines", "purchase_orders", "purchase_order_lines",
+    "purchase_order_receipts", "purchase_order_receipt_lines", "job_reservations", "job_reservation_items",
+    "cycle_count_sessions", "cycle_count_lines", "maintenance_machines", "maintenance_tasks",
+    "maintenance_records", "configurator_part_use_options", "configurator_jobs", "configurator_configurations",
+    "configurator_configuration_doors",
+)
+
+
+def scale_size(value: str) -> int:
+    """Item count for ``10k``, ``100k``, ``1m`` or a plain number."""
+
+    label = str(value).strip().lower().replace("_", "")
+    size = SCALES.get(label)
+    if size is None:
+        try:
+            size = int(label)
+        except ValueError:
+            raise ValueError(f"Unknown scale {value!r}; use {', '.join(SCALES)} or a number of items.") from None
+    if size < MIN_ITEMS:
+        raise ValueError(f"A dataset needs at least {MIN_ITEMS} items.")
+    return size
+
+
+def scale_label(items: int) -> str:
+    """The largest named scale ``items`` reaches, or the count itself."""
+
+    reached = [label for label, size in SCALES.items() if items >= size]
+    return reached[-1] if reached else str(items)
+
+
+def volumes(items: int) -> dict[str, int]:
+    """Header rows per table for a dataset of ``items`` items; line tables follow from these."""
+
+    return {
+        "inventory_items": items,
+        "suppliers": max(10, items // 200),
+        "storage_locations": max(50, items // 10),
+        "inventory_transactions": max(20, items // 10),
+        "purchase_orders": max(10, items // 20),
+        "job_reservations": max(10, items // 50),
+        "cycle_count_sessions": max(3, items // 5000),
+        "maintenance_machines": max(10, items // 2000),
+        "maintenance_records": max(50, items // 20),
+        "configurator_jobs": max(5, items // 1000),
+    }
+
+
+def _copy_value(value) -> str:
+    if value is None:
+        return _NULL
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, datetime.datetime):
+        return value.isoformat(sep=" ")
+    if isinstance(value, (list, dict)):
+        return json.dumps(value)
+    return str(value)
+
+
+class _CopyFile:
+    """Rows for one table, spooled to disk in ``COPY ... CSV`` format."""
+
+    def __init__(self, table: str, columns: tuple[str, ...]) -> None:
+        self.table = table
+        self.columns = columns
+        self.count = 0
+        self._file = tempfile.TemporaryFile(mode="w+", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._file)
+
+    def add(self, *values) -> None:
+        self._writer.writerow([_copy_value(value) for value in values])
+        self.count += 1
+
+    def load(self, cursor) -> int:
+        self._file.seek(0)
+        cursor.copy_expert(
+            f"COPY {self.table} ({', '.join(self.columns)}) FROM STDIN WITH (FORMAT csv, NULL '{_NULL}')",
+            self._file,
+        )
+        self._file.close()
+        return self.count
+
+
+def _weighted(rng: random.Random, choices: tuple[tuple[str, int], ...]) -> str:
+    return rng.choices([value for value, _ in choices], [weight for _, weight in choices])[0]
+
+
+class _Dataset:
+    def __init__(self, items: int, rng: random.Random, prefix: str, now: datetime.datetime) -> None:
+        self.size = items
+        self.rng = rng
+        self.prefix = prefix
+        self.now = now
+        self.start = now - datetime.timedelta(days=HISTORY_DAYS)
+        self.volumes = volumes(items)
+        self.first_id: dict[str, int] = {}
+        self._next_id: dict[str, int] = {}
+        self.files: list[_CopyFile] = []
+
+        table = self._table
+        self.suppliers = table(
+            "suppliers",
+            "id", "name", "contact_name", "contact_email", "contact_phone", "default_lead_time_days",
+            "created_at", "updated_at",
+        )
+        self.locations = table(
+            "storage_locations",
+            "id", "name", "is_active", "sort_order", "aisle", "rack", "shelf", "bin", "created_at", "updated_at",
+        )
+        self.items = table(
+            "inventory_items",
+            "id", "item", "sku", "part_number", "finish", "location", "stock", "committed_qty", "on_order_qty",
+            "safety_stock", "min_order_qty", "order_multiple", "pack_size", "purchase_uom", "stock_uom", "status",
+            "supplier", "supplier_id", "supplier_contact", "supplier_sku", "reorder_point", "lead_time_days",
+        )
+        self.bins = table(
+            "inventory_item_locations", "id", "inventory_item_id", "storage_location_id", "quantity"
+        )
+        self.conversions = table("uom_conversions", "id", "inventory_item_id", "unit", "stock_per_unit", "notes")
+        self.transactions = table("inventory_transactions", "id", "reference", "notes", "created_at")
+        self.ledger = table(
+            "inventory_transaction_lines",
+            "id", "transaction_id", "inventory_item_id", "quantity_change", "note", "stock_before", "stock_after",
+        )
+        self.usage = table("inventory_daily_usage", "inventory_item_id", "usage_date", "quantity_used")
+        self.orders = table(
+            "purchase_orders",
+            "id", "order_number", "supplier_id", "status", "order_date", "expected_date", "total_cost",
+            "created_at", "updated_at",
+        )
+        self.order_lines = table(
+            "purchase_order_lines",
+            "id", "purchase_order_id", "inventory_item_id", "description", "quantity_ordered", "quantity_received",
+            "quantity_cancelled", "unit_cost", "packs_ordered", "pack_size", "purchase_uom", "stock_uom",
+            "expected_date", "created_at", "updated_at",
+        )
+        self.receipts = table(
+            "purchase_order_receipts", "id", "purchase_order_id", "inventory_transaction_id", "reference", "created_at"
+        )
+        self.receipt_lines = table(
+            "purchase_order_receipt_lines",
+            "id", "receipt_id", "purchase_order_line_id", "quantity_received", "quantity_cancelled",
+        )
+        self.reservations = table(
+            "job_reservations",
+            "id", "job_number", "job_name", "requested_by", "needed_by", "status", "created_at", "updated_at",
+        )
+        self.reservation_lines = table(
+            "job_reservation_items",
+            "id", "reservation_id", "inventory_item_id", "requested_qty", "committed_qty", "consumed_qty",
+        )
+        self.sessions = table(
+            "cycle_count_sessions",
+            "id", "name", "status", "started_at", "completed_at", "total_lines", "completed_lines",
+        )
+        self.count_lines = table(
+            "cycle_count_lines",
+            "id", "session_id", "inventory_item_id", "sequence", "expected_qty", "counted_qty", "variance",
+            "counted_at", "is_skipped",
+        )
+        self.machines = table(
+            "maintenance_machines",
+            "id", "name", "equipment_type", "manufacturer", "model", "serial_number", "location", "documents",
+            "created_at", "updated_at",
+        )
+        self.tasks = table(
+            "maintenance_tasks",
+            "id", "machine_id", "title", "frequency", "assigned_to", "interval_count", "interval_unit",
+            "start_date", "status", "priority", "created_at", "updated_at",
+        )
+        self.records = table(
+            "maintenance_records",
+            "id", "machine_id", "task_id", "performed_by", "performed_at", "notes", "attachments",
+            "downtime_minutes", "labor_hours", "parts_used", "created_at",
+        )
+        self.use_options = table("configurator_part_use_options", "id", "name", "parent_id")
+        self.profiles = table(
+            "configurator_part_profiles",
+            "inventory_item_id", "is_enabled", "part_type", "height_lz", "depth_ly", "created_at",
+        )
+        self.use_links = table("configurator_part_use_links", "inventory_item_id", "use_option_id")
+        self.requirements = table(
+            "configurator_part_requirements", "inventory_item_id", "required_inventory_item_id", "quantity"
+        )
+        self.jobs = table("configurator_jobs", "id", "job_number", "name", "created_at")
+        self.configurations = table(
+            "configurator_configurations",
+            "id", "name", "job_id", "job_scope", "quantity", "status", "created_at", "updated_at",
+        )
+        self.doors = table("configurator_configuration_doors", "id", "configuration_id", "door_tag", "created_at")
+
+    def _table(self, name: str, *columns: str) -> _CopyFile:
+        copy_file = _CopyFile(name, columns)
+        self.files.append(copy_file)
+        return copy_file
+
+    def _id(self, table: str) -> int:
+        value = self._next_id[table]
+        self._next_id[table] = value + 1
+        return value
+
+    def _moment(self, earliest: datetime.datetime | None = None) -> datetime.datetime:
+        earliest = earliest or self.start
+        return earliest + datetime.timedelta(seconds=self.rng.uniform(0, (self.now - earliest).total_seconds()))
+
+    def item_id(self, index: int) -> int:
+        return self.first_id["inventory_items"] + index
+
+    def sku(self, index: int) -> str:
+        return compose_sku(f"{self.prefix}{self.item_id(index):07d}", _FINISHES[self.finish[index]])
+
+    # -- planning -----------------------------------------------------------
+
+    def plan(self) -> None:
+        self._plan_suppliers()
+        self._plan_locations()
+        self._plan_item_attributes()
+        self._plan_transactions()
+        receipts = self._plan_purchase_orders()
+        self._plan_items(receipts)
+        self._plan_reservations()
+        self._plan_cycle_counts()
+        self._plan_maintenance()
+        self._plan_configurator()
+
+    def _plan_suppliers(self) -> None:
+        rng = self.rng
+        self.supplier_rows: list[tuple[int, str, str, int]] = []
+        for _ in range(self.volumes["suppliers"]):
+            supplier_id = self._id("suppliers")
+            name = f"{self.prefix}{rng.choice(_SUPPLIER_WORDS[0])} {rng.choice(_SUPPLIER_WORDS[1])} {supplier_id}"
+            contact = rng.choice(_PEOPLE)
+            lead_days = rng.randint(3, 45)
+            self.suppliers.add(
+                supplier_id,
+                name,
+                contact,
+                f"orders{supplier_id}@example.com",
+                f"555-{rng.randint(100, 999)}-{rng.randint(1000, 9999)}",
+                lead_days,
+                self.start,
+                self.start,
+            )
+            self.supplier_rows.append((supplier_id, name, contact, lead_days))
+
+    def _plan_locations(self) -> None:
+        # Aisles of 10 racks x 5 shelves x 4 bins; the trigger derives location_key and path.
+        self.location_names: list[str] = []
+        self.active_locations: list[int] = []
+        for index in range(self.volumes["storage_locations"]):
+            aisle, rest = divmod(index, 200)
+            rack, rest = divmod(rest, 20)
+            shelf, bin_ = divmod(rest, 4)
+            parts = (f"{self.prefix}A{aisle + 1:02d}", f"R{rack + 1:02d}", f"S{shelf + 1}", f"B{bin_ + 1}")
+            is_active = self.rng.random() >= 0.03
+            self.locations.add(
+                self._id("storage_locations"), ".".join(parts), is_active, index, *parts, self.start, self.start
+            )
+            self.location_names.append(".".join(parts))
+            if is_active:
+                self.active_locations.append(index)
+
+    def _plan_item_attributes(self) -> None:
+        rng = self.rng
+        count = self.size
+        self.finish = bytearray(rng.randrange(len(_FINISHES)) for _ in range(count))
+        self.unit_cost = [rng.uniform(0.25, 250) for _ in range(count)]
+        self.pack = {index: rng.choice(_PACK_SIZES) for index in rng.sample(range(count), count // 20)}
+        self.stock = [0] * count
+
+    def _plan_transactions(self) -> None:
+        moments = sorted(self._moment() for _ in range(self.volumes["inventory_transactions"]))
+        self.generic_transactions: list[tuple[datetime.datetime, int]] = []
+        for moment in moments:
+            transaction_id = self._id("inventory_transactions")
+            self.transactions.add(
+                transaction_id, f"{self.rng.choice(_TRANSACTION_KINDS)} {self.prefix}{transaction_id}", None, moment
+            )
+            self.generic_transactions.append((moment, transaction_id))
+
+    def _plan_purchase_orders(self) -> dict[int, list[tuple]]:
+        """Orders, lines and receipts; returns item index -> ``(moment, transaction_id, quantity, note)``."""
+
+        rng = self.rng
+        received_by_item: dict[int, list[tuple]] = defaultdict(list)
+        today = timezone.localdate(self.now)
+        for _ in range(self.volumes["purchase_orders"]):
+            order_id = self._id("purchase_orders")
+            order_number = f"{self.prefix}PO-{order_id:07d}"
+            supplier_id, _, _, lead_days = rng.choice(self.supplier_rows)
+            status = _weighted(rng, _PO_STATUSES)
+            age = rng.randint(1, 45) if status in ("draft", "sent") else rng.randint(lead_days + 1, HISTORY_DAYS)
+            order_date = today - datetime.timedelta(days=age)
+            expected_date = order_date + datetime.timedelta(days=lead_days)
+            created_at = datetime.datetime.combine(order_date, datetime.time(8), tzinfo=datetime.timezone.utc)
+            created_at += datetime.timedelta(minutes=rng.randint(0, 540))
+            received_at = min(
+                created_at + datetime.timedelta(days=max(1, lead_days + rng.randint(-3, 10))),
+                self.now - datetime.timedelta(hours=1),
+            )
+
+            lines = []
+            for index in rng.sample(range(self.size), min(self.size, rng.randint(1, 15))):
+                pack = self.pack.get(index)
+                ordered = rng.randint(1, 20) * pack if pack else rng.randint(5, 250)
+                received = cancelled = 0
+                if status == "closed":
+                    received = ordered if rng.random() >= 0.1 else ordered // 2
+                    cancelled = ordered - received
+                elif status == "partially_received":
+                    # The first line is always short, so the order stays open.
+                    if not lines:
+                        received = ordered // 2
+                    elif rng.random() < 0.5:
+                        received = ordered
+                elif status == "cancelled":
+                    cancelled = ordered
+                unit_cost = round(self.unit_cost[index] * rng.uniform(0.9, 1.1), 2)
+                lines.append((index, ordered, received, cancelled, unit_cost))
+
+            total = 0.0
+            receipt_id = transaction_id = None
+            if any(received for _, _, received, _, _ in lines):
+                receipt_id = self._id("purchase_order_receipts")
+                transaction_id = self._id("inventory_transactions")
+                self.transactions.add(transaction_id, f"PO receipt {order_number}", None, received_at)
+                self.receipts.add(receipt_id, order_id, transaction_id, f"Receipt {order_number}", received_at)
+            for index, ordered, received, cancelled, unit_cost in lines:
+                line_id = self._id("purchase_order_lines")
+                pack = self.pack.get(index)
+                total += ordered * unit_cost
+                self.order_lines.add(
+                    line_id,
+                    order_id,
+                    self.item_id(index),
+                    self.sku(index),
+                    ordered,
+                    received,
+                    cancelled,
+                    f"{unit_cost:.2f}",
+                    ordered // pack if pack else 0,
+                    pack or 0,
+                    "box" if pack else None,
+                    "ea" if pack else None,
+                    expected_date,
+                    created_at,
+                    received_at if receipt_id else created_at,
+                )
+                if receipt_id and (received or cancelled):
+                    self.receipt_lines.add(
+                        self._id("purchase_order_receipt_lines"), receipt_id, line_id, received, cancelled
+                    )
+                if received:
+                    received_by_item[index].append(
+                        (received_at, transaction_id, received, f"Received on {order_number}")
+                    )
+            self.orders.add(
+                order_id,
+                order_number,
+                supplier_id,
+                status,
+                order_date,
+                expected_date,
+                f"{total:.2f}",
+                created_at,
+                received_at if receipt_id else created_at,
+            )
+        return received_by_item
+
+    def _plan_items(self, received_by_item: dict[int, list[tuple]]) -> None:
+        rng = self.rng
+        generic = self.generic_transactions
+        for index in range(self.size):
+            item_id = self.item_id(index)
+            picks = sorted(rng.sample(range(len(generic)), min(rng.choice(_MOVES_PER_ITEM), len(generic))))
+            events = [(*generic[pick], None, None) for pick in picks]
+            events.extend(received_by_item.pop(index, ()))
+            events.sort(key=lambda event: (event[0], event[1]))
+
+            stock = 0
+            opening = True
+            used: dict[datetime.date, int] = defaultdict(int)
+            for moment, transaction_id, quantity, note in events:
+                if quantity is None:
+                    if opening:
+                        quantity, note, opening = rng.randint(20, 400), "Opening balance", False
+                    elif stock and rng.random() < 0.7:
+                        quantity = -rng.randint(1, max(1, stock // 3))
+                    else:
+                        quantity = rng.randint(5, 150)
+                self.ledger.add(
+                    self._id("inventory_transaction_lines"),
+                    transaction_id,
+                    item_id,
+                    quantity,
+                    note,
+                    stock,
+                    stock + quantity,
+                )
+                if quantity < 0:
+                    used[moment.date()] -= quantity
+                stock += quantity
+            for usage_date, quantity in sorted(used.items()):
+                self.usage.add(item_id, usage_date, quantity)
+            self.stock[index] = stock
+
+            primary = rng.choice(self.active_locations)
+            bins = [(primary, stock)]
+            other = rng.choice(self.active_locations)
+            if other != primary and rng.random() < 0.4:
+                moved = rng.randint(0, stock // 2)
+                bins = [(primary, stock - moved), (other, moved)]
+            for location, quantity in bins:
+                self.bins.add(
+                    self._id("inventory_item_locations"),
+                    item_id,
+                    self.first_id["storage_locations"] + location,
+                    quantity,
+                )
+
+            pack = self.pack.get(index)
+            if pack:
+                self.conversions.add(self._id("uom_conversions"), item_id, "box", pack, None)
+            supplier_id, supplier, contact, lead_days = rng.choice(self.supplier_rows)
+            reorder_point = rng.randint(0, 60)
+            self.items.add(
+                item_id,
+                f"{rng.choice(_MATERIALS)} {rng.choice(_PARTS)} {rng.choice(_SIZES)}",
+                self.sku(index),
+                f"{self.prefix}{item_id:07d}",
+                _FINISHES[self.finish[index]],
+                self.location_names[primary],
+                stock,
+                0,
+                0,
+                reorder_point // 2,
+                rng.choice((0, 0, 10, 25, 50)),
+                pack or rng.choice((0, 0, 5, 10)),
+                pack or 0,
+                "box" if pack else None,
+                "ea" if pack else None,
+                "Discontinued" if rng.random() < 0.02 else "In Stock",
+                supplier,
+                supplier_id,
+                contact,
+                f"S{supplier_id}-{rng.randint(10000, 99999)}",
+                reorder_point,
+                max(1, lead_days + rng.randint(-2, 5)),
+            )
+
+    def _plan_reservations(self) -> None:
+        rng = self.rng
+        for _ in range(self.volumes["job_reservations"]):
+            reservation_id = self._id("job_reservations")
+            status = _weighted(rng, _RESERVATION_STATUSES)
+            created_at = self._moment(self.now - datetime.timedelta(days=120))
+            self.reservations.add(
+                reservation_id,
+                f"{self.prefix}JOB-{reservation_id:06d}",
+                f"{rng.choice(_JOB_SITES)} {rng.choice(_JOB_KINDS)}",
+                rng.choice(_PEOPLE),
+                (created_at + datetime.timedelta(days=rng.randint(7, 60))).date(),
+                status,
+                created_at,
+                created_at,
+            )
+            for index in rng.sample(range(self.size), min(self.size, rng.randint(1, 10))):
+                requested = rng.randint(1, 40)
+                committed = 0 if status in ("draft", "cancelled") else requested
+                consumed = {"fulfilled": requested, "in_progress": rng.randint(0, requested)}.get(status, 0)
+                self.reservation_lines.add(
+                    self._id("job_reservation_items"),
+                    reservation_id,
+                    self.item_id(index),
+                    requested,
+                    committed,
+                    consumed,
+                )
+
+    def _plan_cycle_counts(self) -> None:
+        # Completed sessions matched their counts; open ones are part counted and unposted.
+        rng = self.rng
+        sessions = self.volumes["cycle_count_sessions"]
+        open_sessions = max(1, sessions // 10)
+        for number in range(sessions):
+            session_id = self._id("cycle_count_sessions")
+            in_progress = number >= sessions - open_sessions
+            if in_progress:
+                started_at = self.now - datetime.timedelta(hours=rng.randint(1, 72))
+            else:
+                started_at = self._moment() - datetime.timedelta(days=3)
+            counted_at = started_at
+            counted_lines = 0
+            picks = rng.sample(range(self.size), min(self.size, rng.randint(50, 500)))
+            for sequence, index in enumerate(picks, 1):
+                expected = self.stock[index]
+                counted = variance = line_counted_at = None
+                if not in_progress:
+                    counted, variance = expected, 0
+                elif rng.random() < 0.6:
+                    counted = max(0, expected + rng.choice(_COUNT_ERRORS))
+                if counted is not None:
+                    counted_at = line_counted_at = min(
+                        counted_at + datetime.timedelta(seconds=rng.randint(10, 90)), self.now
+                    )
+                    counted_lines += 1
+                self.count_lines.add(
+                    self._id("cycle_count_lines"),
+                    session_id,
+                    self.item_id(index),
+                    sequence,
+                    expected,
+                    counted,
+                    variance,
+                    line_counted_at,
+                    False,
+                )
+            self.sessions.add(
+                session_id,
+                f"{self.prefix}Count {session_id}",
+                "in_progress" if in_progress else "completed",
+                started_at,
+                None if in_progress else counted_at,
+                len(picks),
+                counted_lines,
+            )
+
+    def _plan_maintenance(self) -> None:
+        rng = self.rng
+        tasks_by_machine: list[tuple[int, list[int]]] = []
+        for _ in range(self.volumes["maintenance_machines"]):
+            machine_id = self._id("maintenance_machines")
+            equipment_type = rng.choice(_EQUIPMENT_TYPES)
+            documents = [
+                {"label": label, "url": f"https://docs.example.com/machines/{machine_id}/{number}.pdf"}
+                for number, label in enumerate(rng.sample(_DOCUMENTS, rng.randint(0, 3)), 1)
+            ]
+            self.machines.add(
+                machine_id,
+                f"{self.prefix}{equipment_type} {machine_id}",
+                equipment_type,
+                rng.choice(_MANUFACTURERS),
+                f"M{rng.randint(100, 999)}",
+                f"SN{rng.randint(100000, 999999)}",
+                f"Bay {rng.randint(1, 6)}",
+                documents,
+                self.start,
+                self.start,
+            )
+            task_ids = []
+            for title in rng.sample(_TASK_TITLES, rng.randint(2, 6)):
+                task_id = self._id("maintenance_tasks")
+                unit = _weighted(rng, _TASK_UNITS)
+                count = rng.choice(_TASK_COUNTS[unit])
+                self.tasks.add(
+                    task_id,
+                    machine_id,
+                    title,
+                    f"Every {count} {unit}{'s' if count > 1 else ''}",
+                    rng.choice(_PEOPLE),
+                    count,
+                    unit,
+                    self.start.date() - datetime.timedelta(days=rng.randint(0, 365)),
+                    _weighted(rng, _TASK_STATUSES),
+                    _weighted(rng, _PRIORITIES),
+                    self.start,
+                    self.start,
+                )
+                task_ids.append(task_id)
+            tasks_by_machine.append((machine_id, task_ids))
+
+        for _ in range(self.volumes["maintenance_records"]):
+            machine_id, task_ids = rng.choice(tasks_by_machine)
+            # A quarter are unscheduled repairs, which is what counts as a failure.
+            repair = rng.random() < 0.25
+            performed_at = self._moment().date() - datetime.timedelta(days=1)
+            parts = [
+                f"{rng.randint(1, 4)} x {self.sku(rng.randrange(self.size))}"
+                for _ in range(rng.choice((0, 0, 1, 1, 2, 3)))
+            ]
+            if rng.random() < 0.05:
+                parts.append("Shop rag")
+            self.records.add(
+                self._id("maintenance_records"),
+                machine_id,
+                None if repair else rng.choice(task_ids),
+                rng.choice(_PEOPLE),
+                performed_at,
+                "Unscheduled repair" if repair else None,
+                [],
+                rng.randint(30, 480) if repair else rng.choice((0, 0, 0, 15)),
+                f"{rng.randint(1, 16) / 4:.2f}",
+                parts,
+                datetime.datetime.combine(performed_at, datetime.time(16), tzinfo=datetime.timezone.utc),
+            )
+
+    def _plan_configurator(self) -> None:
+        rng = self.rng
+        options: dict[str, tuple[int, list[int]]] = {}
+        for part_type, (root, children) in _USE_OPTIONS.items():
+            root_id = self._id("configurator_part_use_options")
+            self.use_options.add(root_id, f"{self.prefix}{root}", None)
+            child_ids = []
+            for child in children:
+                child_ids.append(self._id("configurator_part_use_options"))
+                self.use_options.add(child_ids[-1], f"{self.prefix}{child}", root_id)
+            options[part_type] = (root_id, child_ids)
+
+        profiled: dict[str, list[int]] = defaultdict(list)
+        for index in sorted(rng.sample(range(self.size), self.size // 10)):
+            part_type = rng.choice(("door", "frame", "hardware", "accessory"))
+            sized = part_type in ("door", "frame")
+            self.profiles.add(
+                self.item_id(index),
+                rng.random() < 0.85,
+                part_type,
+                f"{rng.uniform(0.5, 8):.4f}" if sized else None,
+                f"{rng.uniform(1.5, 6):.4f}" if sized else None,
+                self.start,
+            )
+            if part_type in options:
+                self.use_links.add(self.item_id(index), rng.choice(options[part_type][1]))
+            profiled[part_type].append(index)
+
+        hardware = profiled["hardware"]
+        for index in profiled["door"] + profiled["frame"]:
+            if hardware and rng.random() < 0.3:
+                for required in rng.sample(hardware, min(len(hardware), rng.randint(1, 3))):
+                    self.requirements.add(self.item_id(index), self.item_id(required), rng.randint(1, 4))
+
+        job_ids = []
+        for _ in range(self.volumes["configurator_jobs"]):
+            job_id = self._id("configurator_jobs")
+            name = f"{rng.choice(_JOB_SITES)} {rng.choice(_JOB_KINDS)}"
+            self.jobs.add(job_id, f"{self.prefix}CFG-{job_id:05d}", name, self.start)
+            job_ids.append(job_id)
+        # Mostly attached to a job; about one in ten stands alone.
+        for number in range(len(job_ids) * 4):
+            configuration_id = self._id("configurator_configurations")
+            created_at = self._moment(self.now - datetime.timedelta(days=180))
+            self.configurations.add(
+                configuration_id,
+                f"Opening {number + 1}",
+                rng.choice(job_ids) if rng.random() >= 0.1 else None,
+                _weighted(rng, _JOB_SCOPES),
+                rng.randint(1, 8),
+                _weighted(rng, _CONFIGURATION_STATUSES),
+                created_at,
+                created_at,
+            )
+            for door in range(rng.randint(1, 4)):
+                door_id = self._id("configurator_configuration_doors")
+                self.doors.add(door_id, configuration_id, f"D{101 + door}", created_at)
+
+    # -- loading ------------------------------------------------------------
+
+    def load(self, cursor, log: Callable[[str], None]) -> dict[str, int]:
+        cursor.execute(f"LOCK TABLE {', '.join(_ID_TABLES)} IN SHARE ROW EXCLUSIVE MODE")
+        for table in _ID_TABLES:
+            cursor.execute(f"SELECT COALESCE(MAX(id), 0) + 1 FROM {table}")
+            self.first_id[table] = self._next_id[table] = cursor.fetchone()[0]
+
+        started = time.perf_counter()
+        self.plan()
+        planned = sum(copy_file.count for copy_file in self.files)
+        log(f"Planned {planned:,} rows in {time.perf_counter() - started:.1f}s.")
+
+        counts = {}
+        for copy_file in self.files:
+            started = time.perf_counter()
+            counts[copy_file.table] = copy_file.load(cursor)
+            log(f"  {copy_file.table:<34} {copy_file.count:>11,} rows  {time.perf_counter() - started:6.1f}s")
+
+        for table in _ID_TABLES:
+            cursor.execute(f"SELECT setval(pg_get_serial_sequence(%s, 'id'), (SELECT MAX(id) FROM {table}))", [table])
+        cursor.execute(
+            """
+            UPDATE maintenance_tasks AS t
+            SET last_completed_at = r.last_performed
+            FROM (
+                SELECT task_id, MAX(performed_at) AS last_performed
+                FROM maintenance_records
+                WHERE id >= %s AND task_id IS NOT NULL
+                GROUP BY task_id
+            ) AS r
+            WHERE t.id = r.task_id
+            """,
+            [self.first_id["maintenance_records"]],
+        )
+        return counts
+
+
+def refresh_derived(first_item_id: int, last_item_id: int, log: Callable[[str], None]) -> None:
+    """Rebuild what the services cache about the loaded rows, then update planner statistics."""
+
+    item_ids = list(range(first_item_id, last_item_id + 1))
+
+    def step(label: str, run: Callable[[], object]) -> None:
+        started = time.perf_counter()
+        run()
+        log(f"  {label:<34} {time.perf_counter() - started:6.1f}s")
+
+    def committed_and_status() -> None:
+        # Status as inventoryStatusFromAvailable() would show it.
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                """
+                UPDATE inventory_items AS i
+                SET committed_qty = c.committed_qty
+                FROM inventory_item_commitments AS c
+                WHERE c.inventory_item_id = i.id AND i.id BETWEEN %s AND %s
+                """,
+                [first_item_id, last_item_id],
+            )
+            cursor.execute(
+                """
+                UPDATE inventory_items
+                SET status = CASE
+                    WHEN stock - committed_qty < GREATEST(reorder_point, 0) THEN 'Critical'
+                    WHEN stock - committed_qty <= floor(GREATEST(reorder_point, 0) * 1.3) THEN 'Low'
+                    ELSE 'In Stock'
+                END
+                WHERE id BETWEEN %s AND %s AND status <> 'Discontinued'
+                """,
+                [first_item_id, last_item_id],
+            )
+
+    def analyze() -> None:
+        with connection.cursor() as cursor:
+            for table in (*_ID_TABLES, "inventory_daily_usage", "maintenance_record_parts"):
+                cursor.execute(f"ANALYZE {table}")
+
+    step("committed quantities and status", committed_and_status)
+    step("on-order quantities", lambda: update_on_order_quantities(item_ids))
+    step("average daily use", lambda: refresh_average_daily_use(item_ids))
+    step("maintenance due dates", maintenance_schedule.refresh_due_dates)
+    step("reliability rollups", reliability.rebuild_all)
+    step("supplier lead times", lambda: lead_times.refresh_lead_time_stats(full=True))
+    step("dashboard metrics", dashboard.refresh_metrics)
+    step("analyze", analyze)
+    # COPY sends no model signals; caches shared with other processes must not
+    # keep serving filter choices from before the load.
+    bump_tables(*_ID_TABLES)
+
+
+def generate(
+    items: int, *, seed: int = 0, prefix: str = "SYN-", log: Callable[[str], None] | None = None
+) -> dict[str, int]:
+    """Load a dataset with ``items`` inventory items; returns the rows loaded per table."""
+
+    log = log or (lambda message: None)
+    dataset = _Dataset(items, random.Random(seed), prefix, timezone.now())
+    with transaction.atomic(), connection.cursor() as cursor:
+        counts = dataset.load(cursor, log)
+    log("Refreshing derived data:")
+    first_item_id = dataset.first_id["inventory_items"]
+    refresh_derived(first_item_id, first_item_id + items - 1, log)
+    return counts
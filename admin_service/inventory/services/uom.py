@@ -0,0 +1,233 @@
+"""Unit-of-measure conversion between stock units and purchase units.
+
+Generalises ``inventoryQuantityToEach`` and ``inventoryEachToUnit``.  A
+quantity in any unit converts to the item's stock unit through, in order: a
+``uom_conversions`` row for the item, the item's ``pack_size`` (for its
+purchase unit and for "pack"), a global ``uom_conversions`` row, then the
+built-in units below.  Anything else converts 1:1, as it does in PHP.
+
+Arithmetic is Decimal throughout; quantities are quantized to the six places
+of the ``NUMERIC(18, 6)`` columns.  The conversion table is small and cached
+whole, and :func:`item_units` caches each item's factors, so converting a
+purchase order or receipt costs at most one query however many lines it has.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, field
+from decimal import ROUND_CEILING, ROUND_HALF_UP, Decimal
+from typing import Iterable
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .. import models
+from .change_feed import inventory_changed
+
+CACHE_TTL_SECONDS = 60
+QUANTUM = Decimal("0.000001")
+ONE = Decimal("1")
+ZERO = Decimal("0")
+
+STOCK_UNITS = frozenset({"", "each", "ea", "pc", "pcs", "piece", "pieces", "unit", "units"})
+PACK_UNITS = frozenset({"pack", "pk", "pkg"})
+BUILTIN_UNITS = {
+    "pair": Decimal("2"),
+    "pr": Decimal("2"),
+    "dozen": Decimal("12"),
+    "dz": Decimal("12"),
+    "gross": Decimal("144"),
+}
+
+
+def normalize_unit(unit: str | None) -> str:
+    return (unit or "").strip().lower()
+
+
+def quantize(quantity: Decimal) -> Decimal:
+    return quantity.quantize(QUANTUM, rounding=ROUND_HALF_UP)
+
+
+@dataclass
+class ConversionTable:
+    """Every ``uom_conversions`` row, split into global and per-item factors."""
+
+    global_factors: dict[str, Decimal] = field(default_factory=dict)
+    item_factors: dict[tuple[int, str], Decimal] = field(default_factory=dict)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[tuple]) -> "ConversionTable":
+        table = cls()
+        for item_id, unit, stock_per_unit in rows:
+            if item_id is None:
+                table.global_factors[normalize_unit(unit)] = stock_per_unit
+            else:
+                table.item_factors[item_id, normalize_unit(unit)] = stock_per_unit
+        return table
+
+
+@dataclass(frozen=True)
+class ItemUnits:
+    """Conversion factors for one item (or one purchase order line)."""
+
+    item_id: int | None
+    pack_size: Decimal = ZERO
+    purchase_uom: str | None = None
+    stock_uom: str | None = None
+    table: ConversionTable = field(default_factory=ConversionTable, compare=False, repr=False)
+
+    def factor(self, unit: str | None) -> Decimal:
+        """Stock units in one ``unit``."""
+
+        unit = normalize_unit(unit)
+        if unit in STOCK_UNITS or unit == normalize_unit(self.stock_uom):
+            return ONE
+        if self.item_id is not None and (self.item_id, unit) in self.table.item_factors:
+            return self.table.item_factors[self.item_id, unit]
+        pack_size = self.pack_size or ZERO
+        if pack_size > ZERO and (unit in PACK_UNITS or unit == normalize_unit(self.purchase_uom)):
+            return pack_size
+        if unit in self.table.global_factors:
+            return self.table.global_factors[unit]
+        return BUILTIN_UNITS.get(unit, ONE)
+
+    @property
+    def purchase_factor(self) -> Decimal:
+        """Stock units per purchase unit; a bare ``pack_size`` counts as one pack."""
+
+        factor = self.factor(self.purchase_uom)
+        if factor == ONE and (self.pack_size or ZERO) > ZERO:
+            return self.pack_size
+        return factor
+
+    def to_stock(self, quantity: Decimal, unit: str | None = None) -> Decimal:
+        """Convert ``quantity`` in ``unit`` (default: the purchase unit) to stock units."""
+
+        factor = self.purchase_factor if unit is None else self.factor(unit)
+        return quantize(Decimal(quantity) * factor)
+
+    def from_stock(self, quantity: Decimal, unit: str | None = None) -> Decimal:
+        """Convert ``quantity`` stock units to ``unit`` (default: the purchase unit)."""
+
+        factor = self.purchase_factor if unit is None else self.factor(unit)
+        return quantize(Decimal(quantity) / factor)
+
+    def order_quantity(self, stock_quantity: Decimal) -> tuple[Decimal, Decimal]:
+        """Whole purchase units covering ``stock_quantity``, and what they hold in stock units."""
+
+        if stock_quantity <= ZERO:
+            return ZERO, ZERO
+        factor = self.purchase_factor
+        units = (Decimal(stock_quantity) / factor).to_integral_value(rounding=ROUND_CEILING)
+        return units, quantize(units * factor)
+
+    def line_quantities(self, quantity_ordered: Decimal, packs_ordered: Decimal) -> tuple[Decimal, Decimal]:
+        """``(quantity_ordered, packs_ordered)`` for a PO line, as ``purchaseOrderNormalizeLine`` derives them."""
+
+        quantity_ordered = max(ZERO, quantity_ordered or ZERO)
+        packs_ordered = max(ZERO, packs_ordered or ZERO)
+        if self.purchase_factor == ONE:
+            return quantity_ordered, packs_ordered
+        if packs_ordered > ZERO:
+            return self.to_stock(packs_ordered), packs_ordered
+        if quantity_ordered > ZERO:
+            return quantity_ordered, self.from_stock(quantity_ordered)
+        return quantity_ordered, packs_ordered
+
+
+_lock = threading.Lock()
+_table: ConversionTable | None = None
+_items: dict[int, ItemUnits] = {}
+_loaded_at = 0.0
+
+
+def _expired() -> bool:
+    return _table is None or time.monotonic() - _loaded_at > CACHE_TTL_SECONDS
+
+
+def conversion_table() -> ConversionTable:
+    """Return the cached conversion table, reloading it with one query when stale."""
+
+    global _table, _items, _loaded_at
+
+    with _lock:
+        if _expired():
+            rows = models.UomConversion.objects.values_list("inventory_item_id", "unit", "stock_per_unit")
+            _table = ConversionTable.from_rows(rows.order_by())
+            _items = {}
+            _loaded_at = time.monotonic()
+        return _table
+
+
+def units_for(
+    item_id: int | None, pack_size: Decimal | None, purchase_uom: str | None, stock_uom: str | None
+) -> ItemUnits:
+    """Factors for a row that already carries pack size and units, e.g. a purchase order line."""
+
+    return ItemUnits(item_id, pack_size or ZERO, purchase_uom, stock_uom, conversion_table())
+
+
+def item_units(item_ids: Iterable[int]) -> dict[int, ItemUnits]:
+    """Cached factors for each item, loading any not yet cached in one query."""
+
+    table = conversion_table()
+    wanted = {int(item_id) for item_id in item_ids}
+    with _lock:
+        found = {item_id: _items[item_id] for item_id in wanted if item_id in _items}
+    missing = wanted - found.keys()
+    if missing:
+        rows = models.InventoryItem.objects.filter(id__in=missing).values_list(
+            "id", "pack_size", "purchase_uom", "stock_uom"
+        )
+        loaded = {
+            item_id: ItemUnits(item_id, pack_size or ZERO, purchase_uom, stock_uom, table)
+            for item_id, pack_size, purchase_uom, stock_uom in rows
+        }
+        with _lock:
+            if _table is table:
+                _items.update(loaded)
+        found.update(loaded)
+    return found
+
+
+def to_stock_units(rows: Iterable[tuple[int | None, Decimal, str | None]]) -> list[Decimal]:
+    """Convert ``(item_id, quantity, unit)`` rows to stock units in one pass."""
+
+    rows = list(rows)
+    units = item_units(item_id for item_id, _, _ in rows if item_id is not None)
+    plain = ItemUnits(None, table=conversion_table())
+    return [units.get(item_id, plain).to_stock(quantity, unit) for item_id, quantity, unit in rows]
+
+
+def invalidate_units(item_ids: Iterable[int] | None = None) -> None:
+    """Drop cached factors for ``item_ids``, or everything (conversion table included) when ``None``."""
+
+    global _table
+
+    with _lock:
+        if item_ids is None:
+            _table = None
+            _items.clear()
+            return
+        for item_id in item_ids:
+            _items.pop(item_id, None)
+
+
+@receiver(post_save, sender=models.UomConversion, dispatch_uid="uom_conversion_save")
+@receiver(post_delete, sender=models.UomConversion, dispatch_uid="uom_conversion_delete")
+def _units_changed(sender, **kwargs) -> None:
+    invalidate_units()
+
+
+@receiver(post_save, sender=models.InventoryItem, dispatch_uid="inventory_item_uom_save")
+@receiver(post_delete, sender=models.InventoryItem, dispatch_uid="inventory_item_uom_delete")
+def _item_changed(sender, instance, **kwargs) -> None:
+    invalidate_units([instance.pk])
+
+
+@receiver(inventory_changed, dispatch_uid="uom_change_feed")
+def _inventory_items_notified(sender, batch, **kwargs) -> None:
+    # Stock updates notify constantly; only the touched items are dropped.
+    if batch.changed("inventory_items"):
+        invalidate_units(batch.ids("inventory_items"))
@@ -0,0 +1,233 @@
+"""Streaming XLSX reader built on the standard library.
+
+Mirrors the behaviour of ``app/helpers/xlsx.php`` (sheet lookup through the
+workbook relationships, shared strings, inline strings and booleans) but
+parses worksheets incrementally so a large estimate never has to be held in
+memory as a DOM.
+"""
+from __future__ import annotations
+
+import io
+import posixpath
+import re
+import zipfile
+from typing import IO, Iterable, Iterator
+from xml.etree.ElementTree import ParseError, iterparse
+from xml.sax.saxutils import escape
+
+_MAIN = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_DOC_REL = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_PKG_REL = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+_CELL_RE = re.compile(r"^([A-Z]+)(\d+)$")
+
+
+class XlsxError(ValueError):
+    """Raised when a workbook or worksheet cannot be read."""
+
+
+def open_workbook(source: str | IO[bytes]) -> zipfile.ZipFile:
+    try:
+        return zipfile.ZipFile(source)
+    except (zipfile.BadZipFile, OSError) as exc:
+        raise XlsxError("Unable to open XLSX archive.") from exc
+
+
+def _has(archive: zipfile.ZipFile, name: str) -> bool:
+    try:
+        archive.getinfo(name)
+    except KeyError:
+        return False
+    return True
+
+
+def _parse(archive: zipfile.ZipFile, name: str):
+    try:
+        with archive.open(name) as handle:
+            for _, element in iterparse(handle):
+                yield element
+    except KeyError as exc:
+        raise XlsxError(f"{name} is missing from the workbook.") from exc
+    except ParseError as exc:
+        raise XlsxError(f"{name} is malformed.") from exc
+
+
+def _sheets(archive: zipfile.ZipFile) -> list[tuple[str, str]]:
+    return [
+        (element.get("name", ""), element.get(f"{_DOC_REL}id", ""))
+        for element in _parse(archive, "xl/workbook.xml")
+        if element.tag == f"{_MAIN}sheet" and element.get("name")
+    ]
+
+
+def list_sheets(archive: zipfile.ZipFile) -> list[str]:
+    try:
+        return [name for name, _ in _sheets(archive)]
+    except XlsxError:
+        return []
+
+
+def _sheet_path(archive: zipfile.ZipFile, sheet_name: str) -> str:
+    relationships = {}
+    if _has(archive, "xl/_rels/workbook.xml.rels"):
+        for element in _parse(archive, "xl/_rels/workbook.xml.rels"):
+            if element.tag == f"{_PKG_REL}Relationship" and element.get("TargetMode", "").lower() != "external":
+                relationships[element.get("Id")] = element.get("Target", "")
+
+    for name, rel_id in _sheets(archive):
+        if name.lower() != sheet_name.lower():
+            continue
+        target = relationships.get(rel_id, "").replace("\\", "/")
+        if not target:
+            raise XlsxError(f'Worksheet "{sheet_name}" is missing a relationship target.')
+        path = target.lstrip("/") if target.startswith("/") else posixpath.normpath(posixpath.join("xl", target))
+        for candidate in (path, f"xl/{path}", path.removeprefix("xl/")):
+            if _has(archive, candidate):
+                return candidate
+        return path
+    raise XlsxError(f'Worksheet "{sheet_name}" was not found in the workbook.')
+
+
+def shared_strings(archive: zipfile.ZipFile) -> list[str]:
+    if not _has(archive, "xl/sharedStrings.xml"):
+        return []
+    strings = []
+    for element in _parse(archive, "xl/sharedStrings.xml"):
+        if element.tag != f"{_MAIN}si":
+            continue
+        # Direct text plus rich-text runs; phonetic hints are ignored.
+        parts = [element.findtext(f"{_MAIN}t") or ""]
+        parts.extend(run.findtext(f"{_MAIN}t") or "" for run in element.findall(f"{_MAIN}r"))
+        strings.append("".join(parts))
+        element.clear()
+    return strings
+
+
+def column_index(column: str) -> int | None:
+    index = 0
+    for char in column:
+        if not "A" <= char <= "Z":
+            return None
+        index = index * 26 + ord(char) - 64
+    return index - 1 if column else None
+
+
+def _cell_value(cell, shared: list[str]) -> str:
+    kind = cell.get("t", "")
+    if kind == "inlineStr":
+        return "".join(text.text or "" for text in cell.iter(f"{_MAIN}t")).strip()
+    value = cell.findtext(f"{_MAIN}v")
+    if value is None:
+        return ""
+    if kind == "s":
+        index = int(value)
+        return shared[index].strip() if index < len(shared) else ""
+    if kind == "b":
+        return "TRUE" if value == "1" else "FALSE"
+    return value.strip()
+
+
+def iter_rows(
+    archive: zipfile.ZipFile, sheet_name: str, shared: list[str] | None = None
+) -> Iterator[tuple[int, list[str]]]:
+    """Yield ``(row_number, cells)`` for each stored row; missing rows are skipped.
+
+    Pass ``shared`` (from :func:`shared_strings`) when reading several sheets
+    so the string table is parsed once.
+    """
+
+    if shared is None:
+        shared = shared_strings(archive)
+    previous = 0
+    for element in _parse(archive, _sheet_path(archive, sheet_name)):
+        if element.tag != f"{_MAIN}row":
+            continue
+        number = int(element.get("r") or previous + 1)
+        previous = number
+        cells: dict[int, str] = {}
+        for cell in element.findall(f"{_MAIN}c"):
+            match = _CELL_RE.match((cell.get("r") or "").upper())
+            index = column_index(match.group(1)) if match else len(cells)
+            if index is not None:
+                cells[index] = _cell_value(cell, shared)
+        element.clear()
+        row = [""] * (max(cells) + 1 if cells else 0)
+        for index, value in cells.items():
+            row[index] = value
+        yield number, row
+
+
+def _column_name(index: int) -> str:
+    name = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        name = chr(65 + remainder) + name
+    return name
+
+
+def build_workbook(sheets: dict[str, Iterable[list]]) -> bytes:
+    """Minimal XLSX with inline-string cells, for generated estimates and benchmarks."""
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        names = list(sheets)
+        archive.writestr(
+            "[Content_Types].xml",
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            + "".join(
+                f'<Override PartName="/xl/worksheets/sheet{n}.xml" '
+                'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+                for n in range(1, len(names) + 1)
+            )
+            + "</Types>",
+        )
+        archive.writestr(
+            "_rels/.rels",
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" '
+            'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+            'Target="xl/workbook.xml"/></Relationships>',
+        )
+        archive.writestr(
+            "xl/workbook.xml",
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            f'<workbook xmlns="{_MAIN[1:-1]}" xmlns:r="{_DOC_REL[1:-1]}"><sheets>'
+            + "".join(
+                f'<sheet name="{escape(name, {chr(34): "&quot;"})}" sheetId="{n}" r:id="rId{n}"/>'
+                for n, name in enumerate(names, start=1)
+            )
+            + "</sheets></workbook>",
+        )
+        archive.writestr(
+            "xl/_rels/workbook.xml.rels",
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            f'<Relationships xmlns="{_PKG_REL[1:-1]}">'
+            + "".join(
+                f'<Relationship Id="rId{n}" '
+                'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+                f'Target="worksheets/sheet{n}.xml"/>'
+                for n in range(1, len(names) + 1)
+            )
+            + "</Relationships>",
+        )
+        for n, name in enumerate(names, start=1):
+            with archive.open(f"xl/worksheets/sheet{n}.xml", "w") as sheet:
+                header = f'<?xml version="1.0" encoding="UTF-8"?><worksheet xmlns="{_MAIN[1:-1]}"><sheetData>'
+                sheet.write(header.encode())
+                for row_number, row in enumerate(sheets[name], start=1):
+                    cells = "".join(
+                        f'<c r="{_column_name(index)}{row_number}" t="inlineStr">'
+                        f"<is><t>{escape(str(value))}</t></is></c>"
+                        for index, value in enumerate(row)
+                        if value not in (None, "")
+                    )
+                    sheet.write(f'<row r="{row_number}">{cells}</row>'.encode())
+                sheet.write(b"</sheetData></worksheet>")
+    return buffer.getvalue()
@@ -0,0 +1,138 @@
+from decimal import Decimal
+
+from django.test import SimpleTestCase
+
+from inventory.services.estimates import (
+    MAX_QUANTITY,
+    EstimateAnalysis,
+    EstimateLine,
+    _allocate,
+    _Log,
+    find_columns,
+    iter_sheet_requirements,
+    parse_quantity,
+    sheet_order,
+)
+
+
+class ParseQuantityTests(SimpleTestCase):
+    def test_whole_numbers(self):
+        self.assertEqual(parse_quantity("12"), 12)
+        self.assertEqual(parse_quantity(" 1,200 "), 1200)
+        self.assertEqual(parse_quantity("1 200"), 1200)
+
+    def test_rounds_half_up(self):
+        self.assertEqual(parse_quantity("2.5"), 3)
+        self.assertEqual(parse_quantity("2.49"), 2)
+        self.assertEqual(parse_quantity(".5"), 1)
+
+    def test_leading_number_only(self):
+        self.assertEqual(parse_quantity("4 pcs"), 4)
+        self.assertEqual(parse_quantity("3ea"), 3)
+
+    def test_not_positive_is_none(self):
+        for raw in ("", "abc", "0", "-1", "0.4", "+0"):
+            with self.subTest(raw=raw):
+                self.assertIsNone(parse_quantity(raw))
+
+    def test_exponent(self):
+        self.assertEqual(parse_quantity("1e3"), 1000)
+
+    def test_too_large_raises(self):
+        self.assertEqual(parse_quantity(str(MAX_QUANTITY)), MAX_QUANTITY)
+        for raw in ("1e30", str(MAX_QUANTITY + 1)):
+            with self.subTest(raw=raw), self.assertRaises(ValueError):
+                parse_quantity(raw)
+
+
+class SheetOrderTests(SimpleTestCase):
+    def test_groups_in_php_order(self):
+        sheets = ["Special Length", "Notes", "Stock Lengths (2)", "Accessories", "Stock Lengths"]
+        self.assertEqual(
+            sheet_order(sheets),
+            ["Accessories", "Stock Lengths (2)", "Stock Lengths", "Special Length"],
+        )
+
+    def test_prefix_must_end_at_a_boundary(self):
+        sheets = ["AccessoriesX", " accessories-extra ", "Stock Lengthsy"]
+        self.assertEqual(sheet_order(sheets), [" accessories-extra "])
+
+    def test_duplicates_dropped(self):
+        self.assertEqual(sheet_order(["Accessories", "Accessories"]), ["Accessories"])
+
+
+class FindColumnsTests(SimpleTestCase):
+    def test_header_row(self):
+        self.assertEqual(find_columns(["Qty", "Part #", "Finish"]), (0, 1, 2))
+        self.assertEqual(find_columns(["", "Item", "Quantity"]), (2, 1, None))
+
+    def test_not_a_header(self):
+        self.assertIsNone(find_columns(["Qty", ""]))
+        self.assertIsNone(find_columns(["12", "AB-100"]))
+
+
+class SheetRequirementsTests(SimpleTestCase):
+    def read(self, rows):
+        analysis = EstimateAnalysis()
+        requirements = list(iter_sheet_requirements(iter(rows), "Accessories", analysis, _Log(analysis.log)))
+        return requirements, analysis.messages
+
+    def test_oversized_quantity_skips_row_with_warning(self):
+        requirements, messages = self.read(
+            [(1, ["Qty", "Part", "Finish"]), (2, ["1e30", "ab-1", ""]), (3, ["2", "ab-2", "bl"])]
+        )
+        self.assertEqual(requirements, [("AB-2", "BL", 2)])
+        self.assertEqual(len(messages), 1)
+        self.assertIn("row 2 skipped", messages[0][1])
+
+    def test_unknown_finish_is_unspecified(self):
+        requirements, messages = self.read([(1, ["Qty", "Part", "Finish"]), (2, ["1", "ab-1", "pink"])])
+        self.assertEqual(requirements, [("AB-1", None, 1)])
+        self.assertIn('unrecognised finish "pink"', messages[0][1])
+
+    def test_stops_after_empty_rows(self):
+        requirements, _ = self.read([(1, ["Qty", "Part"]), (2, ["1", "ab-1"]), (9, ["1", "ab-2"])])
+        self.assertEqual(requirements, [("AB-1", None, 1)])
+
+
+class AllocateTests(SimpleTestCase):
+    def line(self, part_number, required, item_id=None, available=0, on_order="0", finish=None):
+        return EstimateLine(
+            part_number=part_number,
+            finish=finish,
+            required=required,
+            inventory_item_id=item_id,
+            available=available,
+            on_order=Decimal(on_order),
+        )
+
+    def test_missing(self):
+        line = self.line("AB-1", 5)
+        _allocate([line])
+        self.assertEqual((line.status, line.shortfall, line.uncovered), ("missing", 5, Decimal("5")))
+
+    def test_statuses(self):
+        available = self.line("A", 5, item_id=1, available=10)
+        on_order = self.line("B", 5, item_id=2, available=2, on_order="3")
+        short = self.line("C", 5, item_id=3, available=1, on_order="1")
+        _allocate([available, on_order, short])
+        self.assertEqual((available.status, available.shortfall), ("available", 0))
+        self.assertEqual((on_order.status, on_order.shortfall, on_order.uncovered), ("on_order", 3, Decimal("0")))
+        self.assertEqual((short.status, short.shortfall, short.uncovered), ("short", 4, Decimal("3")))
+
+    def test_negative_available_counts_as_none(self):
+        line = self.line("A", 2, item_id=1, available=-4, on_order="2")
+        _allocate([line])
+        self.assertEqual((line.status, line.shortfall, line.uncovered), ("on_order", 2, Decimal("0")))
+
+    def test_shared_stock_drawn_down_once(self):
+        # Both lines resolved to item 1 (e.g. one by SKU, one by fuzzy match).
+        second = self.line("AB-2", 4, item_id=1, available=6, on_order="3")
+        first = self.line("AB-1", 4, item_id=1, available=6, on_order="3")
+        _allocate([second, first])
+        self.assertEqual((first.status, first.shortfall, first.uncovered), ("available", 0, Decimal("0")))
+        self.assertEqual((second.status, second.shortfall, second.uncovered), ("on_order", 2, Decimal("0")))
+
+        third = self.line("AB-3", 4, item_id=1, available=6, on_order="3")
+        _allocate([second, third, first])
+        self.assertEqual((third.status, third.shortfall, third.uncovered), ("short", 4, Decimal("3")))
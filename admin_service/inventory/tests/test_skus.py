@@ -0,0 +1,37 @@
+from django.test import SimpleTestCase
+
+from inventory.services.skus import VariantIndex, compose_sku, normalize_finish, parse_sku
+
+
+class SkuCodecTests(SimpleTestCase):
+    def test_parse(self):
+        self.assertEqual(parse_sku("AB-100-BL"), ("AB-100", "BL"))
+        self.assertEqual(parse_sku(" ab--100-c2 "), ("ab-100", "C2"))
+        self.assertEqual(parse_sku("AB-100"), ("AB-100", None))
+        self.assertEqual(parse_sku("BL"), ("BL", None))
+        self.assertEqual(parse_sku(""), ("", None))
+
+    def test_compose(self):
+        self.assertEqual(compose_sku("AB-100", "bl"), "AB-100-BL")
+        self.assertEqual(compose_sku(" AB-100 ", None), "AB-100")
+        self.assertEqual(compose_sku("AB-100", "pink"), "AB-100")
+
+    def test_round_trip(self):
+        for sku in ("AB-100-BL", "AB-100-0R", "X-DB", "AB-100", "A-B-C-C2"):
+            with self.subTest(sku=sku):
+                self.assertEqual(compose_sku(*parse_sku(sku)), sku)
+
+    def test_normalize_finish(self):
+        self.assertEqual(normalize_finish(" db "), "DB")
+        self.assertIsNone(normalize_finish("XX"))
+        self.assertIsNone(normalize_finish(None))
+
+
+class VariantIndexTests(SimpleTestCase):
+    def test_unchanged(self):
+        index = VariantIndex([(1, "AB-1-BL", "AB-1", "BL"), (2, "CD", None, None)])
+        self.assertTrue(index.unchanged([(1, "AB-1-BL", "AB-1", "BL")], [1]))
+        self.assertFalse(index.unchanged([(1, "AB-1-C2", "AB-1", "C2")], [1]))
+        self.assertFalse(index.unchanged([], [1]))
+        self.assertTrue(index.unchanged([], [3]))
+        self.assertFalse(index.unchanged([(3, "EF", None, None)], [3]))
@@ -0,0 +1,52 @@
+from decimal import Decimal
+
+from django.test import SimpleTestCase
+
+from inventory.services.uom import ConversionTable, ItemUnits
+
+
+class ItemUnitsTests(SimpleTestCase):
+    def setUp(self):
+        self.table = ConversionTable.from_rows(
+            [(None, "Box", Decimal("50")), (7, "box", Decimal("25")), (7, "Roll", Decimal("100"))]
+        )
+
+    def test_factor_precedence(self):
+        units = ItemUnits(7, pack_size=Decimal("10"), purchase_uom="case", stock_uom="ft", table=self.table)
+        self.assertEqual(units.factor("FT"), Decimal("1"))
+        self.assertEqual(units.factor("each"), Decimal("1"))
+        self.assertEqual(units.factor("box"), Decimal("25"))
+        self.assertEqual(units.factor("roll"), Decimal("100"))
+        self.assertEqual(units.factor("case"), Decimal("10"))
+        self.assertEqual(units.factor("pack"), Decimal("10"))
+        self.assertEqual(units.factor("dozen"), Decimal("12"))
+        self.assertEqual(units.factor("furlong"), Decimal("1"))
+        self.assertEqual(ItemUnits(8, table=self.table).factor("box"), Decimal("50"))
+
+    def test_bare_pack_size_is_the_purchase_unit(self):
+        units = ItemUnits(1, pack_size=Decimal("6"))
+        self.assertEqual(units.purchase_factor, Decimal("6"))
+        self.assertEqual(units.to_stock(Decimal("2")), Decimal("12"))
+        self.assertEqual(units.from_stock(Decimal("3")), Decimal("0.5"))
+
+    def test_round_trip_is_quantized(self):
+        units = ItemUnits(1, pack_size=Decimal("3"))
+        third = units.from_stock(Decimal("1"))
+        self.assertEqual(third, Decimal("0.333333"))
+        self.assertEqual(units.to_stock(third), Decimal("0.999999"))
+        self.assertEqual(units.to_stock(Decimal("1"), "pair"), Decimal("2.000000"))
+
+    def test_order_quantity_rounds_up_to_whole_units(self):
+        units = ItemUnits(1, pack_size=Decimal("12"))
+        self.assertEqual(units.order_quantity(Decimal("13")), (Decimal("2"), Decimal("24")))
+        self.assertEqual(units.order_quantity(Decimal("12")), (Decimal("1"), Decimal("12")))
+        self.assertEqual(units.order_quantity(Decimal("0")), (Decimal("0"), Decimal("0")))
+
+    def test_line_quantities(self):
+        units = ItemUnits(1, pack_size=Decimal("12"))
+        self.assertEqual(units.line_quantities(Decimal("0"), Decimal("2")), (Decimal("24"), Decimal("2")))
+        self.assertEqual(units.line_quantities(Decimal("6"), Decimal("0")), (Decimal("6"), Decimal("0.5")))
+        self.assertEqual(units.line_quantities(Decimal("-3"), None), (Decimal("0"), Decimal("0")))
+
+        each = ItemUnits(1)
+        self.assertEqual(each.line_quantities(Decimal("5"), Decimal("1")), (Decimal("5"), Decimal("1")))
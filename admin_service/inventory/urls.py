@@ -0,0 +1,14 @@
+"""Report and export endpoints served alongside the admin."""
+from __future__ import annotations
+
+from django.urls import path
+
+from . import views
+
+app_name = "inventory_reports"
+
+urlpatterns = [
+    path("stock-valuation.csv", views.stock_valuation_export, name="stock_valuation"),
+    path("ledger.csv", views.ledger_export, name="ledger"),
+    path("replenishment.csv", views.replenishment_export, name="replenishment"),
+]